@@ -67,7 +67,10 @@ def extract_metrics(json_path):
                         extracted_data["Comment Density"].append(metric.get("density", 0))
                     elif metric_name == "Code Smells":
                         msg = metric.get("message", "")
-                        if "rated at" in msg:
+                        if metric.get("score") is not None:
+                            extracted_data["Code Smells"].append(metric["score"])
+                        # Results saved before pylint reported JSON only carry the score in the message
+                        elif "rated at" in msg:
                             try:
                                 score = float(msg.split("rated at ")[1].split("/")[0])
                                 extracted_data["Code Smells"].append(score)
@@ -80,3 +83,33 @@ def extract_metrics(json_path):
                             status_summary[metric_name][status] += 1
 
     return extracted_data, status_summary
+
+
+def summarize_file_metrics(json_path, top_n=10):
+    """LoC-weighted means, p50/p90/max and worst files of the per-file metrics over the whole batch."""
+    from evaluation.aggregation import summarize_batch_results
+
+    with open(json_path, "r", encoding="utf-8") as f:
+        all_results = json.load(f)
+
+    return summarize_batch_results(all_results, top_n)
+
+
+def summarize_pylint_checker_times(json_path, top_n=10):
+    """
+    Total seconds per pylint checker over the whole batch, slowest first.
+
+    Only results produced with checker profiling on (QUALITY_PYLINT_PROFILE=1) carry timings.
+    """
+    with open(json_path, "r", encoding="utf-8") as f:
+        all_results = json.load(f)
+
+    totals = {}
+    for sections in all_results.values():
+        for section_name, metrics in sections.items():
+            if not section_name.endswith(".py"):
+                continue
+            for checker, seconds in metrics.get("Code Smells", {}).get("checker_times", {}).items():
+                totals[checker] = totals.get(checker, 0.0) + seconds
+
+    return sorted(totals.items(), key=lambda item: -item[1])[:top_n]
@@ -62,7 +62,10 @@ for project, sections in all_results.items():
                     extracted_data["Comment Density"].append(metric.get("density", 0))
                 elif metric_name == "Code Smells":
                     msg = metric.get("message", "")
-                    if "rated at" in msg:
+                    if metric.get("score") is not None:
+                        extracted_data["Code Smells"].append(metric["score"])
+                    # Results saved before pylint reported JSON only carry the score in the message
+                    elif "rated at" in msg:
                         try:
                             score = float(msg.split("rated at ")[1].split("/")[0])
                             extracted_data["Code Smells"].append(score)
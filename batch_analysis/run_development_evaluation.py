@@ -1,126 +1,382 @@
 import os
 import json
+import time
+import socket
+import shutil
+import uuid
+import hashlib
+import argparse
+import threading
 import subprocess
 from bs4 import BeautifulSoup # For stripping HTML
-from pathlib import Path 
+from pathlib import Path
+from contextlib import contextmanager
 
 # --- Configuration ---
-base_dir = "/Users/yt/Documents/folder2024/course/Thesis/11_envri_validation_set_test"  
-selected_stage = "Development"  
+base_dir = "/Users/yt/Documents/folder2024/course/Thesis/11_envri_validation_set_test"
+selected_stage = "Development"
 
 parent_dir = os.path.dirname(base_dir) # Get parent directory of base_dir
 results_dir = os.path.join(parent_dir, "11_envri_validation_set_results") # Define results directory path
-os.makedirs(results_dir, exist_ok=True)  # Make sure the folder exists
 output_file = os.path.join(results_dir, "batch_development_results_test.json") # Define output file path inside the results directory
 
-summary_results = {}  # Final dictionary to hold all project outputs
+# A claim that was not refreshed for this many seconds is considered abandoned (e.g. the node crashed)
+STALE_CLAIM_SECONDS = 6 * 60 * 60
 
-# Go through all projects in base_dir
-for project in os.listdir(base_dir):
-    project_path = os.path.join(base_dir, project)
-    if not os.path.isdir(project_path):
-        continue
 
-    print(f"Running analysis for: {project}")
+def clean_results(parsed_results):
+    """Cleans the parsed CLI results in-place: HTML is stripped and messages are trimmed to 1-2 lines."""
+    for section_name, section_metrics in parsed_results.items():
+        for metric_name, metric_result in section_metrics.items():
+            if isinstance(metric_result, dict) and "message" in metric_result:
+                message = metric_result["message"]
+
+                # Case 1: Code Smells - keep only pylint score line
+                if metric_name == "Code Smells":
+                    if metric_result.get("score") is not None:
+                        metric_result["message"] = f"Your code has been rated at {metric_result['score']:.2f}/10"
+                        continue
+
+                    try:
+                        soup = BeautifulSoup(str(message), "html.parser")
+                        divs = soup.find_all("div")
+
+                        score_line = None
+                        for div in divs:
+                            text = div.get_text(strip=True)
+                            if text.startswith("Your code has been rated at"):
+                                score_line = text
+                                break
+
+                        metric_result["message"] = score_line if score_line else "N/A"
+
+                    except Exception as e:
+                        metric_result["message"] = f"N/A (parse error: {e})"
+
+                    continue
+
+
+                # Case 2: Other messages - clean HTML and keep top 1-2 lines only
+                clean_text = BeautifulSoup(message, "html.parser").get_text(separator="\n")
+                lines = [line.strip() for line in clean_text.splitlines() if line.strip()]
 
+                # Filter out lines that start with 'Tip:' or 'Note:'
+                main_lines = [line for line in lines if not line.lower().startswith(("tip:", "note:"))]
+
+                # Keep only the first 1-2 relevant lines
+                trimmed = main_lines[:2] if main_lines else ["N/A"]
+                metric_result["message"] = " ".join(trimmed)
+
+    return parsed_results
+
+
+def evaluate_project(project_path, stage, profile=None):
+    """
+    Runs the CLI tool on one project (with the given scan profile, if any) and returns its cleaned results.
+
+    Raises:
+        RuntimeError: if the CLI failed or printed no parsable results.
+    """
     # Run the CLI tool and capture its stdout
     try:
         result = subprocess.run(
             [
                 "python",
                 "run_quality_scan_cli.py",
-                "--stage", selected_stage,
-                "--path", project_path
+                "--stage", stage,
+                "--path", project_path,
+                "--no-history",                  # Batch runs are not part of the local scan history
+                *(["--profile", profile] if profile else [])
             ],
             capture_output=True,
             text=True,
             check=True
         )
     except subprocess.CalledProcessError as e:
-        print(f"Error running CLI for {project}: {e}")
-        continue
+        raise RuntimeError(f"Error running CLI: {e}")
 
     stdout = result.stdout.strip()
     if not stdout:
-        print(f"⚠ No output for {project}")
-        continue
+        raise RuntimeError("No output")
 
     # Find the json block from the CLI output
     json_start = stdout.find("{")
     if json_start == -1:
-        print(f"⚠ Failed to locate JSON result in CLI output for {project}")
-        continue
+        raise RuntimeError("Failed to locate JSON result in CLI output")
 
     try:
         parsed_results = json.loads(stdout[json_start:])
     except json.JSONDecodeError as e:
-        print(f"⚠ JSON decode error for {project}: {e}")
-        continue
+        raise RuntimeError(f"JSON decode error: {e}")
 
-    # Clean up the parsed_results in-place 
-    for section_name, section_metrics in parsed_results.items():
-        for metric_name, metric_result in section_metrics.items():
-            if isinstance(metric_result, dict) and "message" in metric_result:
-                message = metric_result["message"]
+    return clean_results(parsed_results)
 
-                # Case 1: Code Smells - keep only pylint score line 
-                # if metric_name == "Code Smells":
-                    
-                #     # lines = message.splitlines()
 
-                #     if isinstance(message, str):
-                #         lines = message.splitlines()
-                #     else:
-                #         lines = str(message).splitlines()
+# --- Sharding and work claims ---
 
-                #     score_line = next(
-                #         (line.strip() for line in lines if line.strip().startswith("Your code has been rated at")),
-                #         None 
-                #     )
-                #     if score_line:
-                #         metric_result["message"] = score_line
-                #     else:
-                #         metric_result["message"] = "N/A"
-                #     continue
+def parse_shard(value):
+    """Parses "i/N" (1-based) into (i, N)."""
+    try:
+        index, count = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError("Shard must look like i/N, e.g. 2/8")
+    if not 1 <= index <= count:
+        raise argparse.ArgumentTypeError("Shard index must be between 1 and N")
+    return index, count
 
 
-                # Case 1: Code Smells - keep only pylint score line 
-                if metric_name == "Code Smells":
-                    try:
-                        soup = BeautifulSoup(str(message), "html.parser")
-                        divs = soup.find_all("div")
+def shard_of(project, count):
+    """Deterministic 1-based shard of a project, stable across machines and changes to the project list."""
+    digest = hashlib.sha1(project.encode("utf-8")).hexdigest()
+    return int(digest, 16) % count + 1
 
-                        score_line = None 
-                        for div in divs:
-                            text = div.get_text(strip=True)
-                            if text.startswith("Your code has been rated at"):
-                                score_line = text
-                                break
 
-                        metric_result["message"] = score_line if score_line else "N/A"
-                    
-                    except Exception as e:
-                        metric_result["message"] = f"N/A (parse error: {e})"
+def list_projects(projects_dir, shard=None):
+    """Lists the project folders under `projects_dir` (sorted), limited to one shard if given."""
+    projects = sorted(
+        name for name in os.listdir(projects_dir)
+        if os.path.isdir(os.path.join(projects_dir, name))
+    )
+    if shard:
+        index, count = shard
+        projects = [project for project in projects if shard_of(project, count) == index]
+    return projects
 
-                    continue
-                    
 
-                # Case 2: Other messages - clean HTML and keep top 1-2 lines only
-                clean_text = BeautifulSoup(message, "html.parser").get_text(separator="\n")
-                lines = [line.strip() for line in clean_text.splitlines() if line.strip()]
+def _claim_path(claims_dir, project):
+    return os.path.join(claims_dir, hashlib.sha1(project.encode("utf-8")).hexdigest())
 
-                # Filter out lines that start with 'Tip:' or 'Note:'
-                main_lines = [line for line in lines if not line.lower().startswith(("tip:", "note:"))]
 
-                # Keep only the first 1-2 relevant lines
-                trimmed = main_lines[:2] if main_lines else ["N/A"]
-                metric_result["message"] = " ".join(trimmed)
+def _read_owner(claim_path):
+    """Returns the owner record of a claim, or None if it has none (yet)."""
+    try:
+        with open(os.path.join(claim_path, "owner.json"), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def _write_owner(claim_path, project):
+    """Creates the claim's owner.json; O_EXCL makes sure only one process can, per claim directory."""
+    owner = {"project": project, "host": socket.gethostname(), "pid": os.getpid(),
+             "claimed_at": time.time(), "token": uuid.uuid4().hex}
+    try:
+        fd = os.open(os.path.join(claim_path, "owner.json"), os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+    except OSError:
+        return False
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(owner, f)
+    return True
+
+
+def _owns(claim_path):
+    owner = _read_owner(claim_path)
+    return bool(owner) and owner.get("host") == socket.gethostname() and owner.get("pid") == os.getpid()
+
+
+def claim_project(claims_dir, project, stale_after=STALE_CLAIM_SECONDS):
+    """
+    Claims a project for this process through a lock directory on a shared filesystem.
+
+    `mkdir` is atomic, even over NFS, so exactly one node gets each project without a
+    central service; the winner then creates `owner.json` with O_EXCL. Finished claims are
+    marked "done". A running claim is kept fresh by `claim_heartbeat`; unfinished claims
+    that were not touched for `stale_after` seconds are taken over.
+
+    Returns:
+        bool: True if this process now owns the project.
+    """
+    claim_path = _claim_path(claims_dir, project)
+    try:
+        os.mkdir(claim_path)
+    except FileExistsError:
+        if os.path.exists(os.path.join(claim_path, "done")):
+            return False
+        try:
+            if time.time() - os.path.getmtime(claim_path) < stale_after:
+                return False
+            # Move the abandoned claim to a unique name; only one node can win the rename
+            stale_owner = _read_owner(claim_path)
+            moved_path = f"{claim_path}.stale-{uuid.uuid4().hex}"
+            os.rename(claim_path, moved_path)
+        except OSError:
+            return False
+
+        if _read_owner(moved_path) != stale_owner:
+            # Another node took the claim over after we looked at it, and we moved its fresh
+            # claim: put it back and leave the project to that node
+            try:
+                os.rename(moved_path, claim_path)
+            except OSError:
+                pass
+            return False
+
+        try:
+            os.mkdir(claim_path)
+        except OSError:
+            return False
+
+    return _write_owner(claim_path, project)
+
+
+@contextmanager
+def claim_heartbeat(claims_dir, project, interval=None):
+    """
+    Touches the claim every `interval` seconds (default: a tenth of STALE_CLAIM_SECONDS)
+    while the block runs, so an evaluation that takes longer than STALE_CLAIM_SECONDS
+    is not taken over by another node.
+    """
+    claim_path = _claim_path(claims_dir, project)
+    interval = interval or STALE_CLAIM_SECONDS / 10
+    stopped = threading.Event()
+
+    def beat():
+        while not stopped.wait(interval):
+            try:
+                os.utime(claim_path)
+            except OSError:
+                pass
+
+    thread = threading.Thread(target=beat, name=f"claim-heartbeat-{project}", daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stopped.set()
+        thread.join()
+
+
+def finish_claim(claims_dir, project):
+    """Marks a claimed project as done, so no other node picks it up again."""
+    claim_path = _claim_path(claims_dir, project)
+    if not _owns(claim_path):
+        return
+    with open(os.path.join(claim_path, "done"), "w", encoding="utf-8") as f:
+        f.write(str(time.time()))
+
+
+def release_claim(claims_dir, project):
+    """Gives up a claim without marking it done (e.g. the project failed), so a later run retries it."""
+    claim_path = _claim_path(claims_dir, project)
+    if _owns(claim_path):
+        shutil.rmtree(claim_path, ignore_errors=True)
+
+
+def reset_out_dir(out_dir):
+    """Removes the claims and shard files of earlier runs, so the next run starts from scratch."""
+    shutil.rmtree(os.path.join(out_dir, "claims"), ignore_errors=True)
+    for shard_file in Path(out_dir).glob("shard-*.jsonl"):
+        shard_file.unlink()
+
+
+def read_jsonl(path):
+    """Yields the records of a JSONL file, skipping a truncated last line (e.g. after a crash)."""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+
+def run_batch(projects_dir, out_dir, stage, shard=None, profile=None):
+    """
+    Evaluates the projects of one shard (or all projects) and appends one JSON line per
+    project to `<out_dir>/shard-<i>-of-<N>-<host>-<pid>.jsonl`.
+
+    Several nodes can run the same shard: every project is claimed in `<out_dir>/claims`
+    first, so it is evaluated only once, and each process appends to its own file, so
+    lines from different nodes never interleave. Re-running a shard resumes where it stopped,
+    and retries the projects that failed.
+    """
+    claims_dir = os.path.join(out_dir, "claims")
+    os.makedirs(claims_dir, exist_ok=True)
+
+    index, count = shard or (1, 1)
+    shard_file = os.path.join(out_dir, f"shard-{index}-of-{count}-{socket.gethostname()}-{os.getpid()}.jsonl")
+
+    projects = list_projects(projects_dir, shard)
+    print(f"Shard {index}/{count}: {len(projects)} projects")
+
+    for project in projects:
+        if not claim_project(claims_dir, project):
+            continue
+
+        print(f"Running analysis for: {project}")
+        record = {"project": project, "stage": stage, "host": socket.gethostname()}
+        try:
+            with claim_heartbeat(claims_dir, project):
+                record["results"] = evaluate_project(os.path.join(projects_dir, project), stage, profile)
+        except RuntimeError as e:
+            print(f"⚠ {project}: {e}")
+            record["error"] = str(e)
+        record["finished_at"] = time.time()
+
+        # One line per project, flushed right away so a crash loses at most the current project
+        with open(shard_file, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+        if "error" in record:
+            release_claim(claims_dir, project)
+        else:
+            finish_claim(claims_dir, project)
+
+    print(f"\n ✓ Shard {index}/{count} done. Results appended to: {shard_file}")
+
+
+def merge_shards(out_dir, merged_file):
+    """
+    Combines all shard JSONL files into one results JSON ({project: results}), as read by extract_results.py.
+
+    A project evaluated more than once (retries, re-runs on other nodes) keeps its most recent record;
+    if that one failed, the project counts as failed.
+    """
+    latest = {}
+    for shard_file in Path(out_dir).glob("shard-*.jsonl"):
+        for record in read_jsonl(shard_file):
+            previous = latest.get(record["project"])
+            if previous is None or record.get("finished_at", 0) >= previous.get("finished_at", 0):
+                latest[record["project"]] = record
+
+    summary_results = {project: latest[project]["results"] for project in sorted(latest) if "results" in latest[project]}
+    errors = len(latest) - len(summary_results)
+
+    with open(merged_file, "w", encoding="utf-8") as f:
+        json.dump(summary_results, f, indent=2)
+
+    print(f"\n ✓ Merged {len(summary_results)} projects ({errors} failed) into: {merged_file}")
+    return summary_results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the quality scan over a folder of projects, optionally sharded over several machines.")
+    subparsers = parser.add_subparsers(dest="command")
+
+    run_parser = subparsers.add_parser("run", help="Evaluate projects (default)")
+    run_parser.add_argument("--projects-dir", default=base_dir, help="Folder with one sub-folder per project")
+    run_parser.add_argument("--out-dir", default=results_dir, help="Shared folder for shard outputs and claims")
+    run_parser.add_argument("--stage", default=selected_stage, help="Lifecycle stage to evaluate")
+    run_parser.add_argument("--shard", type=parse_shard, default=None, help="Only evaluate shard i of N (e.g. 2/8)")
+    run_parser.add_argument("--profile", default=None, help="Scan profile passed to the CLI (quick, standard or deep)")
+
+    merge_parser = subparsers.add_parser("merge", help="Combine shard outputs into one results file")
+    merge_parser.add_argument("--out-dir", default=results_dir, help="Folder with the shard-*.jsonl files")
+    merge_parser.add_argument("--output", default=output_file, help="Merged results JSON file")
+
+    args = parser.parse_args()
 
-    # Store cleaned result into summary
-    summary_results[project] = parsed_results
+    if args.command == "merge":
+        merge_shards(args.out_dir, args.output)
+    elif args.command == "run":
+        run_batch(args.projects_dir, args.out_dir, args.stage, args.shard, args.profile)
+    else:
+        # Previous behavior: evaluate everything on this machine from scratch and write the merged results file
+        reset_out_dir(results_dir)
+        run_batch(base_dir, results_dir, selected_stage)
+        merge_shards(results_dir, output_file)
 
-# --- Save final results ---
-with open(output_file, "w", encoding="utf-8") as f:
-    json.dump(summary_results, f, indent=2)
 
-print(f"\n ✓ All done! Results saved to: {output_file}")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
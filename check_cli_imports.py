@@ -0,0 +1,87 @@
+import os
+import subprocess
+import sys
+
+# Checks that `run_quality_scan_cli.py --help` starts without importing any analysis library,
+# and that importing the modules a minimal Development scan needs (scheduler, evaluator and
+# the stage's tool runners) does not load one either. Analysis libraries are imported only
+# when a tool actually runs; a top-level import added by mistake makes every invocation
+# (and --help) pay for it again.
+#
+#   python check_cli_imports.py        # exits with 1 and lists the offenders if any are imported
+
+CLI_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "run_quality_scan_cli.py")
+
+# Top-level packages that must not be imported before the scan starts
+HEAVY_MODULES = {
+    "pylint", "astroid", "radon", "bandit", "nbformat", "nbconvert", "nbclient", "jupyter_client",
+    "IPython", "ipywidgets", "bs4", "requests", "pytest", "watchdog", "sqlite3", "numpy",
+}
+
+# Modules every scan goes through, besides the tool runners of the scanned stage
+SCAN_MODULES = [
+    "evaluation.evaluator", "evaluation.scheduler", "evaluation.aggregation", "evaluation.file_classifier",
+    "evaluation.ast_pass", "evaluation.notebook_converter",
+]
+SCAN_STAGE = "Development"
+
+
+def imported_modules(command):
+    """Runs `command` with `python -X importtime` and returns {module: cumulative microseconds}."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", *command],
+        capture_output=True, text=True, cwd=os.path.dirname(CLI_SCRIPT)
+    )
+    modules = {}
+    for line in completed.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        modules[parts[2].strip()] = int(parts[1])
+    return modules
+
+
+def scan_modules(stage=SCAN_STAGE):
+    """The pipeline modules plus the runner module of every tool the stage's metrics use."""
+    sys.path.insert(0, os.path.dirname(CLI_SCRIPT))
+    from lifecycle.metric_registry import METRIC_REGISTRY, TOOLS
+    from lifecycle.stage_manager import get_metrics_for_stage
+
+    runners = {
+        TOOLS[METRIC_REGISTRY[metric]["tool"]]["runner"].split(":")[0]
+        for metric in get_metrics_for_stage(stage) if metric in METRIC_REGISTRY
+    }
+    return SCAN_MODULES + sorted(runners)
+
+
+def heavy_imports(description, command):
+    """Prints the analysis modules `command` imports; returns True if there are any."""
+    modules = imported_modules(command)
+    heavy = sorted(name for name in modules if name.split(".")[0] in HEAVY_MODULES)
+    total = sum(us for name, us in modules.items() if "." not in name) / 1000
+
+    if heavy:
+        print(f"✗ {description} imports analysis modules ({total:.0f} ms in imports):")
+        for name in heavy:
+            print(f"  {name} ({modules[name] / 1000:.1f} ms)")
+        return True
+    print(f"✓ {description} imports no analysis modules ({len(modules)} modules, {total:.0f} ms)")
+    return False
+
+
+def main():
+    failed = heavy_imports("run_quality_scan_cli.py --help", [CLI_SCRIPT, "--help"])
+    modules = scan_modules()
+    failed |= heavy_imports(
+        f"Importing a {SCAN_STAGE} scan's modules",
+        ["-c", "import " + ", ".join(modules)]
+    )
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
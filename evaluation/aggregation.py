@@ -0,0 +1,164 @@
+import os
+from array import array
+
+# numpy is only imported when a summary is computed
+
+# Per-file numeric metrics that are aggregated: result key -> (field holding the value, higher is better)
+NUMERIC_FILE_METRICS = {
+    "Maintainability Index": ("score", True),
+    "Cyclomatic Complexity": ("score", False),
+    "Cognitive Complexity": ("score", False),
+    "Comment Density": ("density", True),
+}
+
+SUMMARY_KEY = "File Metric Summary"
+TOP_N = 5
+
+# Project-level result whose "files" map gives each file's lines of code (tools/loc_counter.py)
+LOC_KEY = "Software Size (LoC)"
+
+
+def new_columns():
+    """
+    Creates empty metric columns.
+
+    Each metric keeps its values, LoC weights and file names in compact arrays, so
+    collecting a batch corpus of 100k+ files does not build a dict per file.
+    """
+    return {metric: {"files": [], "values": array("d"), "weights": array("d")} for metric in NUMERIC_FILE_METRICS}
+
+
+def collect_file_metrics(results, columns=None, prefix=""):
+    """
+    Adds the per-file numeric metrics of one `evaluate_metrics` result to the columns.
+
+    Args:
+        results (dict): output of `evaluate_metrics` (or one project of a batch result).
+        columns (dict): columns from `new_columns()` to extend; created if None.
+        prefix (str): prepended to file names, e.g. the project name in a batch.
+
+    Returns:
+        dict: the columns.
+    """
+    columns = columns if columns is not None else new_columns()
+    file_loc = _file_loc(results)
+
+    for file, file_metrics in results.items():
+        if file == "Project-Level Results" or not isinstance(file_metrics, dict):
+            continue
+
+        loc = None
+        for metric, (field, _) in NUMERIC_FILE_METRICS.items():
+            value = file_metrics.get(metric, {}).get(field) if isinstance(file_metrics.get(metric), dict) else None
+            if not isinstance(value, (int, float)):
+                continue
+
+            if loc is None:
+                # LoC weight from the scan's own LoC result; files it did not count weigh 1
+                path = os.path.abspath(file)
+                loc = max(file_loc.get(path) or file_loc.get(os.path.splitext(path)[0] + ".ipynb") or 1, 1)
+
+            columns[metric]["files"].append(prefix + file)
+            columns[metric]["values"].append(float(value))
+            columns[metric]["weights"].append(float(loc))
+
+    return columns
+
+
+def _file_loc(results):
+    """
+    Returns {absolute path: lines of code} from the scan's Software Size result, so weights
+    need no file access (batch results may come from other machines or deleted temp folders).
+    """
+    loc_result = results.get("Project-Level Results", {}).get(LOC_KEY)
+    files = loc_result.get("files") if isinstance(loc_result, dict) else None
+    if not isinstance(files, dict):
+        return {}
+    return {os.path.abspath(path): loc for path, loc in files.items() if isinstance(loc, (int, float))}
+
+
+def summarize_columns(columns, top_n=TOP_N):
+    """
+    Computes the project (or corpus) summary of each metric column.
+
+    Returns:
+        dict: metric -> {
+            "files": number of files with a value,
+            "mean": plain mean, "weighted_mean": LoC-weighted mean,
+            "p50", "p90", "max": distribution of the values,
+            "worst": up to `top_n` [file, value] pairs, worst first
+        }
+    """
+    import numpy as np
+
+    summary = {}
+    for metric, column in columns.items():
+        if not column["values"]:
+            continue
+
+        values = np.frombuffer(column["values"], dtype=np.float64)
+        weights = np.frombuffer(column["weights"], dtype=np.float64)
+        p50, p90 = np.percentile(values, [50, 90])
+
+        # Worst = lowest values for higher-is-better metrics, highest otherwise.
+        # argpartition keeps this linear for large corpora; only the top N are sorted.
+        ranking = values if not NUMERIC_FILE_METRICS[metric][1] else -values
+        count = min(top_n, len(values))
+        worst = np.argpartition(-ranking, count - 1)[:count]
+        worst = worst[np.argsort(-ranking[worst], kind="stable")]
+
+        summary[metric] = {
+            "files": int(len(values)),
+            "mean": float(values.mean()),
+            "weighted_mean": float(np.average(values, weights=weights)),
+            "p50": float(p50),
+            "p90": float(p90),
+            "max": float(values.max()),
+            "worst": [[column["files"][i], float(values[i])] for i in worst],
+        }
+    return summary
+
+
+def summarize_results(results, top_n=TOP_N):
+    """
+    Builds the "File Metric Summary" project-level result for one scan,
+    or returns None if the scan has no per-file numeric metrics.
+    """
+    summary = summarize_columns(collect_file_metrics(results), top_n)
+    if not summary:
+        return None
+
+    rows = ""
+    for metric, stats in summary.items():
+        worst = ", ".join(f"<code>{os.path.basename(file)}</code> ({value:.2f})" for file, value in stats["worst"])
+        rows += (
+            f"<div style='margin-left: 20px; font-size: 90%;'><b>{metric}</b> ({stats['files']} files): "
+            f"LoC-weighted mean {stats['weighted_mean']:.2f}, mean {stats['mean']:.2f}, "
+            f"p50 {stats['p50']:.2f}, p90 {stats['p90']:.2f}, max {stats['max']:.2f}</div>"
+            f"<div style='margin-left: 40px; color: gray; font-size: 90%;'>Worst files: {worst}</div>"
+        )
+
+    styled_note = (
+        "<div style='margin-left: 20px; color: gray; font-size: 90%;'>"
+        "<i>Note: Means are weighted by each file's lines of code (from Software Size (LoC); "
+        "files without a count weigh 1), so large files count more. "
+        "Worst files are the lowest scores for Maintainability Index and Comment Density, "
+        "and the highest for Cyclomatic and Cognitive Complexity.</i></div>"
+    )
+
+    return {
+        "status": "pass",
+        "summary": summary,
+        "message": rows + styled_note
+    }
+
+
+def summarize_batch_results(all_results, top_n=TOP_N):
+    """
+    Summarizes per-file metrics over a batch of projects ({project: evaluate_metrics result}).
+    File names in the worst-offender lists are prefixed with their project.
+    """
+    columns = new_columns()
+    for project, results in all_results.items():
+        collect_file_metrics(results, columns, prefix=f"{project}:")
+    return summarize_columns(columns, top_n)
@@ -0,0 +1,222 @@
+import os
+import ast
+from tools.result_cache import CACHE_DIR, file_digest, load_cache, save_cache
+
+# Shared AST pass: every Python file is parsed once per scan and reduced to small,
+# JSON-serializable facts (imports, functions, classes) that several tools build on.
+# Facts are cached per file content, so unchanged files are not parsed again.
+
+CACHE_PATH = os.path.join(CACHE_DIR, "ast_facts.json")
+CACHE_MAX_ENTRIES = 50000
+
+# Bump when the extracted facts change, so old cache entries are not reused
+FACTS_VERSION = 3
+
+
+def _dotted_name(node):
+    """Returns "a.b.c" for a Name/Attribute chain, or None for anything else (calls, subscripts...)."""
+    parts = []
+    while isinstance(node, ast.Attribute):
+        parts.append(node.attr)
+        node = node.value
+    if isinstance(node, ast.Name):
+        parts.append(node.id)
+        return ".".join(reversed(parts))
+    return None
+
+
+def _walk_body(node):
+    """Yields the nodes inside a function or class body, without entering nested functions and classes."""
+    stack = list(ast.iter_child_nodes(node))
+    while stack:
+        child = stack.pop()
+        yield child
+        if not isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef, ast.Lambda)):
+            stack.extend(ast.iter_child_nodes(child))
+
+
+def _cognitive_body(nodes, nesting):
+    return sum(_cognitive(node, nesting) for node in nodes)
+
+
+def _cognitive_if(node, nesting, is_elif=False):
+    # "elif" adds a point but no nesting penalty; its branches are nested like the first "if"
+    score = 1 + (0 if is_elif else nesting)
+    score += _cognitive(node.test, nesting)
+    score += _cognitive_body(node.body, nesting + 1)
+    if len(node.orelse) == 1 and isinstance(node.orelse[0], ast.If):
+        score += _cognitive_if(node.orelse[0], nesting, is_elif=True)
+    elif node.orelse:
+        score += 1 + _cognitive_body(node.orelse, nesting + 1)
+    return score
+
+
+def _cognitive(node, nesting):
+    """
+    Cognitive complexity (SonarSource, 2017) of a node and everything below it.
+
+    Branches and loops add 1 plus their nesting depth, "elif"/"else" add 1, and every
+    sequence of "and"/"or" operators adds 1. Nested functions and lambdas raise the
+    nesting depth of their contents. Recursion is added by the caller (see `_FactCollector`).
+    """
+    if isinstance(node, ast.If):
+        return _cognitive_if(node, nesting)
+
+    if isinstance(node, (ast.For, ast.AsyncFor, ast.While)):
+        score = 1 + nesting
+        score += _cognitive(node.iter if isinstance(node, (ast.For, ast.AsyncFor)) else node.test, nesting)
+        score += _cognitive_body(node.body, nesting + 1)
+        if node.orelse:
+            score += 1 + _cognitive_body(node.orelse, nesting + 1)
+        return score
+
+    if isinstance(node, ast.Try) or type(node).__name__ == "TryStar":
+        score = _cognitive_body(node.body, nesting)
+        for handler in node.handlers:
+            score += 1 + nesting + _cognitive_body(handler.body, nesting + 1)
+        return score + _cognitive_body(node.orelse, nesting) + _cognitive_body(node.finalbody, nesting)
+
+    if isinstance(node, ast.IfExp):
+        return 1 + nesting + _cognitive(node.test, nesting) + _cognitive(node.body, nesting + 1) + _cognitive(node.orelse, nesting + 1)
+
+    if type(node).__name__ == "Match":
+        score = 1 + nesting + _cognitive(node.subject, nesting)
+        return score + sum(_cognitive_body(case.body, nesting + 1) for case in node.cases)
+
+    if isinstance(node, ast.BoolOp):
+        # "a and b and c" is one sequence; "a and b or c" is two
+        score = 1
+        for value in node.values:
+            if isinstance(value, ast.BoolOp) and type(value.op) is type(node.op):
+                score += _cognitive_body(value.values, nesting)
+            else:
+                score += _cognitive(value, nesting)
+        return score
+
+    if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+        return _cognitive_body(node.body, nesting + 1)
+
+    if isinstance(node, ast.Lambda):
+        return _cognitive(node.body, nesting + 1)
+
+    return _cognitive_body(ast.iter_child_nodes(node), nesting)
+
+
+class _FactCollector(ast.NodeVisitor):
+    def __init__(self):
+        self.imports = []
+        self.functions = []
+        self.classes = []
+        self.scope = []
+        self.function_depth = 0
+
+    def visit_Import(self, node):
+        for alias in node.names:
+            self.imports.append([alias.name, 0, []])
+
+    def visit_ImportFrom(self, node):
+        self.imports.append([node.module or "", node.level, [alias.name for alias in node.names]])
+
+    def visit_FunctionDef(self, node):
+        qualname = ".".join(self.scope + [node.name])
+        calls = sorted({name for child in _walk_body(node) if isinstance(child, ast.Call)
+                        for name in [_dotted_name(child.func)] if name})
+        recursive = any(call in (node.name, f"self.{node.name}", f"cls.{node.name}") for call in calls)
+        self.functions.append({
+            "name": qualname,
+            "line": node.lineno,
+            "end_line": getattr(node, "end_lineno", node.lineno),
+            "calls": calls,
+            "cognitive": _cognitive_body(node.body, 0) + (1 if recursive else 0),
+            "nested": self.function_depth > 0,
+        })
+        self.scope.append(node.name)
+        self.function_depth += 1
+        self.generic_visit(node)
+        self.function_depth -= 1
+        self.scope.pop()
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_ClassDef(self, node):
+        methods = {}
+        for item in node.body:
+            if not isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)) or not item.args.args:
+                continue
+            # Attributes and methods reached through the instance (usually "self")
+            instance = item.args.args[0].arg
+            methods[item.name] = sorted({
+                child.attr for child in _walk_body(item)
+                if isinstance(child, ast.Attribute) and isinstance(child.value, ast.Name) and child.value.id == instance
+            })
+        self.classes.append({"name": ".".join(self.scope + [node.name]), "line": node.lineno, "methods": methods})
+
+        self.scope.append(node.name)
+        self.generic_visit(node)
+        self.scope.pop()
+
+
+def extract_facts(source):
+    """
+    Parses Python source and returns its facts:
+
+        {"lines": number of lines,
+         "imports": [[module, level, [imported names]]],
+         "functions": [{"name": qualified name, "line", "end_line", "calls": [dotted callee names],
+                        "cognitive": cognitive complexity (nested functions included), "nested": inside another function}],
+         "module_cognitive": cognitive complexity of the code outside functions and classes,
+         "classes": [{"name", "line", "methods": {method: [attributes used through self]}}],
+         "error": None or the syntax error}
+    """
+    lines = source.count("\n") + 1
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError) as e:
+        return {"lines": lines, "imports": [], "functions": [], "classes": [], "module_cognitive": 0, "error": str(e)}
+
+    collector = _FactCollector()
+    collector.visit(tree)
+    return {
+        "lines": lines,
+        "imports": collector.imports,
+        "functions": collector.functions,
+        "classes": collector.classes,
+        "module_cognitive": _cognitive_body(
+            [node for node in tree.body if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef))], 0
+        ),
+        "error": None
+    }
+
+
+def collect_ast_facts(files):
+    """
+    Runs the shared AST pass over a list of Python files.
+
+    Returns:
+        dict: {file path: facts (see `extract_facts`)}
+    """
+    cache = load_cache(CACHE_PATH)
+    facts = {}
+    changed = False
+
+    for filepath in files:
+        try:
+            key = f"{FACTS_VERSION}:{file_digest(filepath)}"
+        except OSError:
+            continue
+
+        if key in cache:
+            facts[filepath] = cache[key]
+            continue
+
+        try:
+            with open(filepath, "r", encoding="utf-8", errors="replace") as f:
+                source = f.read()
+        except OSError:
+            continue
+        facts[filepath] = cache[key] = extract_facts(source)
+        changed = True
+
+    if changed:
+        save_cache(CACHE_PATH, cache, max_entries=CACHE_MAX_ENTRIES)
+    return facts
@@ -1,34 +1,62 @@
-import os  
-from IPython.display import display, HTML, Markdown
-from tools.pylint_runner import run_pylint_code_smell  
-from tools.radon_runner import run_radon_maintainability_index
-from tools.radon_runner import run_radon_cyclomatic_complexity
-from tools.radon_runner import run_radon_comment_density
-from tools.jscpd_runner import run_jscpd_code_duplication
-from tools.loc_counter import run_project_loc
-from tools.assertion_counter import run_assertion_percentage
-from tools.howfairis_runner import run_howfairis_license_check
-from tools.gitleaks_runner import run_gitleaks_secret_scan
-from tools.bandit_runner import run_bandit_security_scan
-from tools.dependency_checker import run_dependency_check
-from evaluation.notebook_converter import convert_notebooks_in_dir
+from lifecycle.metric_registry import METRIC_REGISTRY, TOOLS
+from lifecycle.scan_profiles import DEFAULT_PROFILE, get_scan_profile
+
+# Tool runners, nbconvert and IPython are imported where they are used, so that
+# importing this module (e.g. for `run_quality_scan_cli.py --help`) stays cheap.
+
+# Planning and Design metric overview section
+def get_planning_metrics_status():
+    return [
+        ("Modularity", "measured", "Automatically checked from the module import graph: fan-in, fan-out and instability of each module."),
+        ("Cohesion", "measured", "Automatically checked via LCOM4: the number of unrelated method groups in each class."),
+        ("Requirement Traceability", "manual", "Not automatically measurable. Requires linking requirements to the code and tests that implement them."),
+        ("Architectural Complexity", "measured", "Automatically checked from the module import graph: import cycles and the longest chain of module dependencies.")
+    ]
+
+def display_planning_metric_overview():
+    from IPython.display import display, HTML
+
+    status_icon = {
+        "measured": "✓",
+        "partial": "~",
+        "manual": "×"
+    }
+
+    label_text = {
+        "measured": "measured",
+        "partial": "partially measured",
+        "manual": "requires human evaluation"
+    }
+
+    display(HTML("<h4>Planning and Design Metrics Being Checked:</h4><ul>"))
+    for name, status, explanation in get_planning_metrics_status():
+        icon = status_icon.get(status, "?")
+        label = label_text.get(status, status)
+
+        display(HTML(
+            f"<li>{icon} <b>{name}</b> ({label})"
+            f"<div style='margin-left: 20px; color: gray; font-size: 90%;'><i>{explanation}</i></div></li><br>"
+        ))
+    display(HTML("</ul>"))
 
 # Development metric overview section
 def get_development_metrics_status():
     return [
         ("Code Smells", "measured", "Automatically checked via pylint."),
         ("Maintainability Index", "measured", "Automatically checked via radon."),
-        ("Cognitive Complexity", "manual", "Not automatically measurable. Requires human judgment to assess nested structures, logic flow, and mental overhead."),
+        ("Cognitive Complexity", "measured", "Automatically checked via a custom implementation of the SonarSource cognitive complexity rules (nesting, boolean operator sequences, recursion)."),
         ("Cyclomatic Complexity", "measured", "Automatically checked via radon."),
         ("Code Duplication", "measured", "Automatically checked via jscpd."),
-        ("Technical Debt", "partial", "Estimated indirectly using indicators like code smells (pylint), cyclomatic complexity (radon), code duplication (jscpd), and maintainability index (radon). These issues often lead to technical debt. While no standard tool calculates technical debt for research notebooks, this approximation gives insight into future refactoring."),
-        ("Dependency Management", "partial", "Partially measured by checking whether required libraries are declared in requirements.txt and used in code. Helps detect missing or unused dependencies."),
+        ("Technical Debt", "measured", "Estimated as remediation time per function from the code smells (pylint), cyclomatic complexity (radon), duplicated blocks (jscpd) and function length found in this scan. Functions are ranked by their debt weighted by how central they are in the call graph, so refactoring starts with code the rest of the project relies on."),
+        ("Dependency Management", "partial", "Partially measured by checking whether required libraries are declared in the dependency manifests (requirements.txt, pyproject.toml, setup.cfg, environment.yml) and used in code. Helps detect missing or unused dependencies."),
         ("Comment Density", "measured", "Automatically checked via radon (raw analysis)."),
         ("Software Size (LoC)", "measured", "Automatically checked via custom script."),
         ("Percentage of Assertions", "measured", "Automatically checked via custom script.")
     ]
 
 def display_development_metric_overview():
+    from IPython.display import display, HTML
+
     status_icon = {
         "measured": "✓",
         "partial": "~",
@@ -55,16 +83,18 @@ def display_development_metric_overview():
 # Maintenance metric overview section
 def get_maintenance_metrics_status():
     return [
-        ("Presence of License", "measured", "Automatically checked via howfairis."),
-        ("Publicly Accessible Repository", "measured", "Automatically checked via howfairis."),
-        ("Rich Metadata", "partial", "Note: Partially measured by howfairis. This checks presence of citation metadata only, not completeness or quality."),
-        ("Documentation Quality", "partial", "Note: Partially measured by howfairis. This checks documentation by verifying citation metadata, but not how well-documented the code is."),
+        ("Presence of License", "measured", "Automatically checked from the license file or package metadata."),
+        ("Publicly Accessible Repository", "measured", "Automatically checked from the git remote, and via the GitHub API if a URL is given."),
+        ("Rich Metadata", "partial", "Note: Partially measured by the FAIR checker. This checks presence of citation metadata only, not completeness or quality."),
+        ("Documentation Quality", "partial", "Note: Partially measured by the FAIR checker. This checks documentation by verifying citation metadata, but not how well-documented the code is."),
         ("User Satisfaction", "manual", "Not automatically measurable. This requires user surveys or interviews."),
         ("No Leaked Private Credentials", "measured", "Automatically checked via gitleaks."),
         ("Security Vulnerabilities", "measured", "Automatically checked via bandit.")
     ]
 
 def display_maintenance_metric_overview():
+    from IPython.display import display, HTML
+
     status_icon = {
         "measured": "✓",
         "partial": "~",
@@ -87,121 +117,248 @@ def display_maintenance_metric_overview():
 
     display(HTML("</ul>"))
 
+# Testing metric overview section
+def get_testing_metrics_status():
+    return [
+        ("Unit Tests", "measured", "Automatically checked by discovering test files (test_*.py, *_test.py) and running them with pytest."),
+        ("Test Success Rate", "measured", "Automatically checked via pytest: share of passed tests among the tests that ran, with the test duration distribution."),
+        ("Code Reproducibility", "measured", "Automatically checked by re-running each notebook in a fresh kernel (nbclient) and comparing the outputs with the saved ones, ignoring volatile fields."),
+        ("Defect Rate", "manual", "Not automatically measurable. Requires an issue tracker or bug reports over time.")
+    ]
+
+def display_testing_metric_overview():
+    from IPython.display import display, HTML
 
-def evaluate_metrics(metrics, path, github_url=None):
-    results = {}
-
-    # Convert notebooks if the target is a directory or an .ipynb file
-    if os.path.isdir(path):
-        convert_notebooks_in_dir(path)
-        # Collect all Python files (converted or original)
-        python_files = []
-
-        # for root, dirs, files in os.walk(path):
-
-        #     excluded_dirs = {
-        #             "venv", "env", "__pycache__", ".git", ".hg", ".svn",
-        #             ".ipynb_checkpoints", ".mypy_cache", ".pytest_cache",
-        #             "build", "dist", ".tox", ".nox", "site-packages",
-        #             ".idea", ".vscode", ".DS_Store", "__pypackages__",
-        #             "jscpd-report", "bandit-report", "gitleaks-report"
-        #     }
-        #     dirs[:] = [d for d in dirs if d not in excluded_dirs]
-            
-        #     for file in files:
-        #         if file.endswith(".py") and file != "__init__.py":
-        #             python_files.append(os.path.join(root, file))
-
-
-        # Define filters
-        excluded_dirs = {
-            "venv", "env", "__pycache__", ".git", ".hg", ".svn",
-            ".ipynb_checkpoints", ".mypy_cache", ".pytest_cache",
-            "build", "dist", ".tox", ".nox", "site-packages",
-            ".idea", ".vscode", ".DS_Store", "__pypackages__",
-            "jscpd-report", "bandit-report", "gitleaks-report"
-        }
-
-        irrelevant_filenames = {
-            "__init__.py", "setup.py", "install.py", "version.py", "manage.py"
-        }
-
-        irrelevant_subpaths = [
-            "/migrations/", "/__pycache__/"
-        ]
+    status_icon = {
+        "measured": "✓",
+        "partial": "~",
+        "manual": "×"
+    }
+
+    label_text = {
+        "measured": "measured",
+        "partial": "partially measured",
+        "manual": "requires human evaluation"
+    }
+
+    display(HTML("<h4>Testing Metrics Being Checked:</h4><ul>"))
+    for name, status, explanation in get_testing_metrics_status():
+        icon = status_icon.get(status, "?")
+        label = label_text.get(status, status)
+
+        display(HTML(
+            f"<li>{icon} <b>{name}</b> ({label})"
+            f"<div style='margin-left: 20px; color: gray; font-size: 90%;'><i>{explanation}</i></div></li><br>"
+        ))
+    display(HTML("</ul>"))
+
+
+def evaluate_metrics(metrics, path, github_url=None, full_rescan=False, update_baseline=False, classify_files=True,
+                     profile=None, on_result=None):
+    """
+    Runs the tools needed for the requested metrics on a file, notebook or project folder.
+
+    The registry in `lifecycle/metric_registry.py` says which tool measures each metric.
+    Shared inputs (notebook conversion, file list, git state) are prepared once, each
+    tool runs at most once, and expensive tools run first. Metrics without a registered
+    tool are skipped.
+
+    Incremental tools (gitleaks) only scan what changed since the last scan, unless
+    `full_rescan` is set. `update_baseline` stores the current Bandit issues as accepted.
+
+    With `classify_files`, very large, generated, minified and data files only get cheap
+    per-file metrics; their results include a "File Classification" entry saying why.
+
+    Tools marked `uses_results` in the registry (technical debt) run last and build on
+    the results of the other tools instead of analyzing the code again.
+
+    When per-file metrics were measured, the project-level results also get a
+    "File Metric Summary" (LoC-weighted means, percentiles and worst files).
+
+    `profile` names a scan profile from `lifecycle/scan_profiles.py` ("quick", "standard"
+    or "deep"; default "standard"). It decides which tools run and with which settings;
+    metrics whose tool it skips are listed in a "Scan Profile" project-level result.
 
-        # Walk through directory and apply filters
-        for root, dirs, files in os.walk(path):
-            dirs[:] = [d for d in dirs if d not in excluded_dirs]
-
-            for file in files:
-                if file.endswith(".py"):
-                    if file in irrelevant_filenames:
-                        continue 
-
-                    full_path = os.path.join(root, file)
-                    if any(sub in full_path for sub in irrelevant_subpaths):
-                        continue
-
-                    # Optional: skip test files too
-                    if file.startswith("test_") or file.endswith("_test.py"):
-                        continue
-
-                    python_files.append(full_path)
-
-
-    elif path.endswith(".ipynb"):
-        # Convert this single notebook to Python
-        converted_path = convert_notebooks_in_dir(path)
-        python_files = [converted_path] if converted_path else []
-    
-    elif path.endswith(".py"):
-        python_files = [path]
-    
-    else:
-        raise ValueError("Invalid target path. Must be a Python file, notebook, or directory.")
-    
-    results["Project-Level Results"] = {}
-
-    if any(m in metrics for m in ["Presence of License", "No Leaked Private Credentials", "Security Vulnerabilities"]):
-        results["Project-Level Results"]["FAIR Assessment (howfairis)"] = run_howfairis_license_check(github_url)
-        results["Project-Level Results"]["-----divider-1-----"] = {"status": "pass", "message": ""}
-        results["Project-Level Results"]["Leaked Secrets Scan (Gitleaks)"] = run_gitleaks_secret_scan(path)
-        results["Project-Level Results"]["-----divider-2-----"] = {"status": "pass", "message": ""}
-        results["Project-Level Results"]["Security Vulnerability Scan (Bandit)"] = run_bandit_security_scan(path)
-
-    if "Dependency Management" in metrics:
-        results["Project-Level Results"]["Dependency Management"] = run_dependency_check(path)
-    
-    if "Software Size (LoC)" in metrics:
-        results["Project-Level Results"]["Software Size (LoC)"] = run_project_loc(path)
-
-    if "Code Duplication" in metrics:
-        results["Project-Level Results"]["Code Duplication"] = run_jscpd_code_duplication(path)
-
-    if "Percentage of Assertions" in metrics: 
-        results["Project-Level Results"]["Percentage of Assertions"] = run_assertion_percentage(path)
+    `on_result(section, metric, result)` is called with every result as soon as it is
+    final, so callers can write results out while the scan is still running. `section`
+    is "Project-Level Results" or the file path, as in the returned dict.
+
+    Returns:
+        dict: {"Project-Level Results": {...}, "<file path>": {metric: result}, ...}
+    """
+    from evaluation.scheduler import plan_scan, prepare_inputs, run_tool
+
+    scan_profile = get_scan_profile(profile)
+    plan = plan_scan(metrics, scan_profile["skip_tools"])
+    options = {"full_rescan": full_rescan, "update_baseline": update_baseline, "classify_files": classify_files,
+               **scan_profile["tool_options"]}
+    inputs = prepare_inputs(plan["inputs"], path, github_url, options)
+
+    def publish(section, section_results):
+        if on_result is not None:
+            for metric, result in section_results.items():
+                on_result(section, metric, result)
+
+    # === Project-level metrics ===
+    derived_tools = [tool for tool in plan["project_tools"] if TOOLS[tool].get("uses_results")]
+    tool_results = {}
+    for tool in plan["project_tools"]:
+        if tool in derived_tools:
+            continue
+        tool_results[tool] = run_tool(tool, inputs)
+        _locate_notebook_cells(tool_results[tool])
+        publish("Project-Level Results", {TOOLS[tool]["result_key"]: tool_results[tool]})
+
+    results = {"Project-Level Results": _order_project_results(tool_results)}
 
     # === File-level metrics ===
-    for file in python_files:
-        file_results = {}
-        for metric in metrics:
-            if metric in [
-                "Code Smells", "Maintainability Index", "Cyclomatic Complexity",
-                "Comment Density"
-            ]:
-                if metric == "Code Smells":
-                    file_results[metric] = run_pylint_code_smell(file)
-
-                elif metric == "Maintainability Index":
-                    file_results[metric] = run_radon_maintainability_index(file)
-
-                elif metric == "Cyclomatic Complexity":
-                    file_results[metric] = run_radon_cyclomatic_complexity(file)
-
-                elif metric == "Comment Density":
-                    file_results[metric] = run_radon_comment_density(file)
-                
-            results[file] = file_results
-
-    return results
\ No newline at end of file
+    for file in inputs.get("files", []):
+        results[file] = _evaluate_file(file, plan, inputs)
+        publish(file, results[file])
+
+    # === Metrics built from the other results (e.g. technical debt) ===
+    if derived_tools:
+        inputs["results"] = results
+        for tool in derived_tools:
+            tool_results[tool] = run_tool(tool, inputs)
+            publish("Project-Level Results", {TOOLS[tool]["result_key"]: tool_results[tool]})
+        results["Project-Level Results"] = _order_project_results(tool_results)
+
+    # === Project summary of per-file metrics (means, percentiles, worst files) ===
+    if plan["file_tools"]:
+        from evaluation.aggregation import SUMMARY_KEY, summarize_results
+        summary = summarize_results(results)
+        if summary:
+            results["Project-Level Results"][SUMMARY_KEY] = summary
+            publish("Project-Level Results", {SUMMARY_KEY: summary})
+
+    if plan["skipped_metrics"]:
+        skipped = _skipped_metrics_result(profile or DEFAULT_PROFILE, plan["skipped_metrics"])
+        results["Project-Level Results"]["Scan Profile"] = skipped
+        publish("Project-Level Results", {"Scan Profile": skipped})
+
+    return results
+
+
+def _skipped_metrics_result(profile, skipped_metrics):
+    """Project-level note listing the metrics a scan profile left out."""
+    message = (
+        f"<div style='margin-left: 20px;'>The <b>{profile}</b> scan profile skipped: {', '.join(skipped_metrics)}.</div>"
+        "<div style='margin-left: 20px; color: gray; font-size: 90%;'>"
+        "<b>Tip:</b> Run the <b>standard</b> or <b>deep</b> profile to measure them too.</div>"
+    )
+    return {"status": "pass", "profile": profile, "skipped": skipped_metrics, "message": message}
+
+
+def _order_project_results(tool_results):
+    """Puts project-level results in registry order, with dividers between the Maintenance scans."""
+    project_results = {}
+    divider_count = 0
+
+    for tool, spec in TOOLS.items():
+        if tool not in tool_results:
+            continue
+        if spec.get("divider") and project_results:
+            divider_count += 1
+            project_results[f"-----divider-{divider_count}-----"] = {"status": "pass", "message": ""}
+        project_results[spec["result_key"]] = tool_results[tool]
+
+    return project_results
+
+
+def evaluate_file_metrics(metrics, path, classify_files=True, profile=None):
+    """
+    Runs only the file-level metrics for one .py file or notebook (used by watch mode).
+
+    Notebooks are converted first. Project-level tools are not run. `profile` is the
+    scan profile, as in `evaluate_metrics`.
+
+    Returns:
+        dict: {"<file path>": {metric: result}} for the analyzed file (the converted .py for a notebook).
+    """
+    from evaluation.scheduler import plan_scan, prepare_inputs
+
+    scan_profile = get_scan_profile(profile)
+    plan = plan_scan(metrics, scan_profile["skip_tools"])
+    if not plan["file_tools"]:
+        return {}
+
+    options = {"classify_files": classify_files, **scan_profile["tool_options"]}
+    inputs = prepare_inputs({"files"} | (plan["inputs"] & {"ast_facts"}), path, options=options)
+    return {file: _evaluate_file(file, plan, inputs) for file in inputs["files"]}
+
+
+def _evaluate_file(file, plan, inputs):
+    """Runs the planned file-level tools on one file and returns {metric: result}."""
+    from evaluation.scheduler import run_tool
+
+    file_tools = plan["file_tools"]
+    file_classes = inputs.get("file_classes", {})
+    if file in file_classes:
+        from evaluation.file_classifier import CHEAP_TOOL_COST
+        # Tools that need the AST are skipped too, so classified files are never parsed in-process
+        ast_tools = {spec["tool"] for spec in METRIC_REGISTRY.values() if "ast_facts" in spec["inputs"]}
+        file_tools = [
+            tool for tool in file_tools
+            if plan["tool_costs"][tool] <= CHEAP_TOOL_COST and tool not in ast_tools
+        ]
+
+    file_tool_results = {tool: run_tool(tool, inputs, file) for tool in file_tools}
+    for result in file_tool_results.values():
+        _locate_notebook_cells(result, file)
+    file_results = {
+        spec["result_key"]: file_tool_results[tool]
+        for tool, spec in TOOLS.items() if tool in file_tool_results
+    }
+
+    if file in file_classes:
+        from evaluation.file_classifier import classification_result
+        skipped = [TOOLS[tool]["result_key"] for tool in plan["file_tools"] if tool not in file_tools]
+        file_results["File Classification"] = classification_result(file_classes[file], skipped)
+
+    return file_results
+
+
+def _locate_notebook_cells(result, default_file=None):
+    """
+    Adds notebook cell locations to the line-based findings of a tool result.
+
+    Findings ("issues", or complexity "blocks" ranked C or worse) in a converted notebook
+    get "cell" and "cell_line" fields from the source map built during conversion, and
+    the result gets a "cell_hotspots" list (most findings first) plus a note in its message.
+    Results for plain .py files are left unchanged.
+    """
+    if not isinstance(result, dict):
+        return
+
+    from evaluation.notebook_converter import locate_in_notebook
+
+    hotspots = {}
+    findings = list(result.get("issues", []))
+    findings += [block for block in result.get("blocks", []) if block.get("rank") not in ("A", "B")]
+
+    for finding in findings:
+        file = finding.get("file") or default_file
+        location = locate_in_notebook(file, finding.get("line")) if file else None
+        if location is None:
+            continue
+        finding["cell"], finding["cell_line"] = location
+        hotspots[(file, location[0])] = hotspots.get((file, location[0]), 0) + 1
+
+    if not hotspots:
+        return
+
+    result["cell_hotspots"] = [
+        {"file": file, "cell": cell, "count": count}
+        for (file, cell), count in sorted(hotspots.items(), key=lambda item: -item[1])
+    ]
+
+    if isinstance(result.get("message"), str):
+        summary = ", ".join(
+            f"Cell {spot['cell']} ({spot['count']})" + ("" if spot["file"] == default_file else f" in <code>{spot['file']}</code>")
+            for spot in result["cell_hotspots"]
+        )
+        result["message"] += (
+            "<div style='margin-left: 20px; color: gray; font-size: 90%;'>"
+            f"<i>Notebook cells with findings: {summary}</i></div>"
+        )
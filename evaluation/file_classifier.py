@@ -0,0 +1,94 @@
+import os
+import math
+from collections import Counter
+
+# Files that are too big, generated or minified get only cheap metrics.
+# Thresholds are deliberately loose: hand-written code should never hit them.
+LARGE_FILE_BYTES = 1024 * 1024       # 1 MB
+MAX_LINE_LENGTH = 1000               # lines longer than this look minified or like pasted data...
+LONG_LINE_SHARE = 0.5                # ...once they hold at least this share of the file
+MAX_AVERAGE_LINE_LENGTH = 200
+HIGH_ENTROPY_BITS = 5.5              # bits per byte; Python source is usually 4-5, base64 blobs ~6
+SAMPLE_BYTES = 64 * 1024
+
+# Markers that code generators put in the first lines of a file
+GENERATED_HEADER_LINES = 5
+GENERATED_MARKERS = (
+    b"@generated", b"do not edit", b"autogenerated", b"auto-generated", b"automatically generated",
+    b"generated by the protocol buffer compiler", b"generated by django", b"generated by cython",
+)
+
+# File-level tools up to this registry cost still run on classified files, unless they need the AST pass
+CHEAP_TOOL_COST = 1
+
+
+def _entropy(data):
+    """Shannon entropy of a byte string, in bits per byte."""
+    if not data:
+        return 0.0
+    total = len(data)
+    return -sum(count / total * math.log2(count / total) for count in Counter(data).values())
+
+
+def classify_file(filepath):
+    """
+    Decides whether a Python file should get the full set of file-level metrics.
+
+    Only the file size and a sample of its first bytes are read, so classifying the
+    whole file index is cheap.
+
+    Returns:
+        dict: {"kind": "normal", "large", "generated", "minified" or "data", "reason": str}
+    """
+    try:
+        size = os.path.getsize(filepath)
+        with open(filepath, "rb") as f:
+            sample = f.read(SAMPLE_BYTES)
+    except OSError:
+        return {"kind": "normal", "reason": ""}
+
+    if size > LARGE_FILE_BYTES:
+        return {"kind": "large", "reason": f"File is {size / (1024 * 1024):.1f} MB (limit {LARGE_FILE_BYTES // (1024 * 1024)} MB)."}
+
+    head = b"\n".join(sample[:4096].splitlines()[:GENERATED_HEADER_LINES]).lower()
+    marker = next((m for m in GENERATED_MARKERS if m in head), None)
+    if marker:
+        return {"kind": "generated", "reason": f"Header contains '{marker.decode()}'."}
+
+    lines = sample.splitlines() or [b""]
+    longest = max(len(line) for line in lines)
+    average = len(sample) / len(lines)
+    long_share = sum(len(line) for line in lines if len(line) > MAX_LINE_LENGTH) / max(len(sample), 1)
+    if long_share >= LONG_LINE_SHARE or average > MAX_AVERAGE_LINE_LENGTH:
+        entropy = _entropy(sample)
+        if entropy > HIGH_ENTROPY_BITS:
+            return {"kind": "data", "reason": f"Long lines with high entropy ({entropy:.1f} bits/byte), likely embedded data."}
+        return {"kind": "minified", "reason": f"Longest line has {longest} characters, average {average:.0f}."}
+
+    return {"kind": "normal", "reason": ""}
+
+
+def classify_files(files):
+    """Classifies a file index and returns {file: classification} for the files that are not "normal"."""
+    classified = {}
+    for filepath in files:
+        classification = classify_file(filepath)
+        if classification["kind"] != "normal":
+            classified[filepath] = classification
+    return classified
+
+
+def classification_result(classification, skipped_metrics):
+    """Builds the "File Classification" result that explains why a file got fewer metrics."""
+    skipped = ", ".join(skipped_metrics) if skipped_metrics else "none"
+    return {
+        "status": "pass",
+        "kind": classification["kind"],
+        "reason": classification["reason"],
+        "skipped": list(skipped_metrics),
+        "message": (
+            f"Treated as a {classification['kind']} file, only cheap metrics were run. {classification['reason']}"
+            "<div style='margin-left: 20px; color: gray; font-size: 90%;'>"
+            f"<i>Skipped: {skipped}. Use the full scan option (CLI: <code>--all-files</code>) to analyze it anyway.</i></div>"
+        )
+    }
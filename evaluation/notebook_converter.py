@@ -1,7 +1,11 @@
 import os
-import nbformat
-from nbconvert import PythonExporter
-from IPython.display import display, HTML
+import sys
+
+# nbformat, nbconvert and IPython are only imported once a notebook actually needs converting
+# Outside IPython, progress and warnings go to stderr, so the CLI's stdout only carries results
+
+# Source maps of converted notebooks: {absolute .py path: [(cell number, line in cell) or None per .py line]}
+_source_maps = {}
 
 def convert_notebooks_in_dir(root_dir):
     """
@@ -12,10 +16,13 @@ def convert_notebooks_in_dir(root_dir):
 
     Args:
         root_dir (str): Path to the directory to recursively scan.
+
+    Returns:
+        str: Path of the converted .py file when `root_dir` is a single notebook, otherwise None.
     """
     if os.path.isfile(root_dir) and root_dir.endswith(".ipynb"):
         # Single file case
-        _convert_notebook_file(root_dir)
+        return _convert_notebook_file(root_dir)
     elif os.path.isdir(root_dir):
         # Directory case
         for dirpath, _, filenames in os.walk(root_dir):
@@ -28,12 +35,15 @@ def convert_notebooks_in_dir(root_dir):
                     notebook_path = os.path.join(dirpath, file)
                     _convert_notebook_file(notebook_path)
     else:
-        print(f"[WARNING] Path not found or not valid: {root_dir}")
+        print(f"[WARNING] Path not found or not valid: {root_dir}", file=sys.stderr)
 
 def _convert_notebook_file(notebook_path):
-    """Helper to convert a single .ipynb notebook to a .py file"""
+    """Helper to convert a single .ipynb notebook to a .py file. Returns the .py path, or None on failure."""
     py_path = os.path.splitext(notebook_path)[0] + ".py"
     try:
+        import nbformat
+        from nbconvert import PythonExporter
+
         # Load notebook
         with open(notebook_path, "r", encoding="utf-8") as f:
             nb = nbformat.read(f, as_version=4)
@@ -51,10 +61,27 @@ def _convert_notebook_file(notebook_path):
         # Remove cell markers like "# In[2]:"
         remove_cell_markers(py_path)
 
+        # Remember where each line of the .py file came from, for all tools of this scan
+        _source_maps[os.path.abspath(py_path)] = build_source_map(nb, source_code)
+
+        return py_path
+
     except Exception as e:
-        print(f"[ERROR] Failed to convert {notebook_path}: {e}")
+        print(f"[ERROR] Failed to convert {notebook_path}: {e}", file=sys.stderr)
+        return None
+
+def _in_ipython():
+    """True inside a running IPython kernel or shell (checked without importing IPython)."""
+    ipython = sys.modules.get("IPython")
+    return ipython is not None and ipython.get_ipython() is not None
 
 def styled_log(notebook_path, py_path):
+    if not _in_ipython():
+        print(f"Converting notebook {notebook_path} to {py_path}", file=sys.stderr)
+        return
+
+    from IPython.display import display, HTML
+
     display(HTML(f"""
         <div style="margin: 10px 0; padding: 10px; background-color: #f8f9fa; font-size: 11px;">
             <div><strong>Detected Jupyter notebook:</strong> <code>{notebook_path}</code></div>
@@ -68,4 +95,63 @@ def remove_cell_markers(py_file_path):
     with open(py_file_path, "w", encoding="utf-8") as f:
         for line in lines:
             if not line.strip().startswith("# In["):
-                f.write(line)
\ No newline at end of file
+                f.write(line)
+
+def build_source_map(nb, source_code):
+    """
+    Maps each line of a converted notebook (after `remove_cell_markers`) back to its cell.
+
+    nbconvert writes one "# In[ ]:" marker per code cell, so the lines after the n-th marker
+    belong to the n-th code cell. Within a cell, lines are matched against the cell source
+    in order; lines nbconvert added (blank separators, markdown comments) map to None.
+    IPython magics are rewritten to `get_ipython()` calls and map to the next unmatched cell line.
+
+    Returns:
+        list: one entry per .py line, either (cell number, line in cell), both 1-based, or None.
+    """
+    code_cells = [
+        (number, cell.source.splitlines())
+        for number, cell in enumerate(nb.cells, start=1) if cell.cell_type == "code"
+    ]
+
+    source_map = []
+    cell_index = -1
+    next_line = 0
+
+    for line in source_code.splitlines():
+        if line.strip().startswith("# In["):
+            cell_index += 1
+            next_line = 0
+            continue  # Marker lines are removed from the .py file
+
+        if cell_index < 0 or cell_index >= len(code_cells):
+            source_map.append(None)
+            continue
+
+        number, cell_lines = code_cells[cell_index]
+        stripped = line.rstrip()
+        position = next(
+            (i for i in range(next_line, len(cell_lines)) if cell_lines[i].rstrip() == stripped and stripped),
+            None
+        )
+        if position is None and stripped.lstrip().startswith("get_ipython()") and next_line < len(cell_lines):
+            position = next_line
+
+        if position is None:
+            source_map.append(None)
+        else:
+            source_map.append((number, position + 1))
+            next_line = position + 1
+
+    return source_map
+
+def get_source_map(py_path):
+    """Returns the source map of a notebook converted during this session, or None for plain .py files."""
+    return _source_maps.get(os.path.abspath(py_path))
+
+def locate_in_notebook(py_path, line):
+    """Returns (cell number, line in cell) for a line of a converted notebook, or None if unknown."""
+    source_map = get_source_map(py_path)
+    if not source_map or not isinstance(line, int) or not 1 <= line <= len(source_map):
+        return None
+    return source_map[line - 1]
@@ -0,0 +1,221 @@
+import csv
+import html
+import json
+import os
+import re
+from pathlib import Path
+
+# Machine-readable output of scan results for the command-line scanner.
+#
+#   json   - the raw results dict, as returned by `evaluate_metrics` (messages keep their HTML)
+#   ndjson - one JSON object per metric result, written as soon as the result is ready
+#   sarif  - SARIF 2.1.0: one result per finding (pylint/bandit issues, complex blocks)
+#            and per failed metric without findings, for code scanning tools; file URIs
+#            are relative to the scanned folder (uriBaseId SRCROOT)
+#   csv    - one row per metric result: file, metric, status, value, message
+#
+# All formats except json get plain-text messages. Writers get every result through
+# `write(section, metric, result)` while the scan runs and `finish(results)` at the end.
+# The ndjson and csv writers can take more results after `finish` (watch-mode updates).
+
+FORMATS = ("json", "ndjson", "sarif", "csv")
+
+PROJECT_SECTION = "Project-Level Results"
+
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+SARIF_ROOT_ID = "SRCROOT"
+TOOL_NAME = "jupyter-quality-extension"
+
+CSV_COLUMNS = ["file", "metric", "status", "value", "message"]
+
+# SARIF levels of pylint message categories and bandit severities
+FINDING_LEVELS = {
+    "fatal": "error", "error": "error", "warning": "warning", "refactor": "note", "convention": "note",
+    "HIGH": "error", "MEDIUM": "warning", "LOW": "note",
+}
+
+# Block elements start and end a displayed line
+_LINE_BREAK_TAGS = re.compile(r"<br\s*/?>|</?(?:div|li|p|ul|ol)\b[^>]*>", re.IGNORECASE)
+_TAGS = re.compile(r"<[^>]+>")
+
+
+def plain_text(message):
+    """Turns a styled HTML message into plain text, one line per displayed line."""
+    if not isinstance(message, str):
+        return "" if message is None else str(message)
+    text = html.unescape(_TAGS.sub("", _LINE_BREAK_TAGS.sub("\n", message)))
+    return "\n".join(line.strip() for line in text.splitlines() if line.strip())
+
+
+def _is_divider(metric):
+    return metric.startswith("-----divider")
+
+
+def _file_of(section):
+    return None if section == PROJECT_SECTION else section
+
+
+class JsonWriter:
+    """The raw results dict; written at the end, since its nesting only settles then."""
+
+    def __init__(self, stream, root=None):
+        self.stream = stream
+
+    def write(self, section, metric, result):
+        pass
+
+    def finish(self, results):
+        # json.dump encodes and writes piece by piece, without building the whole text first
+        json.dump(results, self.stream, indent=2, ensure_ascii=False)
+        self.stream.write("\n")
+
+
+class NdjsonWriter:
+    """One line per metric result: {"file", "metric", "status", "value", ..., "message"}."""
+
+    def __init__(self, stream, root=None):
+        self.stream = stream
+
+    def write(self, section, metric, result):
+        if _is_divider(metric) or not isinstance(result, dict):
+            return
+        from evaluation.scan_history import numeric_value
+
+        record = {"file": _file_of(section), "metric": metric, "status": result.get("status"),
+                  "value": numeric_value(result)}
+        record.update((key, value) for key, value in result.items() if key not in ("status", "message"))
+        record["message"] = plain_text(result.get("message"))
+        self.stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.stream.flush()
+
+    def finish(self, results):
+        pass
+
+
+class CsvWriter:
+    """One row per metric result, with the message on a single line."""
+
+    def __init__(self, stream, root=None):
+        self.stream = stream
+        self.writer = csv.writer(stream)
+        self.writer.writerow(CSV_COLUMNS)
+
+    def write(self, section, metric, result):
+        if _is_divider(metric) or not isinstance(result, dict):
+            return
+        from evaluation.scan_history import numeric_value
+
+        value = numeric_value(result)
+        self.writer.writerow([
+            _file_of(section) or "", metric, result.get("status", ""),
+            "" if value is None else value, " ".join(plain_text(result.get("message")).splitlines())
+        ])
+        self.stream.flush()
+
+    def finish(self, results):
+        pass
+
+
+class SarifWriter:
+    """
+    SARIF 2.1.0 log with one run. Results are written as they arrive; the rules they
+    refer to are collected on the way and written after them.
+    """
+
+    def __init__(self, stream, root=None):
+        self.stream = stream
+        self.root = os.path.abspath(root or ".")
+        self.rules = {}
+        self.count = 0
+        self.stream.write(
+            f'{{"$schema": {json.dumps(SARIF_SCHEMA)}, "version": "2.1.0", "runs": [{{"results": [\n'
+        )
+
+    def _artifact_location(self, file):
+        """Location relative to the scan root, or an absolute file:// URI for files outside it."""
+        path = os.path.abspath(file)
+        relative = os.path.relpath(path, self.root)
+        if relative == os.pardir or relative.startswith(os.pardir + os.sep):
+            return {"uri": Path(path).as_uri()}
+        return {"uri": Path(relative).as_posix(), "uriBaseId": SARIF_ROOT_ID}
+
+    def _emit(self, rule_id, rule_name, level, text, file, line=None, column=None, properties=None):
+        self.rules.setdefault(rule_id, rule_name)
+        entry = {"ruleId": rule_id, "level": level, "message": {"text": text or rule_id}}
+        if file:
+            location = {"artifactLocation": self._artifact_location(file)}
+            if isinstance(line, int) and line > 0:
+                location["region"] = {"startLine": line}
+                if isinstance(column, int) and column >= 0:
+                    location["region"]["startColumn"] = column + 1
+            entry["locations"] = [{"physicalLocation": location}]
+        if properties:
+            entry["properties"] = properties
+        self.stream.write((",\n" if self.count else "") + json.dumps(entry, ensure_ascii=False))
+        self.count += 1
+
+    def write(self, section, metric, result):
+        if _is_divider(metric) or not isinstance(result, dict):
+            return
+
+        file = _file_of(section)
+        findings = 0
+        for issue in result.get("issues", []):
+            rule = issue.get("symbol") or issue.get("rule") or issue.get("code") or metric
+            cell = {"cell": issue["cell"], "cell_line": issue["cell_line"]} if "cell" in issue else None
+            self._emit(rule, metric, FINDING_LEVELS.get(issue.get("category") or issue.get("severity"), "warning"),
+                       issue.get("text"), issue.get("file") or file, issue.get("line"), issue.get("column"), cell)
+            findings += 1
+
+        for block in result.get("blocks", []):
+            if block.get("rank") in ("A", "B"):
+                continue
+            self._emit("cyclomatic-complexity", metric, "warning" if block.get("rank") in ("C", "D") else "error",
+                       f"{block.get('name')} has cyclomatic complexity {block.get('complexity')} (rank {block.get('rank')})",
+                       block.get("file") or file, block.get("line"))
+            findings += 1
+
+        # A failed metric without individual findings becomes one result for the whole file or project
+        if not findings and result.get("status") not in ("pass", None):
+            text = plain_text(result.get("message")).splitlines()
+            self._emit(metric, metric, "warning" if result.get("status") == "fail" else "note",
+                       text[0] if text else f"{metric}: {result.get('status')}", file,
+                       properties={"status": result.get("status")})
+
+    def finish(self, results):
+        rules = [{"id": rule_id, "name": name} for rule_id, name in self.rules.items()]
+        tool = {"driver": {"name": TOOL_NAME, "rules": rules}}
+        base_ids = {SARIF_ROOT_ID: {"uri": Path(self.root).as_uri().rstrip("/") + "/"}}
+        self.stream.write(
+            f'\n], "tool": {json.dumps(tool, ensure_ascii=False)}, '
+            f'"originalUriBaseIds": {json.dumps(base_ids, ensure_ascii=False)}}}]}}\n'
+        )
+
+
+WRITERS = {"json": JsonWriter, "ndjson": NdjsonWriter, "sarif": SarifWriter, "csv": CsvWriter}
+
+
+def open_writer(output_format, stream, root=None):
+    """
+    Returns the writer for `output_format` (one of FORMATS) writing to `stream`.
+    `root` is the scanned file or folder; SARIF locations are relative to it.
+    """
+    if output_format not in WRITERS:
+        raise ValueError(f"Unknown output format '{output_format}'. Choose one of: {', '.join(FORMATS)}.")
+    if root and os.path.isfile(root):
+        root = os.path.dirname(os.path.abspath(root))
+    return WRITERS[output_format](stream, root)
+
+
+def write_sections(writer, results):
+    """Passes every result of a results dict to `writer`, without finishing it."""
+    for section, section_results in results.items():
+        for metric, result in section_results.items():
+            writer.write(section, metric, result)
+
+
+def write_results(results, output_format, stream, root=None):
+    """Writes a complete results dict (e.g. from the scan service or watch mode) in one go."""
+    writer = open_writer(output_format, stream, root)
+    write_sections(writer, results)
+    writer.finish(results)
@@ -0,0 +1,214 @@
+import os
+import time
+import sqlite3
+from tools.result_cache import CACHE_DIR
+
+# Every CLI scan is appended to a local SQLite database, so results can be compared over time.
+# One database is shared by all projects; scans record the path they were run on.
+DEFAULT_DB_PATH = os.environ.get("QUALITY_HISTORY_DB", os.path.join(CACHE_DIR, "scan_history.sqlite"))
+
+# Project-level results are stored under this file name
+PROJECT_FILE = ""
+
+# Numeric field of a result, in order of preference
+VALUE_FIELDS = ("score", "density", "percentage", "loc")
+
+# Metrics where a lower value is better; for all others higher is better
+LOWER_IS_BETTER = {"Cyclomatic Complexity", "Cognitive Complexity", "Code Duplication"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scans (
+    id INTEGER PRIMARY KEY,
+    created_at REAL NOT NULL,
+    path TEXT NOT NULL,
+    stage TEXT
+);
+CREATE INDEX IF NOT EXISTS scans_by_path ON scans (path, id);
+
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS metric_values (
+    scan_id INTEGER NOT NULL REFERENCES scans (id) ON DELETE CASCADE,
+    file_id INTEGER NOT NULL REFERENCES files (id),
+    metric TEXT NOT NULL,
+    status TEXT,
+    value REAL,
+    PRIMARY KEY (scan_id, file_id, metric)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS metric_values_by_metric ON metric_values (metric, file_id, scan_id);
+
+-- Per-scan average of each metric, written once per scan so trends do not aggregate all files
+CREATE TABLE IF NOT EXISTS metric_summaries (
+    metric TEXT NOT NULL,
+    scan_id INTEGER NOT NULL REFERENCES scans (id) ON DELETE CASCADE,
+    mean_value REAL,
+    file_count INTEGER NOT NULL,
+    PRIMARY KEY (metric, scan_id)
+) WITHOUT ROWID;
+"""
+
+
+def connect(db_path=None):
+    """Opens (and if needed creates) the history database."""
+    db_path = db_path or DEFAULT_DB_PATH
+    os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+    connection = sqlite3.connect(db_path)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA foreign_keys=ON")
+    connection.executescript(SCHEMA)
+    return connection
+
+
+def numeric_value(result):
+    """The main numeric value of a metric result (score, density, percentage or LoC), or None."""
+    for field in VALUE_FIELDS:
+        value = result.get(field)
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return float(value)
+    return None
+
+
+def record_scan(results, path, stage=None, db_path=None):
+    """
+    Appends one scan to the history.
+
+    Args:
+        results (dict): output of `evaluate_metrics`.
+        path (str): scanned path (stored as an absolute path).
+        stage (str): lifecycle stage, if the scan was run for one.
+
+    Returns:
+        int: id of the new scan.
+    """
+    with connect(db_path) as connection:
+        scan_id = connection.execute(
+            "INSERT INTO scans (created_at, path, stage) VALUES (?, ?, ?)",
+            (time.time(), os.path.abspath(path), stage)
+        ).lastrowid
+
+        rows = []
+        for section, metrics in results.items():
+            if not isinstance(metrics, dict):
+                continue
+            file = PROJECT_FILE if section == "Project-Level Results" else section
+
+            connection.execute("INSERT OR IGNORE INTO files (path) VALUES (?)", (file,))
+            file_id = connection.execute("SELECT id FROM files WHERE path = ?", (file,)).fetchone()[0]
+
+            for metric, result in metrics.items():
+                if metric.startswith("-----divider") or not isinstance(result, dict):
+                    continue
+                rows.append((scan_id, file_id, metric, result.get("status"), numeric_value(result)))
+
+        connection.executemany(
+            "INSERT OR REPLACE INTO metric_values (scan_id, file_id, metric, status, value) VALUES (?, ?, ?, ?, ?)",
+            rows
+        )
+        connection.execute(
+            """
+            INSERT INTO metric_summaries (metric, scan_id, mean_value, file_count)
+            SELECT metric, scan_id, AVG(value), COUNT(value) FROM metric_values
+            WHERE scan_id = ? AND value IS NOT NULL GROUP BY metric
+            """,
+            (scan_id,)
+        )
+    connection.close()
+    return scan_id
+
+
+def list_scans(path=None, limit=20, db_path=None):
+    """Returns the latest scans (newest first) as (id, created_at, path, stage) tuples, optionally for one path."""
+    connection = connect(db_path)
+    try:
+        if path:
+            query = "SELECT id, created_at, path, stage FROM scans WHERE path = ? ORDER BY id DESC LIMIT ?"
+            return connection.execute(query, (os.path.abspath(path), limit)).fetchall()
+        return connection.execute("SELECT id, created_at, path, stage FROM scans ORDER BY id DESC LIMIT ?", (limit,)).fetchall()
+    finally:
+        connection.close()
+
+
+def diff_scans(old_scan_id, new_scan_id, db_path=None, regressions_only=True):
+    """
+    Compares two scans file by file.
+
+    A metric regressed if its status went from pass to fail, or its value got worse.
+
+    Returns:
+        list: dicts {"file", "metric", "old_status", "new_status", "old_value", "new_value", "regression"},
+        regressions only unless `regressions_only` is False.
+    """
+    connection = connect(db_path)
+    try:
+        rows = connection.execute(
+            """
+            SELECT f.path, new.metric, old.status, new.status, old.value, new.value
+            FROM metric_values AS new
+            JOIN metric_values AS old
+              ON old.scan_id = ? AND old.file_id = new.file_id AND old.metric = new.metric
+            JOIN files AS f ON f.id = new.file_id
+            WHERE new.scan_id = ?
+            ORDER BY f.path, new.metric
+            """,
+            (old_scan_id, new_scan_id)
+        ).fetchall()
+    finally:
+        connection.close()
+
+    changes = []
+    for file, metric, old_status, new_status, old_value, new_value in rows:
+        worse_value = False
+        if old_value is not None and new_value is not None and old_value != new_value:
+            worse_value = new_value > old_value if metric in LOWER_IS_BETTER else new_value < old_value
+        regression = (old_status == "pass" and new_status != "pass") or worse_value
+
+        if regression or (not regressions_only and (old_status != new_status or old_value != new_value)):
+            changes.append({
+                "file": file or "(project)",
+                "metric": metric,
+                "old_status": old_status,
+                "new_status": new_status,
+                "old_value": old_value,
+                "new_value": new_value,
+                "regression": regression,
+            })
+    return changes
+
+
+def metric_trend(metric, path=None, file=None, limit=100, db_path=None):
+    """
+    Returns the history of one metric, oldest scan first, as (scan id, created_at, value) tuples.
+
+    With `file`, the value of that file; otherwise the average over all files of each scan
+    (or the project-level value for project metrics).
+    """
+    connection = connect(db_path)
+    try:
+        if file is not None:
+            # One indexed row per scan for this file
+            table, value, conditions = "metric_values", "v.value", ["v.metric = ?", "v.value IS NOT NULL",
+                                                                  "v.file_id = (SELECT id FROM files WHERE path = ?)"]
+            params = [metric, file]
+        else:
+            # Averages were stored when the scan was recorded
+            table, value, conditions = "metric_summaries", "v.mean_value", ["v.metric = ?"]
+            params = [metric]
+        if path:
+            conditions.append("s.path = ?")
+            params.append(os.path.abspath(path))
+
+        query = f"""
+            SELECT s.id, s.created_at, {value}
+            FROM {table} AS v
+            JOIN scans AS s ON s.id = v.scan_id
+            WHERE {" AND ".join(conditions)}
+            ORDER BY v.scan_id DESC
+            LIMIT ?
+        """
+        rows = connection.execute(query, (*params, limit)).fetchall()
+    finally:
+        connection.close()
+    return rows[::-1]
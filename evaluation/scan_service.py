@@ -0,0 +1,253 @@
+"""
+Long-running local scan service.
+
+Every CLI run or extension click normally starts from a cold interpreter and pays for
+importing nbconvert, pylint/astroid, radon and bandit again. The scan service keeps
+these loaded in one process on localhost and accepts scan jobs over HTTP, so repeated
+scans of the same project skip the start-up cost. Pylint runs in-process inside the
+service, which keeps astroid's inference cache for the standard library and installed
+packages warm between jobs.
+
+Start it with `python run_scan_service.py`, then point the CLI (`--server`) or the
+extension (`QUALITY_SCAN_SERVER` environment variable) at it.
+
+A scan runs the project's tests and re-executes its notebooks, so the service only accepts
+jobs that prove they come from the same user: each start writes a random token to a file
+only that user can read (mode 0600), and every POST must send it in the X-Scan-Token header
+with a JSON body. Requests from browsers (an Origin header) and for other host names
+(DNS rebinding) are rejected.
+"""
+
+import hmac
+import json
+import os
+import secrets
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib import request, error
+from urllib.parse import urlsplit
+from tools.result_cache import CACHE_DIR
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Environment variable read by the CLI and the extension to find a running service
+SERVER_ENV_VAR = "QUALITY_SCAN_SERVER"
+
+# Header carrying the per-session token, and the host names a local client uses
+TOKEN_HEADER = "X-Scan-Token"
+LOCAL_HOSTNAMES = {"127.0.0.1", "localhost", "::1"}
+
+# Tools write their reports to fixed folders (e.g. ./jscpd-report), so jobs run one at a time
+_scan_lock = threading.Lock()
+_completed_scans = 0
+
+
+def token_path(port):
+    """File holding the token of the service on `port` (readable by the current user only)."""
+    return os.path.join(CACHE_DIR, f"scan-service-{port}.token")
+
+
+def _write_token(port):
+    """Creates a fresh token for this service session and stores it with mode 0600."""
+    token = secrets.token_urlsafe(32)
+    path = token_path(port)
+    os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        os.fchmod(fd, 0o600)  # the mode of an existing file is kept by os.open
+        os.write(fd, token.encode("ascii"))
+    finally:
+        os.close(fd)
+    return token
+
+
+def _read_token(port):
+    """Returns the stored token of the service on `port`, or None if there is none."""
+    try:
+        with open(token_path(port), "r", encoding="ascii") as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+def warm_up():
+    """
+    Imports the evaluator, notebook converter and analysis libraries once,
+    and switches pylint to in-process mode so its caches survive between jobs.
+    Missing optional libraries are skipped; the matching tools will report their own errors.
+    """
+    import evaluation.evaluator  # noqa: F401
+    import evaluation.notebook_converter  # noqa: F401
+    from tools import pylint_runner
+
+    for module_name in ("nbformat", "nbconvert", "radon.cli", "bandit.core.manager"):
+        try:
+            __import__(module_name)
+        except ImportError:
+            continue
+
+    try:
+        import pylint.lint  # noqa: F401
+    except ImportError:
+        return
+    pylint_runner.enable_in_process_pylint()
+
+
+def run_scan_job(job):
+    """
+    Runs one scan job and returns the raw results dictionary.
+
+    Args:
+        job (dict): {"stage" or "metrics", "path", optional "github_url", "full_rescan", "update_baseline",
+            "all_files" and "profile"}.
+            The path must be absolute, since the service does not share the client's working directory.
+    """
+    from evaluation.evaluator import evaluate_metrics
+    from lifecycle.stage_manager import get_metrics_for_stage
+
+    global _completed_scans
+
+    path = job.get("path")
+    if not path or not os.path.isabs(path):
+        raise ValueError("Scan jobs need an absolute 'path'.")
+
+    metrics = job.get("metrics") or get_metrics_for_stage(job.get("stage", ""))
+
+    with _scan_lock:
+        results = evaluate_metrics(metrics, path, job.get("github_url"), full_rescan=bool(job.get("full_rescan")),
+                                   update_baseline=bool(job.get("update_baseline")),
+                                   classify_files=not job.get("all_files"), profile=job.get("profile"))
+        _completed_scans += 1
+
+    return results
+
+
+class ScanRequestHandler(BaseHTTPRequestHandler):
+    """
+    HTTP endpoints: GET /health and POST /scan (JSON in, JSON out).
+
+    `token` and `allowed_hosts` are set on the handler class by `serve`.
+    """
+
+    token = None
+    allowed_hosts = LOCAL_HOSTNAMES
+
+    def _rejection(self, require_token):
+        """Returns (status code, reason) if the request must be refused, otherwise None."""
+        host = urlsplit(f"//{self.headers.get('Host', '')}").hostname
+        if host not in self.allowed_hosts:
+            return 403, "Unexpected Host header."
+        if self.headers.get("Origin") is not None:
+            return 403, "Requests from web pages are not accepted."
+        if not require_token:
+            return None
+        if self.headers.get("Content-Type", "").split(";")[0].strip().lower() != "application/json":
+            return 415, "Content-Type must be application/json."
+        if not self.token or not hmac.compare_digest(self.headers.get(TOKEN_HEADER, ""), self.token):
+            return 401, f"Missing or wrong {TOKEN_HEADER} header."
+        return None
+
+    def do_GET(self):
+        rejection = self._rejection(require_token=False)
+        if rejection:
+            self._send_json(rejection[0], {"error": rejection[1]})
+            return
+        if self.path != "/health":
+            self._send_json(404, {"error": f"Unknown endpoint: {self.path}"})
+            return
+        self._send_json(200, {"status": "ok", "completed_scans": _completed_scans})
+
+    def do_POST(self):
+        rejection = self._rejection(require_token=True)
+        if rejection:
+            self._send_json(rejection[0], {"error": rejection[1]})
+            return
+        if self.path != "/scan":
+            self._send_json(404, {"error": f"Unknown endpoint: {self.path}"})
+            return
+
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            job = json.loads(self.rfile.read(length) or b"{}")
+            results = run_scan_job(job)
+        except (ValueError, json.JSONDecodeError) as e:
+            self._send_json(400, {"error": str(e)})
+            return
+        except Exception as e:
+            self._send_json(500, {"error": f"Scan failed: {e}"})
+            return
+
+        self._send_json(200, {"results": results})
+
+    def log_message(self, format, *args):
+        # Keep the service console quiet apart from the tools' own output
+        pass
+
+    def _send_json(self, code, payload):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def serve(host=DEFAULT_HOST, port=DEFAULT_PORT):
+    """Warms up the tools and serves scan jobs until interrupted."""
+    warm_up()
+    ScanRequestHandler.token = _write_token(port)
+    ScanRequestHandler.allowed_hosts = LOCAL_HOSTNAMES | {host}
+    server = ThreadingHTTPServer((host, port), ScanRequestHandler)
+    print(f"Quality scan service listening on http://{host}:{port} (token in {token_path(port)})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def submit_scan(server_url, path, metrics=None, stage=None, github_url=None, full_rescan=False,
+                update_baseline=False, all_files=False, profile=None, timeout=3600):
+    """
+    Sends a scan job to a running scan service and returns its results.
+    The service's token is read from its token file (see `token_path`).
+
+    Raises:
+        urllib.error.URLError: if the service cannot be reached or its token file is missing.
+        RuntimeError: if the service rejected or failed the job.
+    """
+    port = urlsplit(server_url).port or DEFAULT_PORT
+    token = _read_token(port)
+    if token is None:
+        raise error.URLError(f"no token file at {token_path(port)}")
+
+    job = {
+        "path": os.path.abspath(path),
+        "metrics": metrics,
+        "stage": stage,
+        "github_url": github_url,
+        "full_rescan": full_rescan,
+        "update_baseline": update_baseline,
+        "all_files": all_files,
+        "profile": profile,
+    }
+    req = request.Request(
+        server_url.rstrip("/") + "/scan",
+        data=json.dumps(job).encode("utf-8"),
+        headers={"Content-Type": "application/json", TOKEN_HEADER: token},
+        method="POST",
+    )
+
+    try:
+        with request.urlopen(req, timeout=timeout) as response:
+            payload = json.loads(response.read())
+    except error.HTTPError as e:
+        try:
+            message = json.loads(e.read()).get("error", e.reason)
+        except (json.JSONDecodeError, AttributeError):
+            message = e.reason
+        raise RuntimeError(f"Scan service error: {message}") from e
+
+    return payload["results"]
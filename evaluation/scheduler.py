@@ -0,0 +1,222 @@
+import os
+import subprocess
+from importlib import import_module
+from lifecycle.metric_registry import TOOLS, get_registered_metrics
+
+# Folders that never contain user code worth scanning
+EXCLUDED_DIRS = {
+    "venv", "env", "__pycache__", ".git", ".hg", ".svn",
+    ".ipynb_checkpoints", ".mypy_cache", ".pytest_cache",
+    "build", "dist", ".tox", ".nox", "site-packages",
+    ".idea", ".vscode", ".DS_Store", "__pypackages__",
+    "jscpd-report", "bandit-report", "gitleaks-report", "pytest-report"
+}
+
+IRRELEVANT_FILENAMES = {
+    "__init__.py", "setup.py", "install.py", "version.py", "manage.py"
+}
+
+IRRELEVANT_SUBPATHS = [
+    "/migrations/", "/__pycache__/"
+]
+
+
+def plan_scan(metrics, skip_tools=()):
+    """
+    Works out which tools the requested metrics need and in which order to run them.
+
+    Each tool runs at most once per scan, even if several metrics share it.
+    Tools are ordered most expensive first, so slow scans surface early and
+    cheap tools fill in behind them. Tools in `skip_tools` (from the scan profile)
+    are left out, and the metrics they would have measured are listed as skipped.
+
+    Returns:
+        dict: {
+            "project_tools": [tool names],
+            "file_tools": [tool names],
+            "tool_costs": {tool name: cost},
+            "inputs": set of input names that must be prepared,
+            "skipped_metrics": [metric names]
+        }
+    """
+    tool_costs = {}
+    tool_scopes = {}
+    inputs = set()
+    skipped_metrics = []
+
+    for metric, spec in get_registered_metrics(metrics).items():
+        tool = spec["tool"]
+        if tool in skip_tools:
+            skipped_metrics.append(metric)
+            continue
+        tool_costs[tool] = max(tool_costs.get(tool, 0), spec["cost"])
+        tool_scopes[tool] = spec["scope"]
+        inputs.update(spec["inputs"])
+
+    # Sort by cost, keeping registry order for ties
+    ordered = sorted(tool_costs, key=lambda tool: (-tool_costs[tool], list(TOOLS).index(tool)))
+
+    return {
+        "project_tools": [tool for tool in ordered if tool_scopes[tool] == "project"],
+        "file_tools": [tool for tool in ordered if tool_scopes[tool] == "file"],
+        "tool_costs": tool_costs,
+        "inputs": inputs,
+        "skipped_metrics": skipped_metrics
+    }
+
+
+def prepare_inputs(required, path, github_url=None, options=None):
+    """
+    Computes the shared scan inputs once, before any tool runs.
+
+    Args:
+        required (set): input names from `plan_scan`.
+        path (str): Python file, notebook or project directory.
+        github_url (str): optional repository URL for remote checks.
+        options (dict): scan options passed through to tools (e.g. {"full_rescan": True},
+            or the "tool_options" of the scan profile).
+            With "classify_files" set, large, generated and minified files are listed
+            under "file_classes" so they only get cheap metrics, and under "excluded_files"
+            for the project-level tools that take it (bandit, jscpd, loc); they are also
+            left out of "ast_facts".
+
+    Returns:
+        dict: input name -> value, always including "path", "github_url" and the options.
+
+    Raises:
+        ValueError: if the path is not a Python file, notebook or directory.
+    """
+    if not (os.path.isdir(path) or path.endswith(".ipynb") or path.endswith(".py")):
+        raise ValueError("Invalid target path. Must be a Python file, notebook, or directory.")
+
+    inputs = {"path": path, "github_url": github_url}
+    inputs.update(options or {})
+
+    # Excluded files come from classifying the file list
+    if "excluded_files" in required:
+        required = required | {"files"}
+
+    # Converting notebooks is a prerequisite for listing files and parsing them
+    if "files" in required or "ast_facts" in required:
+        required = required | {"notebooks"}
+
+    if "notebooks" in required:
+        from evaluation.notebook_converter import convert_notebooks_in_dir
+        inputs["notebooks"] = convert_notebooks_in_dir(path) if not path.endswith(".py") else None
+
+    if "files" in required:
+        inputs["files"] = collect_python_files(path, inputs.get("notebooks"))
+        if inputs.get("classify_files"):
+            from evaluation.file_classifier import classify_files
+            inputs["file_classes"] = classify_files(inputs["files"])
+
+    if "excluded_files" in required:
+        inputs["excluded_files"] = sorted(inputs.get("file_classes", {}))
+
+    if "ast_facts" in required:
+        from evaluation.ast_pass import collect_ast_facts
+        modules = collect_python_modules(path, inputs.get("notebooks"))
+        if inputs.get("classify_files"):
+            # Large, generated and minified modules are not parsed in-process either;
+            # modules outside the file list (tests, __init__.py, ...) are classified here
+            from evaluation.file_classifier import classify_files
+            listed = set(inputs.get("files") or ())
+            classified = set(inputs.get("file_classes", {}))
+            classified.update(classify_files([module for module in modules if module not in listed]))
+            modules = [module for module in modules if module not in classified]
+        inputs["ast_facts"] = collect_ast_facts(modules)
+
+    if "git" in required:
+        inputs["git"] = get_git_head(path)
+
+    return inputs
+
+
+def is_analyzed_python_file(path):
+    """
+    True for .py files that get file-level metrics: not boilerplate (setup.py, __init__.py, ...),
+    not in migrations or caches, and not a test file.
+    """
+    file = os.path.basename(path)
+    if not file.endswith(".py") or file in IRRELEVANT_FILENAMES:
+        return False
+    if any(sub in path for sub in IRRELEVANT_SUBPATHS):
+        return False
+    # Skip test files too
+    return not (file.startswith("test_") or file.endswith("_test.py"))
+
+
+def collect_python_files(path, converted_notebook=None):
+    """
+    Lists the Python files to analyze with file-level metrics, as absolute paths
+    (results are keyed by them, and watch mode reports absolute paths too).
+
+    For a directory, walks the tree and skips tool/environment folders and
+    the files `is_analyzed_python_file` rejects.
+    For a single notebook, returns its converted .py file.
+    """
+    if path.endswith(".py"):
+        return [os.path.abspath(path)]
+
+    if path.endswith(".ipynb"):
+        return [os.path.abspath(converted_notebook)] if converted_notebook else []
+
+    python_files = []
+    for root, dirs, files in os.walk(path):
+        dirs[:] = [d for d in dirs if d not in EXCLUDED_DIRS]
+
+        for file in files:
+            full_path = os.path.abspath(os.path.join(root, file))
+            if is_analyzed_python_file(full_path):
+                python_files.append(full_path)
+
+    return python_files
+
+
+def collect_python_modules(path, converted_notebook=None):
+    """
+    Lists all Python files of a project for the module graph.
+
+    Unlike `collect_python_files`, this keeps __init__.py and other boilerplate
+    (they define packages and imports), but still leaves out tests. Paths are absolute,
+    like those of `collect_python_files`.
+    """
+    if path.endswith(".py"):
+        return [os.path.abspath(path)]
+
+    if path.endswith(".ipynb"):
+        return [os.path.abspath(converted_notebook)] if converted_notebook else []
+
+    modules = []
+    for root, dirs, files in os.walk(path):
+        dirs[:] = [d for d in dirs if d not in EXCLUDED_DIRS]
+
+        for file in files:
+            if file.endswith(".py") and not (file.startswith("test_") or file.endswith("_test.py")):
+                modules.append(os.path.abspath(os.path.join(root, file)))
+
+    return sorted(modules)
+
+
+def get_git_head(path):
+    """Returns the current commit of the repository containing `path`, or None if it is not a git repository."""
+    directory = path if os.path.isdir(path) else os.path.dirname(path) or "."
+    try:
+        result = subprocess.run(
+            ["git", "-C", directory, "rev-parse", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=False
+        )
+    except OSError:
+        return None
+    return result.stdout.strip() if result.returncode == 0 else None
+
+
+def run_tool(tool, inputs, file=None):
+    """Calls a tool's runner with the inputs named in its registry entry."""
+    module_name, function_name = TOOLS[tool]["runner"].split(":")
+    runner = getattr(import_module(module_name), function_name)
+
+    args = [file if name == "file" else inputs.get(name) for name in TOOLS[tool]["args"]]
+    return runner(*args)
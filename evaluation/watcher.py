@@ -0,0 +1,143 @@
+import os
+import sys
+import time
+import threading
+from evaluation.scheduler import EXCLUDED_DIRS, is_analyzed_python_file
+
+# Watch mode: re-run file-level metrics whenever a notebook or Python file is saved.
+# Uses filesystem notifications through watchdog (inotify on Linux) when it is installed,
+# and falls back to polling file modification times otherwise.
+
+WATCHED_EXTENSIONS = (".py", ".ipynb")
+
+# Editors often write a file several times per save (temp file, rename, checkpoint),
+# so changes are collected until the folder has been quiet for this long
+DEBOUNCE_SECONDS = 1.0
+POLL_INTERVAL = 1.0
+
+
+def _is_watched(path, target):
+    """True for notebooks and the .py files a full scan analyzes, under the watched target."""
+    path = os.path.abspath(path)
+    if os.path.isfile(target):
+        # A single target file is scanned whatever its name, as in the full scan
+        return path == os.path.abspath(target)
+    if not path.endswith(WATCHED_EXTENSIONS):
+        return False
+    if set(path.split(os.sep)) & EXCLUDED_DIRS:
+        return False
+    if path.endswith(".py"):
+        # .py files written by notebook conversion change on every scan
+        if os.path.exists(os.path.splitext(path)[0] + ".ipynb"):
+            return False
+        # Same filter as the full scan (no boilerplate or test files)
+        return is_analyzed_python_file(path)
+    return True
+
+
+def _snapshot(target):
+    """Returns {file: (mtime, size)} for the watched files (used by the polling fallback)."""
+    if os.path.isfile(target):
+        candidates = [target]
+    else:
+        candidates = []
+        for root, dirs, files in os.walk(target):
+            dirs[:] = [d for d in dirs if d not in EXCLUDED_DIRS]
+            candidates.extend(os.path.join(root, f) for f in files if f.endswith(WATCHED_EXTENSIONS))
+
+    snapshot = {}
+    for path in candidates:
+        if _is_watched(path, target):
+            try:
+                stat = os.stat(path)
+                snapshot[os.path.abspath(path)] = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                continue
+    return snapshot
+
+
+def _start_observer(target, on_event):
+    """Starts a watchdog observer calling `on_event(path)` for every change, or returns None without watchdog."""
+    try:
+        from watchdog.observers import Observer
+        from watchdog.events import FileSystemEventHandler
+    except ImportError:
+        return None
+
+    class Handler(FileSystemEventHandler):
+        def on_any_event(self, event):
+            if event.is_directory:
+                return
+            # Jupyter saves by writing a temporary file and renaming it over the notebook
+            on_event(getattr(event, "dest_path", None) or event.src_path)
+
+    directory = target if os.path.isdir(target) else os.path.dirname(os.path.abspath(target))
+    observer = Observer()
+    observer.schedule(Handler(), directory, recursive=os.path.isdir(target))
+    observer.start()
+    return observer
+
+
+def watch_path(target, on_change, stop_event=None, debounce=DEBOUNCE_SECONDS, poll_interval=POLL_INTERVAL):
+    """
+    Watches a file or folder and calls `on_change(paths)` with the saved files after each burst of changes.
+
+    Blocks until `stop_event` is set (or forever). Deleted files are not reported.
+
+    Args:
+        target (str): notebook, Python file or project folder.
+        on_change (callable): called with a sorted list of absolute paths.
+        stop_event (threading.Event): set it to stop watching.
+        debounce (float): seconds without changes before `on_change` is called.
+        poll_interval (float): seconds between scans when polling.
+    """
+    stop_event = stop_event or threading.Event()
+    pending = set()
+    lock = threading.Lock()
+    last_change = [0.0]
+
+    def add(path):
+        if _is_watched(path, target):
+            with lock:
+                pending.add(os.path.abspath(path))
+                last_change[0] = time.monotonic()
+
+    observer = _start_observer(target, add)
+    snapshot = _snapshot(target) if observer is None else None
+    last_poll = time.monotonic()
+
+    try:
+        while not stop_event.wait(0.2):
+            now = time.monotonic()
+
+            if observer is None and now - last_poll >= poll_interval:
+                current = _snapshot(target)
+                for path, signature in current.items():
+                    if snapshot.get(path) != signature:
+                        add(path)
+                snapshot = current
+                last_poll = now
+
+            with lock:
+                if not pending or now - last_change[0] < debounce:
+                    continue
+                changed = sorted(path for path in pending if os.path.exists(path))
+                pending.clear()
+
+            if changed:
+                try:
+                    on_change(changed)
+                except Exception as e:
+                    print(f"[WARNING] Re-scan after change failed: {e}", file=sys.stderr)
+    finally:
+        if observer is not None:
+            observer.stop()
+            observer.join()
+
+
+def start_watch(target, on_change, **kwargs):
+    """Runs `watch_path` in a background thread. Returns the stop event; set it to stop watching."""
+    stop_event = threading.Event()
+    thread = threading.Thread(target=watch_path, args=(target, on_change, stop_event), kwargs=kwargs, daemon=True)
+    thread.start()
+    return stop_event
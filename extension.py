@@ -3,12 +3,19 @@ This module defines the user interface and lifecycle interaction for
 the Jupyter extension that helps assess the quality of Tier-1 research software.
 """
 
+import os
+from urllib.error import URLError
 import ipywidgets as widgets
 from IPython.display import display, HTML, Markdown
 from lifecycle.stage_manager import get_metrics_for_stage
-from evaluation.evaluator import evaluate_metrics
+from lifecycle.scan_profiles import DEFAULT_PROFILE, SCAN_PROFILES
+from evaluation.evaluator import evaluate_metrics, evaluate_file_metrics
 from evaluation.evaluator import display_maintenance_metric_overview
 from evaluation.evaluator import display_development_metric_overview
+from evaluation.evaluator import display_testing_metric_overview
+from evaluation.evaluator import display_planning_metric_overview
+from evaluation.scan_service import submit_scan, SERVER_ENV_VAR
+from evaluation.watcher import start_watch
 
 # -------------------------------------------------------------------
 # UI ELEMENTS: Create all the interactive components for the extension
@@ -47,30 +54,86 @@ run_button = widgets.Button(
     layout=widgets.Layout(margin="0 0 15px 0")
 )
 
+profile_dropdown = widgets.Dropdown(
+    options=list(SCAN_PROFILES),
+    value=DEFAULT_PROFILE,
+    description="Scan Profile:",
+    style={'description_width': 'initial'}
+)
+
+profile_hint = widgets.HTML(
+    f"<div style='color: gray; font-size: 90%; margin-top: -10px;'>{SCAN_PROFILES[DEFAULT_PROFILE]['description']}.</div>"
+)
+
+watch_checkbox = widgets.Checkbox(
+    value=False,
+    description="Re-scan files when they are saved",
+    style={'description_width': 'initial'}
+)
+
 output_area = widgets.Output()
 
+# One output widget per file, so watch mode can replace a single file's results in place
+file_outputs = {}
+watch_state = {"stop_event": None}
+
 # -------------------------------------------------------------------
 # Button click event: handles all lifecycle logic
 # -------------------------------------------------------------------
 
+def render_file_results(file_output, file, file_metrics):
+    """Shows the results of one file in its own output widget (safe to call from the watch thread)."""
+    file_output.outputs = ()
+    file_output.append_display_data(Markdown(f"---\n📄 **File: `{file}`**"))
+    for metric, result in file_metrics.items():
+        if isinstance(result, dict):
+            status = result.get("status", "")
+            message = result.get("message", "")
+            icon = "✓" if status == "pass" else "x"
+            file_output.append_display_data(Markdown(f"- {icon} **{metric}**: {message}"))
+        else:
+            file_output.append_display_data(Markdown(f"- **{metric}**: {result}"))
+
+def on_file_saved(metrics, profile, paths):
+    """Watch mode: re-runs the file-level metrics of saved files and patches their displayed results."""
+    for path in paths:
+        for file, file_metrics in evaluate_file_metrics(metrics, path, profile=profile).items():
+            if file not in file_outputs:
+                file_outputs[file] = widgets.Output()
+                output_area.append_display_data(file_outputs[file])
+            render_file_results(file_outputs[file], file, file_metrics)
+
 def on_run_button_click(_b):
     output_area.clear_output()
+    file_outputs.clear()
+
+    # Stop watching the previous target
+    if watch_state["stop_event"] is not None:
+        watch_state["stop_event"].set()
+        watch_state["stop_event"] = None
 
     selected_stage = stage_dropdown.value
     target_path = target_input.value.strip()
     github_url = github_url_input.value.strip()
+    profile = profile_dropdown.value
 
     with output_area:
         display(Markdown(f"### Selected Stage: `{selected_stage}`"))
 
         metrics = get_metrics_for_stage(selected_stage)
 
+        if selected_stage == "Planning and Design":
+            display_planning_metric_overview()
+
         if selected_stage == "Development":
             display_development_metric_overview()
 
         if selected_stage == "Maintenance":
             display_maintenance_metric_overview()
 
+        if selected_stage == "Testing":
+            display_testing_metric_overview()
+
         if selected_stage != "Maintenance":
             pretty_path = (
                 "(entire project)" if target_path.strip() == "." else target_path
@@ -78,8 +141,17 @@ def on_run_button_click(_b):
             display(Markdown(f"Target Path: `{pretty_path}`"))
 
 
-        # Perform evaluation
-        results = evaluate_metrics(metrics, target_path, github_url)
+        # Perform evaluation (through the local scan service if one is configured)
+        results = None
+        server_url = os.environ.get(SERVER_ENV_VAR)
+        if server_url:
+            try:
+                results = submit_scan(server_url, target_path, metrics=metrics, github_url=github_url, profile=profile)
+            except URLError:
+                display(HTML(f"<i>Scan service at {server_url} not reachable, scanning locally.</i>"))
+
+        if results is None:
+            results = evaluate_metrics(metrics, target_path, github_url, profile=profile)
 
         # STEP 1: Display project-level results if present
         if "Project-Level Results" in results:
@@ -87,14 +159,20 @@ def on_run_button_click(_b):
             display(Markdown("---"))
             display(Markdown("📁 **Project-Level Results**"))
 
-            # Explain what metrics Howfairis contributes to
-            if "FAIR Assessment (howfairis)" in project_metrics:
-                display(HTML("<i>Howfairis contributes to the following metrics: "
+            # Explain what metrics the FAIR assessment contributes to
+            if "FAIR Assessment" in project_metrics:
+                display(HTML("<i>The FAIR assessment contributes to the following metrics: "
                             "<b>Presence of License</b>, "
                             "<b>Publicly Accessible Repository</b>, "
                             "<b>Rich Metadata</b> (partially), and "
                             "<b>Documentation Quality</b> (partially).</i><br><br>"))
 
+            # The architecture analysis covers three Planning and Design metrics at once
+            if "Architecture Analysis" in project_metrics:
+                display(HTML("<i>The architecture analysis contributes to the following metrics: "
+                            "<b>Modularity</b>, <b>Cohesion</b>, and "
+                            "<b>Architectural Complexity</b>.</i><br><br>"))
+
             for metric, result in project_metrics.items():
                 if metric.startswith("-----divider"):
                     display(Markdown("---"))
@@ -103,7 +181,7 @@ def on_run_button_click(_b):
                 if selected_stage == "Maintenance":
                     display(Markdown(f"**{metric}**"))
 
-                if selected_stage == "Development":
+                if selected_stage in ("Planning and Design", "Development", "Testing"):
                     icon = "✓" if result.get("status") == "pass" else "x"
                     display(Markdown(f"- {icon} **{metric}**"))
 
@@ -121,15 +199,14 @@ def on_run_button_click(_b):
                 if file == "Project-Level Results":
                     continue
 
-                display(Markdown(f"---\n📄 **File: `{file}`**"))
-                for metric, result in file_metrics.items():
-                    if isinstance(result, dict):
-                        status = result.get("status", "")
-                        message = result.get("message", "")
-                        icon = "✓" if status == "pass" else "x"
-                        display(Markdown(f"- {icon} **{metric}**: {message}"))
-                    else:
-                        display(Markdown(f"- **{metric}**: {result}"))
+                file_outputs[file] = widgets.Output()
+                display(file_outputs[file])
+                render_file_results(file_outputs[file], file, file_metrics)
+
+            # STEP 3: Optionally keep the file-level results up to date while files are edited
+            if watch_checkbox.value:
+                watch_state["stop_event"] = start_watch(target_path, lambda paths: on_file_saved(metrics, profile, paths))
+                display(HTML("<i>Watching for saved files. File results below are updated automatically.</i>"))
 
 # -------------------------------------------------------------------
 # Toggle visibility for GitHub input
@@ -147,6 +224,13 @@ def on_stage_change(change):
 
 stage_dropdown.observe(on_stage_change, names='value')
 
+def on_profile_change(change):
+    profile_hint.value = (
+        f"<div style='color: gray; font-size: 90%; margin-top: -10px;'>{SCAN_PROFILES[change['new']]['description']}.</div>"
+    )
+
+profile_dropdown.observe(on_profile_change, names='value')
+
 # -------------------------------------------------------------------
 # Render the UI
 # -------------------------------------------------------------------
@@ -158,6 +242,9 @@ ui = widgets.VBox([
     target_input,
     project_hint,
     github_url_input,
+    profile_dropdown,
+    profile_hint,
+    watch_checkbox,
     run_button,
     output_area
 ])
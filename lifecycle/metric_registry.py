@@ -0,0 +1,151 @@
+# Registry of automatically measured metrics.
+#
+# Every metric names the tool that measures it, whether it is measured per file or
+# once per project, which inputs it needs, and a rough relative cost (1 = cheap, 5 = slow).
+# Several metrics can share one tool run (e.g. the FAIR checker covers four FAIRness metrics).
+#
+# Inputs (computed once by evaluation/scheduler.py:prepare_inputs, except "network" and "tree",
+# which the tool accesses itself; a tool that reads or parses files on its own declares nothing for it):
+#   "notebooks"  - notebooks converted to .py files next to the originals
+#   "files"      - the filtered list of Python files to analyze
+#   "excluded_files" - large, generated and minified files that project-level tools skip
+#   "ast_facts"  - imports, functions and classes of every module, from the shared AST pass
+#                  (evaluation/ast_pass.py, cached per file content)
+#   "git"        - git history of the project
+#   "network"    - remote services (e.g. the GitHub API)
+#   "tree"       - project files other than code (license, README, citation metadata)
+#
+# Metrics that are not listed here (e.g. "User Satisfaction") have no automated tool.
+
+METRIC_REGISTRY = {
+    # Planning and Design
+    "Modularity": {"tool": "architecture", "scope": "project", "inputs": ["notebooks", "ast_facts"], "cost": 2},
+    "Cohesion": {"tool": "architecture", "scope": "project", "inputs": ["notebooks", "ast_facts"], "cost": 2},
+    "Architectural Complexity": {"tool": "architecture", "scope": "project", "inputs": ["notebooks", "ast_facts"], "cost": 2},
+
+    # Development
+    "Code Smells": {"tool": "pylint", "scope": "file", "inputs": ["files"], "cost": 5},
+    "Maintainability Index": {"tool": "radon_mi", "scope": "file", "inputs": ["files"], "cost": 2},
+    "Cyclomatic Complexity": {"tool": "radon_cc", "scope": "file", "inputs": ["files"], "cost": 2},
+    "Cognitive Complexity": {"tool": "cognitive", "scope": "file", "inputs": ["files", "ast_facts"], "cost": 1},
+    "Comment Density": {"tool": "radon_raw", "scope": "file", "inputs": ["files"], "cost": 1},
+    "Code Duplication": {"tool": "jscpd", "scope": "project", "inputs": ["notebooks", "excluded_files"], "cost": 4},
+    "Dependency Management": {"tool": "dependencies", "scope": "project", "inputs": ["notebooks"], "cost": 2},
+    "Software Size (LoC)": {"tool": "loc", "scope": "project", "inputs": ["excluded_files"], "cost": 1},
+    "Percentage of Assertions": {"tool": "assertions", "scope": "project", "inputs": ["notebooks"], "cost": 2},
+    "Technical Debt": {"tool": "debt", "scope": "project", "inputs": ["notebooks", "ast_facts"], "cost": 1},
+
+    # Maintenance
+    "Presence of License": {"tool": "fair", "scope": "project", "inputs": ["tree"], "cost": 1},
+    "Publicly Accessible Repository": {"tool": "fair", "scope": "project", "inputs": ["tree"], "cost": 1},
+    "Rich Metadata": {"tool": "fair", "scope": "project", "inputs": ["tree"], "cost": 1},
+    "Documentation Quality": {"tool": "fair", "scope": "project", "inputs": ["tree"], "cost": 1},
+    "No Leaked Private Credentials": {"tool": "gitleaks", "scope": "project", "inputs": ["git"], "cost": 5},
+    "Security Vulnerabilities": {"tool": "bandit", "scope": "project", "inputs": ["files", "excluded_files"], "cost": 5},
+
+    # Testing
+    "Unit Tests": {"tool": "pytest", "scope": "project", "inputs": [], "cost": 5},
+    "Test Success Rate": {"tool": "pytest", "scope": "project", "inputs": [], "cost": 5},
+    "Code Reproducibility": {"tool": "reproducibility", "scope": "project", "inputs": [], "cost": 5},
+}
+
+# How each tool is called.
+#   runner     - "module:function", imported only when the tool actually runs
+#   args       - names of the scan inputs or scan options passed to the runner, in order
+#                ("file" is the current file for file-level tools; tool settings such as
+#                "pylint_options" come from the scan profile, see lifecycle/scan_profiles.py)
+#   result_key - name the result is stored under
+#   divider    - insert a divider before this result in the project-level section
+#   uses_results - run after all other tools, with the scan results so far as the "results" argument
+#
+# The order of this dict is the order results are shown in.
+TOOLS = {
+    "architecture": {
+        "runner": "tools.architecture_checker:run_architecture_analysis",
+        "args": ["path", "ast_facts"],
+        "result_key": "Architecture Analysis",
+    },
+    "fair": {
+        "runner": "tools.fair_checker:run_fair_assessment",
+        "args": ["path", "github_url"],
+        "result_key": "FAIR Assessment",
+    },
+    "gitleaks": {
+        "runner": "tools.gitleaks_runner:run_gitleaks_secret_scan",
+        "args": ["path", "git", "full_rescan"],
+        "result_key": "Leaked Secrets Scan (Gitleaks)",
+        "divider": True,
+    },
+    "bandit": {
+        "runner": "tools.bandit_runner:run_bandit_security_scan",
+        "args": ["path", "files", "update_baseline", "excluded_files"],
+        "result_key": "Security Vulnerability Scan (Bandit)",
+        "divider": True,
+    },
+    "dependencies": {
+        "runner": "tools.dependency_checker:run_dependency_check",
+        "args": ["path"],
+        "result_key": "Dependency Management",
+    },
+    "loc": {
+        "runner": "tools.loc_counter:run_project_loc",
+        "args": ["path", "excluded_files"],
+        "result_key": "Software Size (LoC)",
+    },
+    "jscpd": {
+        "runner": "tools.jscpd_runner:run_jscpd_code_duplication",
+        "args": ["path", "jscpd_min_lines", "excluded_files"],
+        "result_key": "Code Duplication",
+    },
+    "assertions": {
+        "runner": "tools.assertion_counter:run_assertion_percentage",
+        "args": ["path"],
+        "result_key": "Percentage of Assertions",
+    },
+    "debt": {
+        "runner": "tools.debt_estimator:run_debt_estimate",
+        "args": ["path", "ast_facts", "results"],
+        "result_key": "Technical Debt",
+        "uses_results": True,
+    },
+    "pytest": {
+        "runner": "tools.test_runner:run_test_suite",
+        "args": ["path"],
+        "result_key": "Test Execution (pytest)",
+    },
+    "reproducibility": {
+        "runner": "tools.reproducibility_runner:run_reproducibility_check",
+        "args": ["path"],
+        "result_key": "Code Reproducibility",
+    },
+    "pylint": {
+        "runner": "tools.pylint_runner:run_pylint_code_smell",
+        "args": ["file", "pylint_options"],
+        "result_key": "Code Smells",
+    },
+    "radon_mi": {
+        "runner": "tools.radon_runner:run_radon_maintainability_index",
+        "args": ["file"],
+        "result_key": "Maintainability Index",
+    },
+    "radon_cc": {
+        "runner": "tools.radon_runner:run_radon_cyclomatic_complexity",
+        "args": ["file", "radon_cc_options"],
+        "result_key": "Cyclomatic Complexity",
+    },
+    "cognitive": {
+        "runner": "tools.cognitive_complexity:run_cognitive_complexity",
+        "args": ["file", "ast_facts"],
+        "result_key": "Cognitive Complexity",
+    },
+    "radon_raw": {
+        "runner": "tools.radon_runner:run_radon_comment_density",
+        "args": ["file"],
+        "result_key": "Comment Density",
+    },
+}
+
+
+# function that returns the registry entries for the requested metrics
+def get_registered_metrics(metric_names):
+    return {name: METRIC_REGISTRY[name] for name in metric_names if name in METRIC_REGISTRY}
@@ -0,0 +1,45 @@
+# Scan profiles trade analysis depth for speed.
+#
+#   skip_tools   - registry tools (lifecycle/metric_registry.py) not run with this profile;
+#                  their metrics are listed as skipped in the project-level results
+#   tool_options - scan options passed to the tools that take them (see the "args" of TOOLS);
+#                  options left out use the tool's own defaults
+#
+# "quick" is meant for interactive scans while editing, "standard" is the default,
+# and "deep" is meant for nightly or CI runs where time matters less.
+
+SCAN_PROFILES = {
+    "quick": {
+        "description": "Seconds: skips tests, notebook re-execution, duplication and history/security scans; "
+                       "pylint without inference-heavy checkers",
+        "skip_tools": ["pytest", "reproducibility", "jscpd", "gitleaks", "bandit"],
+        "tool_options": {
+            "pylint_options": ["--disable=all", "--enable=C,W", "--disable=imports,typecheck,similarities"],
+        },
+    },
+    "standard": {
+        "description": "All tools with their default settings",
+        "skip_tools": [],
+        "tool_options": {},
+    },
+    "deep": {
+        "description": "All tools; pylint also reports errors, nested functions get their own complexity, "
+                       "and shorter duplicated blocks are found",
+        "skip_tools": [],
+        "tool_options": {
+            "pylint_options": ["--disable=all", "--enable=C,R,W,E"],
+            "radon_cc_options": ["--no-assert", "--show-closures"],
+            "jscpd_min_lines": 3,
+        },
+    },
+}
+
+DEFAULT_PROFILE = "standard"
+
+
+# function that returns the settings of a scan profile (the default profile for None)
+def get_scan_profile(profile_name=None):
+    profile_name = profile_name or DEFAULT_PROFILE
+    if profile_name not in SCAN_PROFILES:
+        raise ValueError(f"Unknown scan profile '{profile_name}'. Choose one of: {', '.join(SCAN_PROFILES)}.")
+    return SCAN_PROFILES[profile_name]
@@ -1,40 +1,203 @@
 import argparse # For parsing command-line arguments
-import json # For outputting raw results as JSON
-from evaluation.evaluator import evaluate_metrics
+import contextlib
+import os
+import sys
 from lifecycle.stage_manager import get_metrics_for_stage
+from lifecycle.scan_profiles import DEFAULT_PROFILE, SCAN_PROFILES
+from evaluation.result_formats import FORMATS, open_writer, write_results, write_sections
+from evaluation.scan_service import SERVER_ENV_VAR  # stdlib-only module, keeps --help fast
+
+# Subcommands that query the scan history instead of scanning
+HISTORY_COMMANDS = {"history", "diff", "trend"}
+
+def history_main(argv):
+    """Lists past scans, shows per-file regressions between two scans, or the trend of one metric."""
+    from datetime import datetime
+    from evaluation.scan_history import diff_scans, list_scans, metric_trend
+
+    parser = argparse.ArgumentParser(prog="run_quality_scan_cli.py", description="Query the local scan history.")
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--db", type=str, default=None, help="Optional: history database (defaults to the user cache folder)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    history_parser = subparsers.add_parser("history", parents=[common], help="List recent scans")
+    history_parser.add_argument("--path", type=str, default=None, help="Only scans of this path")
+    history_parser.add_argument("--limit", type=int, default=20)
+
+    diff_parser = subparsers.add_parser("diff", parents=[common], help="Show per-file regressions between two scans")
+    diff_parser.add_argument("old", type=int, help="Older scan id")
+    diff_parser.add_argument("new", type=int, help="Newer scan id")
+    diff_parser.add_argument("--all", action="store_true", help="Show all changes, not only regressions")
+
+    trend_parser = subparsers.add_parser("trend", parents=[common], help="Show how one metric changed over past scans")
+    trend_parser.add_argument("metric", type=str, help='Metric name, e.g. "Maintainability Index"')
+    trend_parser.add_argument("--path", type=str, default=None, help="Only scans of this path")
+    trend_parser.add_argument("--file", type=str, default=None, help="Only this file (default: average over files)")
+    trend_parser.add_argument("--limit", type=int, default=100)
+
+    args = parser.parse_args(argv)
+
+    def format_time(timestamp):
+        return datetime.fromtimestamp(timestamp).strftime("%Y-%m-%d %H:%M")
+
+    def format_value(value):
+        return "-" if value is None else f"{value:.2f}"
+
+    if args.command == "history":
+        for scan_id, created_at, path, stage in list_scans(args.path, args.limit, db_path=args.db):
+            print(f"{scan_id:>6}  {format_time(created_at)}  {stage or '-':<20}  {path}")
+
+    elif args.command == "diff":
+        changes = diff_scans(args.old, args.new, db_path=args.db, regressions_only=not args.all)
+        if not changes:
+            print(f"No regressions between scan {args.old} and scan {args.new}.")
+        for change in changes:
+            marker = "✗" if change["regression"] else " "
+            print(f"{marker} {change['file']} | {change['metric']}: "
+                  f"{change['old_status']} {format_value(change['old_value'])} -> "
+                  f"{change['new_status']} {format_value(change['new_value'])}")
+
+    elif args.command == "trend":
+        rows = metric_trend(args.metric, path=args.path, file=args.file, limit=args.limit, db_path=args.db)
+        if not rows:
+            print(f"No recorded values for {args.metric}.")
+        for scan_id, created_at, value in rows:
+            print(f"{scan_id:>6}  {format_time(created_at)}  {format_value(value)}")
+
+def log(message):
+    """Progress and status lines go to stderr, so stdout only carries the results."""
+    print(message, file=sys.stderr)
+
+@contextlib.contextmanager
+def save_atomically(path):
+    """
+    Opens a temporary file next to `path` and renames it over `path` once it is complete,
+    so an interrupted or failed scan leaves the previous results file untouched.
+    """
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+            yield f
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def watch_and_rescan(args, metrics, results, writer):
+    """
+    Re-runs the file-level metrics of each saved file until Ctrl+C.
+
+    With --save, the file is rewritten with all results after each change. Otherwise the
+    updated results go to stdout: ndjson and csv continue the first scan's stream through
+    its `writer` (no second csv header), and json writes one document per update.
+    """
+    from evaluation.evaluator import evaluate_file_metrics
+    from evaluation.watcher import watch_path
+
+    def on_change(paths):
+        for changed_path in paths:
+            log(f"\n Changed: {changed_path}")
+            update = evaluate_file_metrics(metrics, changed_path, classify_files=not args.all_files, profile=args.profile)
+            results.update(update)
+            if args.save:
+                continue
+            if args.format == "json":
+                write_results(update, args.format, sys.stdout, root=args.path)
+            else:
+                write_sections(writer, update)
+            sys.stdout.flush()
+
+        if args.save:
+            with save_atomically(args.save) as f:
+                write_results(results, args.format, f, root=args.path)
+
+    log(f"\n Watching {args.path} for changes (Ctrl+C to stop)...")
+    try:
+        watch_path(args.path, on_change)
+    except KeyboardInterrupt:
+        log("\n Stopped watching.")
 
 def main():
+    if sys.argv[1:2] and sys.argv[1] in HISTORY_COMMANDS:
+        history_main(sys.argv[1:])
+        return
+
     # Set up command-line argument parsing
     parser = argparse.ArgumentParser(description="Run notebook quality scan from the command line.")
     parser.add_argument("--stage", type=str, required=True, help="Lifecycle stage (e.g., Development, Maintenance)")
     parser.add_argument("--path", type=str, required=True, help="Path to notebook file or project folder")
-    parser.add_argument("--github", type=str, default=None, help="GitHub repo URL (optional, only needed for FAIRness checks)")
-    parser.add_argument("--save", type=str, help="Optional: path to save raw results as JSON")
+    parser.add_argument("--github", type=str, default=None, help="GitHub repo URL (optional, enables remote FAIRness checks)")
+    parser.add_argument("--save", type=str, help="Optional: write the results to this file instead of stdout")
+    parser.add_argument("--format", choices=FORMATS, default="json",
+                        help="Optional: output format: json (raw results, default), ndjson (one result per line), "
+                             "sarif (findings for code scanning tools) or csv (one row per result)")
+    parser.add_argument("--full", action="store_true", help="Optional: rescan the full git history for secrets instead of only new commits")
+    parser.add_argument("--update-baseline", action="store_true", help="Optional: accept the current Bandit issues as baseline, so only new issues are reported later")
+    parser.add_argument("--all-files", action="store_true", help="Optional: run every metric on large, generated and minified files too")
+    parser.add_argument("--profile", choices=list(SCAN_PROFILES), default=DEFAULT_PROFILE,
+                        help="Optional: scan profile trading depth for speed: "
+                             + "; ".join(f"{name} = {profile['description']}" for name, profile in SCAN_PROFILES.items()))
+    parser.add_argument("--watch", action="store_true", help="Optional: keep running and re-scan file-level metrics of each saved notebook or .py file")
+    parser.add_argument("--no-history", action="store_true", help="Optional: do not record this scan in the local scan history")
+    parser.add_argument("--server", type=str, default=os.environ.get(SERVER_ENV_VAR),
+                        help=f"Optional: URL of a running scan service (e.g., http://127.0.0.1:8765). Defaults to ${SERVER_ENV_VAR}")
 
     # Parse arguments
     args = parser.parse_args()
+    if args.watch and args.format == "sarif" and not args.save:
+        # A SARIF log is one document that is only complete at the end of the scan
+        parser.error("--format sarif cannot stream watch-mode updates to stdout; add --save FILE or choose another format")
 
-    print(f"Running quality scan...")
-    print(f"Stage: {args.stage}")
-    print(f"Path: {args.path}")
+    log(f"Running quality scan...")
+    log(f"Stage: {args.stage}")
+    log(f"Path: {args.path}")
+    log(f"Profile: {args.profile}")
     if args.github:
-        print(f"GitHub URL: {args.github}")
+        log(f"GitHub URL: {args.github}")
 
     # Step 1: Get metrics for selected stage
     metrics = get_metrics_for_stage(args.stage)
 
-    # Step 2: Run the tool on the target path
-    results = evaluate_metrics(metrics, path=args.path, github_url=args.github)
+    # Step 2: Run the tool on the target path (through the scan service if one is configured)
+    # Heavy modules are imported only now, after argument parsing
+    # Results go to stdout, or to the --save file (replaced only once complete), in the chosen format
+    with (save_atomically(args.save) if args.save else contextlib.nullcontext(sys.stdout)) as output:
+        writer = open_writer(args.format, output, root=args.path)
+        results = None
+        if args.server:
+            from urllib.error import URLError
+            from evaluation.scan_service import submit_scan
+
+            try:
+                results = submit_scan(args.server, args.path, metrics=metrics, github_url=args.github,
+                                      full_rescan=args.full, update_baseline=args.update_baseline,
+                                      all_files=args.all_files, profile=args.profile)
+            except URLError as e:
+                log(f"Scan service at {args.server} not reachable ({e.reason}), scanning locally.")
 
-    # Step 3: Print the raw output exactly (as JSON)
-    print("\n Raw Restuls: \n")
-    print(json.dumps(results, indent=2, ensure_ascii=False))
+        # Step 3: Write the results (local scans stream each result as soon as it is ready)
+        if results is not None:
+            write_sections(writer, results)
+        else:
+            from evaluation.evaluator import evaluate_metrics
+            results = evaluate_metrics(metrics, path=args.path, github_url=args.github,
+                                       full_rescan=args.full, update_baseline=args.update_baseline,
+                                       classify_files=not args.all_files, profile=args.profile,
+                                       on_result=writer.write)
+        writer.finish(results)
 
-    # Step 4: Optionally save to JSON file
     if args.save:
-        with open(args.save, "w", encoding="utf-8") as f:
-            json.dump(results, f, indent=2, ensure_ascii=False)
-        print(f"\n Results saved to: {args.save}")
+        log(f"\n Results saved to: {args.save}")
+
+    # Step 4: Append the scan to the local history (see the history, diff and trend subcommands)
+    if not args.no_history:
+        from evaluation.scan_history import record_scan
+        scan_id = record_scan(results, args.path, stage=args.stage)
+        log(f"\n Scan recorded in history as #{scan_id}")
+
+    # Step 5: Optionally keep watching for saved files
+    if args.watch:
+        watch_and_rescan(args, metrics, results, writer)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
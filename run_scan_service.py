@@ -0,0 +1,15 @@
+import argparse # For parsing command-line arguments
+from evaluation.scan_service import serve, DEFAULT_HOST, DEFAULT_PORT
+
+def main():
+    # Set up command-line argument parsing
+    parser = argparse.ArgumentParser(description="Run the local quality scan service (keeps analysis tools loaded between scans).")
+    parser.add_argument("--host", type=str, default=DEFAULT_HOST, help="Interface to bind (default: localhost only)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="Port to listen on")
+
+    args = parser.parse_args()
+
+    serve(args.host, args.port)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,293 @@
+import os
+import statistics
+
+# Architecture metrics for the Planning and Design stage, computed from the module import
+# graph and the class facts of the shared AST pass (evaluation/ast_pass.py).
+# Every step is linear in the number of modules, imports and methods.
+
+# Modules importing more project modules than this are reported as hubs
+MAX_FAN_OUT = 10
+
+# A class whose methods fall into several unconnected groups (LCOM4 > 1) could be split
+MAX_LOW_COHESION_SHARE = 0.2
+
+# Common source roots that are on sys.path in src-layout projects
+SOURCE_ROOTS = ("src", "lib")
+
+
+def module_name(filepath, root):
+    """Dotted module name of a file relative to the project root ("pkg/__init__.py" -> "pkg")."""
+    relative = os.path.splitext(os.path.relpath(filepath, root))[0]
+    parts = [part for part in relative.split(os.sep) if part not in ("", ".")]
+    if parts and parts[-1] == "__init__":
+        parts.pop()
+    return ".".join(parts)
+
+
+def _resolve(name, importer, importer_is_package, level, modules):
+    """Finds the project module an import refers to, or None for third-party and standard library imports."""
+    if level:
+        # Relative import: go up from the importing module's package
+        package = importer.split(".") if importer_is_package else importer.split(".")[:-1]
+        if level - 1 > len(package):
+            return None
+        base = package[:len(package) - (level - 1)]
+        candidates = [".".join(base + ([name] if name else []))]
+    else:
+        # Absolute import: from the project root, a source root, or the importer's folder (scripts, notebooks)
+        folder = importer.split(".")[:-1] if not importer_is_package else importer.split(".")
+        candidates = [name] + [f"{source_root}.{name}" for source_root in SOURCE_ROOTS]
+        if folder:
+            candidates.append(".".join(folder + [name]))
+
+    for candidate in candidates:
+        # "import a.b.c" depends on the deepest project module in the chain
+        parts = candidate.split(".")
+        for end in range(len(parts), 0, -1):
+            prefix = ".".join(parts[:end])
+            if prefix in modules:
+                return prefix
+    return None
+
+
+def build_import_graph(ast_facts, root):
+    """
+    Builds the project's module import graph.
+
+    Returns:
+        dict: {module name: set of project modules it imports}
+    """
+    modules = {}
+    for filepath in ast_facts:
+        modules[module_name(filepath, root)] = filepath
+
+    graph = {module: set() for module in modules}
+    for module, filepath in modules.items():
+        is_package = os.path.basename(filepath) == "__init__.py"
+        for name, level, imported_names in ast_facts[filepath]["imports"]:
+            if not imported_names or "*" in imported_names:
+                targets = {_resolve(name, module, is_package, level, modules)}
+            else:
+                # "from pkg import sub" depends on the submodule pkg.sub if there is one, otherwise on pkg
+                targets = {
+                    _resolve(f"{name}.{imported}" if name else imported, module, is_package, level, modules)
+                    for imported in imported_names
+                }
+            graph[module].update(target for target in targets if target and target != module)
+    return graph
+
+
+def strongly_connected_components(graph):
+    """
+    Tarjan's algorithm, iterative so that deep import chains do not hit the recursion limit.
+
+    Returns:
+        list: components (lists of modules) in reverse topological order (dependencies first).
+    """
+    index = {}
+    lowlink = {}
+    on_stack = set()
+    stack = []
+    components = []
+    counter = 0
+
+    for start in graph:
+        if start in index:
+            continue
+        work = [(start, iter(graph[start]))]
+        index[start] = lowlink[start] = counter
+        counter += 1
+        stack.append(start)
+        on_stack.add(start)
+
+        while work:
+            node, successors = work[-1]
+            advanced = False
+            for successor in successors:
+                if successor not in index:
+                    index[successor] = lowlink[successor] = counter
+                    counter += 1
+                    stack.append(successor)
+                    on_stack.add(successor)
+                    work.append((successor, iter(graph[successor])))
+                    advanced = True
+                    break
+                if successor in on_stack:
+                    lowlink[node] = min(lowlink[node], index[successor])
+            if advanced:
+                continue
+
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                lowlink[parent] = min(lowlink[parent], lowlink[node])
+            if lowlink[node] == index[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == node:
+                        break
+                components.append(component)
+    return components
+
+
+def longest_dependency_chain(graph, components):
+    """Length (in modules) of the longest import chain, counting each import cycle as one step."""
+    component_of = {module: i for i, component in enumerate(components) for module in component}
+    depth = [1] * len(components)
+    # Components come dependencies first, so every dependency's depth is final when it is used
+    for i, component in enumerate(components):
+        for module in component:
+            for dependency in graph[module]:
+                j = component_of[dependency]
+                if j != i:
+                    depth[i] = max(depth[i], depth[j] + 1)
+    return max(depth, default=0)
+
+
+def lcom4(methods):
+    """
+    LCOM4 of a class: the number of groups of methods that share no attributes and do not call each other.
+
+    `methods` maps method names to the attributes they use through self. __init__ is left out,
+    since it touches every attribute and would hide classes that do several unrelated things.
+    Methods that never use the instance (abstract stubs, static-like helpers) are left out too.
+    """
+    names = [name for name in methods if name != "__init__" and methods[name]]
+    if len(names) < 2:
+        return 1
+
+    parent = {name: name for name in names}
+
+    def find(name):
+        while parent[name] != name:
+            parent[name] = parent[parent[name]]
+            name = parent[name]
+        return name
+
+    owner_of_attribute = {}
+    for name in names:
+        for attribute in methods[name]:
+            if attribute in parent:
+                # self.other_method(): the methods are connected
+                parent[find(attribute)] = find(name)
+            elif attribute in owner_of_attribute:
+                parent[find(owner_of_attribute[attribute])] = find(name)
+            else:
+                owner_of_attribute[attribute] = name
+    return len({find(name) for name in names})
+
+
+def run_architecture_analysis(path, ast_facts):
+    """
+    Measures Modularity, Cohesion and Architectural Complexity from the import graph and class structure.
+
+    - Modularity: fan-out (project modules a module imports), fan-in (modules importing it)
+      and instability (fan-out / (fan-in + fan-out)).
+    - Cohesion: LCOM4 per class; 1 means all methods work on shared state.
+    - Architectural Complexity: import cycles (strongly connected components) and the
+      longest chain of module dependencies.
+
+    Args:
+        path (str): project folder or file.
+        ast_facts (dict): output of `evaluation.ast_pass.collect_ast_facts`.
+
+    Returns:
+        dict: {
+            'status': 'pass' if there are no import cycles and few low-cohesion classes, otherwise 'fail',
+            'modules', 'imports', 'cycles', 'longest_chain', 'fan_in', 'fan_out', 'classes': details,
+            'message': styled summary
+        }
+    """
+    if not ast_facts:
+        return {"status": "fail", "message": "No Python modules found to analyze."}
+
+    root = path if os.path.isdir(path) else os.path.dirname(os.path.abspath(path))
+    graph = build_import_graph(ast_facts, root)
+
+    # Modularity
+    fan_out = {module: len(targets) for module, targets in graph.items()}
+    fan_in = dict.fromkeys(graph, 0)
+    for targets in graph.values():
+        for target in targets:
+            fan_in[target] += 1
+    edges = sum(fan_out.values())
+    instability = {
+        module: fan_out[module] / (fan_in[module] + fan_out[module])
+        for module in graph if fan_in[module] + fan_out[module]
+    }
+    hubs = sorted((m for m in graph if fan_out[m] > MAX_FAN_OUT), key=lambda m: -fan_out[m])
+    most_used = sorted((m for m in graph if fan_in[m]), key=lambda m: -fan_in[m])[:5]
+
+    # Architectural complexity
+    components = strongly_connected_components(graph)
+    cycles = [sorted(component) for component in components if len(component) > 1]
+    in_cycles = sum(len(cycle) for cycle in cycles)
+    longest_chain = longest_dependency_chain(graph, components)
+
+    # Cohesion
+    classes = []
+    for filepath, facts in ast_facts.items():
+        for cls in facts["classes"]:
+            if len([m for m, used in cls["methods"].items() if m != "__init__" and used]) >= 2:
+                classes.append({
+                    "class": f"{module_name(filepath, root)}.{cls['name']}",
+                    "file": filepath,
+                    "line": cls["line"],
+                    "lcom4": lcom4(cls["methods"]),
+                })
+    low_cohesion = sorted((c for c in classes if c["lcom4"] > 1), key=lambda c: -c["lcom4"])
+    low_cohesion_share = len(low_cohesion) / len(classes) if classes else 0.0
+
+    status = "pass" if not cycles and low_cohesion_share <= MAX_LOW_COHESION_SHARE else "fail"
+    parse_errors = [f for f, facts in ast_facts.items() if facts.get("error")]
+
+    def module_list(items, describe):
+        return ", ".join(f"<code>{item}</code> ({describe(item)})" for item in items) or "none"
+
+    styled_modularity = (
+        "<div style='margin-left: 20px;'><b>Modularity:</b> "
+        f"{len(graph)} modules with {edges} imports between them. "
+        f"Fan-out: mean {statistics.mean(fan_out.values()):.1f}, max {max(fan_out.values())}. "
+        f"Mean instability {statistics.mean(instability.values()) if instability else 0:.2f}.<br>"
+        f"Most imported: {module_list(most_used, lambda m: f'fan-in {fan_in[m]}')}<br>"
+        f"Hubs (fan-out above {MAX_FAN_OUT}): {module_list(hubs[:5], lambda m: f'fan-out {fan_out[m]}')}</div>"
+    )
+    styled_cohesion = (
+        "<div style='margin-left: 20px;'><b>Cohesion:</b> "
+        f"{len(low_cohesion)} of {len(classes)} classes with 2+ methods using the instance have unrelated method groups (LCOM4 &gt; 1)"
+        + (": " + ", ".join(f"<code>{c['class']}</code> (LCOM4 {c['lcom4']})" for c in low_cohesion[:5]) if low_cohesion else ".")
+        + "</div>"
+    )
+    styled_complexity = (
+        "<div style='margin-left: 20px;'><b>Architectural Complexity:</b> "
+        f"{len(cycles)} import cycle(s) involving {in_cycles} modules; longest dependency chain: {longest_chain} modules."
+        + "".join(f"<br>• cycle: {' ↔ '.join(f'<code>{m}</code>' for m in cycle[:6])}{' …' if len(cycle) > 6 else ''}"
+                  for cycle in cycles[:5])
+        + "</div>"
+    )
+    styled_note = (
+        "<div style='margin-left: 20px; color: gray; font-size: 90%;'>"
+        "<i>Note: Only imports between the project's own modules are counted."
+        + (f" {len(parse_errors)} file(s) could not be parsed and were left out." if parse_errors else "")
+        + "</i></div>"
+    )
+    styled_tip = (
+        "<div style='margin-left: 20px; color: gray; font-size: 90%;'>"
+        "<b>Tip:</b> Break import cycles by moving shared code into a separate module, "
+        "and split classes whose methods do not share any state.</div>"
+    )
+
+    return {
+        "status": status,
+        "modules": len(graph),
+        "imports": edges,
+        "cycles": cycles,
+        "longest_chain": longest_chain,
+        "fan_in": fan_in,
+        "fan_out": fan_out,
+        "classes": classes,
+        "message": styled_modularity + styled_cohesion + styled_complexity + styled_note + styled_tip
+    }
@@ -1,28 +1,70 @@
-import subprocess
 import os
 import json
+from tools.result_cache import file_digest, load_cache, save_cache
+from tools.process_limits import ToolLimitExceeded, limit_exceeded_result, run_limited
 
-def run_bandit_security_scan(path):
+# Per-file results are cached by content hash, so unchanged files are not re-scanned
+CACHE_PATH = os.path.join("bandit-report", "file_cache.json")
+CACHE_MAX_ENTRIES = 50000
+
+# Baseline of accepted issues, stored in the project root
+BASELINE_FILENAME = ".bandit-baseline.json"
+
+def _bandit_version():
+    try:
+        from importlib.metadata import version
+        return version("bandit")
+    except Exception:
+        return "unknown"
+
+def _collect_targets(path):
+    """Collects .py files under `path` when no file list is given (excluding venv, __pycache__, etc)."""
+    ignored_dirs = {"venv", ".git", "__pycache__", ".ipynb_checkpoints", "bandit-report", ".mypy_cache"}
+    if os.path.isfile(path):
+        return [path] if path.endswith(".py") else []
+
+    targets = []
+    for root, dirs, files in os.walk(path):
+        dirs[:] = [d for d in dirs if d not in ignored_dirs]
+        targets.extend(os.path.join(root, f) for f in files if f.endswith(".py"))
+    return targets
+
+def _baseline_key(issue, root):
+    # Line numbers are left out so that edits elsewhere in a file do not "renew" accepted issues
+    filename = os.path.relpath(issue.get("filename", ""), root)
+    return f"{filename}|{issue.get('test_id')}|{issue.get('issue_text')}"
+
+def _load_baseline(baseline_path):
+    try:
+        with open(baseline_path, "r") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return []
+
+def run_bandit_security_scan(path, files=None, update_baseline=False, excluded_files=None):
     """
-    Run Bandit on all user-written source files (excluding venv, __pycache__, etc)
-    and summarize HIGH/MEDIUM severity issues.
+    Run Bandit on the project's source files and summarize HIGH/MEDIUM severity issues.
+
+    Args:
+        path (str): project directory (or single file).
+        files (list): the scan's resolved Python file list; if None, all .py files under `path`.
+        update_baseline (bool): store the current issues as the accepted baseline.
+        excluded_files (list): large, generated or minified files that are not scanned.
+
+    Only files whose content changed since an earlier scan are passed to Bandit; results
+    for the others come from a cache keyed by content hash. If the project has a
+    `.bandit-baseline.json`, issues recorded in it are not reported, so only new
+    MEDIUM/HIGH issues fail the check.
 
     Returns:
         dict: A formatted project-level scan result with severity-based filtering.
     """
 
-    # STEP 1: Identify valid target folders/files
-    ignored_dirs = {"venv", ".git", "__pycache__", ".ipynb_checkpoints", "bandit-report", ".mypy_cache"}
-    # current_dir = os.getcwd()
-    current_dir = path 
-    targets = []
-
-    for item in os.listdir(current_dir):
-        path = os.path.join(current_dir, item)
-        if item in ignored_dirs:
-            continue
-        if os.path.isdir(path) or (os.path.isfile(path) and path.endswith(".py")):
-            targets.append(item)
+    # STEP 1: Identify the files to scan
+    targets = files if files is not None else _collect_targets(path)
+    excluded = {os.path.abspath(f) for f in excluded_files or []}
+    skipped = [t for t in targets if os.path.abspath(t) in excluded]
+    targets = [t for t in targets if os.path.isfile(t) and os.path.abspath(t) not in excluded]
 
     if not targets:
         return {
@@ -30,41 +72,112 @@ def run_bandit_security_scan(path):
             "message": "No user code found to scan. Project directory is empty or only contains ignored folders."
         }
 
-    # STEP 2: Run Bandit and store results in a JSON file
+    # STEP 2: Run Bandit on new or changed files only, and store results in a JSON file
     output_dir = "bandit-report"
     os.makedirs(output_dir, exist_ok=True)
     report_path = os.path.join(output_dir, "bandit_report.json")
 
-    try:
-        subprocess.run(
-            ["bandit", "-r", *targets, "-f", "json", "-o", report_path],
-            check=False,
-            capture_output=True,
-            text=True
-        )
-    except subprocess.CalledProcessError as e:
-        return {
-            "status": "fail",
-            "message": f"Bandit scan failed.\n\n{e.stderr}"
-        }
+    cache = load_cache(CACHE_PATH)
+    version = _bandit_version()
+    cache_keys = {target: f"{version}:{file_digest(target)}" for target in targets}
+    to_scan = [target for target in targets if cache_keys[target] not in cache]
 
-    if not os.path.exists(report_path):
-        return {
-            "status": "fail",
-            "message": "Bandit report was not generated."
-        }
+    if to_scan:
+        # A report left over from an earlier run must never be read as this run's result
+        if os.path.exists(report_path):
+            os.remove(report_path)
+
+        try:
+            completed = run_limited(
+                "bandit",
+                ["bandit", "-f", "json", "-o", report_path, *to_scan],
+                text=True
+            )
+        except ToolLimitExceeded as e:
+            return limit_exceeded_result(e)
+        except OSError as e:
+            return {
+                "status": "fail",
+                "message": f"Bandit scan failed.\n\n{e}"
+            }
+
+        # Bandit exits with 0 (no issues) or 1 (issues found); anything else is a crash,
+        # and nothing is cached so the files are scanned again next time
+        if completed.returncode not in (0, 1):
+            return {
+                "status": "fail",
+                "message": f"Bandit scan failed (exit code {completed.returncode}).\n\n{(completed.stderr or '').strip()}"
+            }
+
+        if not os.path.exists(report_path):
+            return {
+                "status": "fail",
+                "message": "Bandit report was not generated."
+            }
+
+        try:
+            with open(report_path, "r") as f:
+                data = json.load(f)
+        except json.JSONDecodeError:
+            return {
+                "status": "fail",
+                "message": "Bandit report could not be read."
+            }
+
+        # Files Bandit could not parse are not cached, so they are retried next time
+        failed = {os.path.normpath(err.get("filename", "")) for err in data.get("errors", [])}
+        scanned_issues = {os.path.normpath(target): [] for target in to_scan}
+        for issue in data.get("results", []):
+            scanned_issues.setdefault(os.path.normpath(issue.get("filename", "")), []).append(issue)
 
-    # STEP 3: Parse and filter MEDIUM/HIGH issues
-    with open(report_path, "r") as f:
-        data = json.load(f)
+        for target in to_scan:
+            if os.path.normpath(target) not in failed:
+                cache[cache_keys[target]] = scanned_issues[os.path.normpath(target)]
+
+    # STEP 3: Assemble results for all files (cached issues get the current file name)
+    all_results = []
+    for target in targets:
+        key = cache_keys[target]
+        if key not in cache:
+            continue
+        issues = cache.pop(key)
+        cache[key] = issues  # re-insert to mark as recently used
+        all_results.extend(dict(issue, filename=target) for issue in issues)
+
+    save_cache(CACHE_PATH, cache, max_entries=CACHE_MAX_ENTRIES)
+
+    with open(report_path, "w") as f:
+        json.dump({"results": all_results}, f, indent=1)
+
+    # Drop issues accepted in the project's baseline
+    root = path if os.path.isdir(path) else os.path.dirname(path) or "."
+    baseline_path = os.path.join(root, BASELINE_FILENAME)
+    if update_baseline:
+        with open(baseline_path, "w") as f:
+            json.dump(sorted({_baseline_key(r, root) for r in all_results}), f, indent=1)
+
+    baseline = set(_load_baseline(baseline_path))
+    baselined_count = sum(1 for r in all_results if _baseline_key(r, root) in baseline)
+    all_results = [r for r in all_results if _baseline_key(r, root) not in baseline]
 
-    all_results = data.get("results", [])
     severity_to_show = {"LOW", "MEDIUM", "HIGH"}
     filtered = [r for r in all_results if r.get("issue_severity") in severity_to_show]
     filtered = sorted(filtered, key=lambda r: {"HIGH": 0, "MEDIUM": 1, "LOW": 2}.get(r.get("issue_severity"), 3))
 
     has_medium_or_high = any(r["issue_severity"] in {"MEDIUM", "HIGH"} for r in filtered)
 
+    # Structured issues, so findings can be located (e.g. mapped back to notebook cells)
+    issues = [
+        {
+            "file": r.get("filename"),
+            "line": r.get("line_number"),
+            "severity": r.get("issue_severity"),
+            "rule": r.get("test_id"),
+            "text": r.get("issue_text"),
+        }
+        for r in filtered
+    ]
+
     # STEP 4: Generate styled UI output
     styled_note = (
         "<div style='margin-left: 20px; color: gray; font-size: 90%;'>"
@@ -77,6 +190,16 @@ def run_bandit_security_scan(path):
         "Watch for risky constructs like subprocess calls, use of eval, or hardcoded secrets. "
         "Even LOW severity findings may require attention in sensitive applications.</div>"
     )
+    if skipped:
+        styled_note += (
+            "<div style='margin-left: 20px; color: gray; font-size: 90%;'>"
+            f"<i>{len(skipped)} large, generated or minified file(s) were not scanned (see their File Classification).</i></div>"
+        )
+    if baselined_count:
+        styled_note += (
+            "<div style='margin-left: 20px; color: gray; font-size: 90%;'>"
+            f"<i>{baselined_count} issue(s) accepted in <code>{BASELINE_FILENAME}</code> are not shown.</i></div>"
+        )
 
     if not has_medium_or_high:
         styled_summary = (
@@ -96,6 +219,7 @@ def run_bandit_security_scan(path):
         styled_results += "</div>"
         return {
             "status": "pass",
+            "issues": issues,
             "message": styled_header + styled_summary + styled_results + styled_tip + styled_note
         }
 
@@ -118,5 +242,6 @@ def run_bandit_security_scan(path):
 
     return {
         "status": "fail",
+        "issues": issues,
         "message": styled_header + styled_summary + styled_results + styled_note + styled_tip
     }
\ No newline at end of file
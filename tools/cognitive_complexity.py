@@ -0,0 +1,107 @@
+import os
+
+# Cognitive complexity (SonarSource) per function, taken from the shared AST pass,
+# so it costs no extra parse or subprocess.
+
+# SonarSource's default limit per function
+MAX_FUNCTION_COMPLEXITY = 15
+
+MODULE_LEVEL = "<module>"
+
+
+def run_cognitive_complexity(filepath, ast_facts=None):
+    """
+    Reports the cognitive complexity of every function in a Python file, and of its
+    module-level code (the bulk of a converted notebook).
+
+    Unlike cyclomatic complexity, cognitive complexity penalizes nesting: a branch inside
+    two loops costs 3, while a flat chain of "elif"s costs 1 per branch.
+
+    Args:
+        filepath (str): Python file to analyze.
+        ast_facts (dict): output of `evaluation.ast_pass.collect_ast_facts` for the scan;
+            the file is parsed on its own if it is not in it (e.g. in watch mode).
+
+    Returns:
+        dict: {
+            'status': 'pass' if no function exceeds MAX_FUNCTION_COMPLEXITY, otherwise 'fail',
+            'score': average complexity per function,
+            'total': complexity of the whole file,
+            'functions': [{'name', 'line', 'complexity'}], most complex first,
+            'message': styled summary
+        }
+    """
+    if not os.path.isfile(filepath):
+        return {
+            "status": "fail",
+            "message": f"File not found: {filepath}"
+        }
+
+    facts = (ast_facts or {}).get(filepath)
+    if facts is None:
+        from evaluation.ast_pass import collect_ast_facts
+        facts = collect_ast_facts([filepath]).get(filepath)
+
+    if facts is None or facts.get("error"):
+        return {
+            "status": "fail",
+            "message": f"Could not parse the file: {facts.get('error') if facts else 'unreadable'}"
+        }
+
+    # Nested functions are already counted in the function that contains them
+    functions = [
+        {"name": function["name"], "line": function["line"], "complexity": function["cognitive"]}
+        for function in facts["functions"] if not function["nested"]
+    ]
+    if facts.get("module_cognitive"):
+        functions.append({"name": MODULE_LEVEL, "line": 1, "complexity": facts["module_cognitive"]})
+    functions.sort(key=lambda function: -function["complexity"])
+
+    if not functions:
+        return {
+            "status": "pass",
+            "score": 0,
+            "total": 0,
+            "functions": [],
+            "message": "No functions or branching code found."
+        }
+
+    total = sum(function["complexity"] for function in functions)
+    average = total / len(functions)
+    too_complex = [function for function in functions if function["complexity"] > MAX_FUNCTION_COMPLEXITY]
+    worst = functions[0]
+
+    if too_complex:
+        note = f"{len(too_complex)} function(s) exceed a cognitive complexity of {MAX_FUNCTION_COMPLEXITY}."
+        tip = ("Flatten deeply nested code: return early instead of nesting if-blocks, "
+               "and move inner loops or long conditions into well-named helper functions.")
+    else:
+        note = "All functions are easy to follow."
+        tip = "Keep nesting shallow and conditions short as the code grows."
+
+    listed = "".join(
+        f"• <code>{function['name']}</code> (line {function['line']}): {function['complexity']}<br>"
+        for function in too_complex[:10]
+    )
+    styled_list = f"<div style='margin-left: 20px;'>{listed}</div>" if listed else ""
+    styled_note = f"<div style='margin-left: 20px; color: gray; font-size: 90%;'><i>{note}</i></div>"
+    styled_tip = f"<div style='margin-left: 20px; color: gray; font-size: 90%;'><b>Tip:</b> {tip}</div>"
+    legend = (
+        "<div style='margin-left: 20px; color: gray; font-size: 90%;'>"
+        "<i>Note: Cognitive complexity counts branches, loops and boolean operator sequences, "
+        f"with extra points for nesting. Functions above {MAX_FUNCTION_COMPLEXITY} are hard to understand.</i>"
+        "</div>"
+    )
+
+    message = (
+        f"Avg. Cognitive Complexity: {average:.2f}, Max: {worst['complexity']} (<code>{worst['name']}</code>)"
+        f"{styled_list}{styled_note}{styled_tip}{legend}"
+    )
+
+    return {
+        "status": "fail" if too_complex else "pass",
+        "score": average,
+        "total": total,
+        "functions": functions,
+        "message": message
+    }
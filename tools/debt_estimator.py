@@ -0,0 +1,258 @@
+import os
+import html
+from bisect import bisect_right
+
+# Technical debt estimate built only from results the scan has already computed:
+# pylint messages, radon cyclomatic complexity blocks, jscpd clones and function sizes
+# from the shared AST pass. No tool is run again.
+#
+# Remediation times follow the SQALE idea used by SonarQube: every finding costs a fixed
+# number of minutes to fix, and the debt ratio compares the total with the estimated
+# cost of writing the code (DEVELOPMENT_MINUTES_PER_LINE per line).
+
+# Minutes to fix one pylint message, by message category (first letter of the code)
+PYLINT_MINUTES = {"F": 15, "E": 15, "W": 5, "R": 10, "C": 2, "I": 0}
+
+# Cyclomatic complexity above this costs COMPLEXITY_BASE_MINUTES plus a minute per extra point
+COMPLEXITY_THRESHOLD = 10
+COMPLEXITY_BASE_MINUTES = 10
+
+# Minutes to remove one duplicated block
+CLONE_MINUTES = 10
+
+# Function length above this costs a minute per extra line
+LONG_FUNCTION_LINES = 50
+
+DEVELOPMENT_MINUTES_PER_LINE = 30
+
+# Debt ratio upper bounds of the ratings A-D (anything above is E)
+RATING_BOUNDS = [("A", 0.05), ("B", 0.10), ("C", 0.20), ("D", 0.50)]
+
+# Call-graph centrality (PageRank)
+DAMPING = 0.85
+ITERATIONS = 30
+
+MODULE_LEVEL = "<module>"
+
+
+def _debt_rating(ratio):
+    for rating, bound in RATING_BOUNDS:
+        if ratio <= bound:
+            return rating
+    return "E"
+
+
+def _format_minutes(minutes):
+    hours, minutes = divmod(int(round(minutes)), 60)
+    return f"{hours}h {minutes:02d}min" if hours else f"{minutes}min"
+
+
+class _FunctionIndex:
+    """Finds the innermost function of a file that contains a line."""
+
+    def __init__(self, functions):
+        self.functions = sorted(functions, key=lambda function: function["line"])
+        self.starts = [function["line"] for function in self.functions]
+
+    def find(self, line):
+        if line is None:
+            return None
+        index = bisect_right(self.starts, line) - 1
+        # Nested functions start after their parent, so the first containing match is the innermost
+        while index >= 0:
+            function = self.functions[index]
+            if function["line"] <= line <= function["end_line"]:
+                return function
+            index -= 1
+        return None
+
+
+def build_call_graph(ast_facts):
+    """
+    Links calls to the project's own functions.
+
+    A call is resolved by the callee's last name part, preferring the caller's class
+    (self.method) and module; names that match several functions elsewhere are skipped.
+
+    Returns:
+        dict: {(file, function name): set of (file, function name) it calls}
+    """
+    by_short_name = {}
+    for file, facts in ast_facts.items():
+        for function in facts["functions"]:
+            by_short_name.setdefault(function["name"].rsplit(".", 1)[-1], []).append((file, function["name"]))
+
+    graph = {}
+    for file, facts in ast_facts.items():
+        for function in facts["functions"]:
+            caller = (file, function["name"])
+            caller_class = function["name"].rsplit(".", 1)[0] if "." in function["name"] else None
+            callees = set()
+            for call in function["calls"]:
+                candidates = by_short_name.get(call.rsplit(".", 1)[-1], [])
+                if call.startswith("self.") and caller_class:
+                    candidates = [c for c in candidates if c[0] == file and c[1] == f"{caller_class}.{call[5:]}"]
+                elif len(candidates) > 1:
+                    candidates = [c for c in candidates if c[0] == file] or candidates
+                if len(candidates) == 1 and candidates[0] != caller:
+                    callees.add(candidates[0])
+            graph[caller] = callees
+    return graph
+
+
+def call_centrality(graph):
+    """PageRank over the call graph, scaled so the average function has centrality 1."""
+    nodes = list(graph)
+    if not nodes:
+        return {}
+    count = len(nodes)
+    rank = dict.fromkeys(nodes, 1.0 / count)
+
+    for _ in range(ITERATIONS):
+        # Functions that call nothing spread their rank evenly
+        dangling = sum(rank[node] for node in nodes if not graph[node])
+        new_rank = dict.fromkeys(nodes, (1 - DAMPING) / count + DAMPING * dangling / count)
+        for node in nodes:
+            if graph[node]:
+                share = DAMPING * rank[node] / len(graph[node])
+                for callee in graph[node]:
+                    new_rank[callee] += share
+        rank = new_rank
+
+    return {node: value * count for node, value in rank.items()}
+
+
+def run_debt_estimate(path, ast_facts, results):
+    """
+    Estimates technical debt per function as remediation time, and ranks functions by
+    debt weighted with their call-graph centrality, so that often-used code is fixed first.
+
+    Args:
+        path (str): scanned file or project folder.
+        ast_facts (dict): output of `evaluation.ast_pass.collect_ast_facts`.
+        results (dict): results computed so far in this scan (pylint, radon and jscpd are used if present).
+
+    Returns:
+        dict: {
+            'status': 'pass' for debt rating A or B, otherwise 'fail',
+            'minutes': total remediation time,
+            'ratio': debt / estimated development time,
+            'rating': 'A'-'E',
+            'functions': functions with debt, highest priority first,
+            'message': styled summary
+        }
+    """
+    if not ast_facts:
+        return {"status": "fail", "message": "No Python files found to estimate technical debt."}
+
+    facts_by_file = {os.path.abspath(file): facts for file, facts in ast_facts.items()}
+    results_by_file = {
+        os.path.abspath(file): file_results for file, file_results in results.items()
+        if file != "Project-Level Results" and isinstance(file_results, dict)
+    }
+    indexes = {file: _FunctionIndex(facts["functions"]) for file, facts in facts_by_file.items()}
+
+    debt = {}
+
+    def add(file, line, minutes, reason):
+        if not minutes or file not in indexes:
+            return
+        function = indexes[file].find(line)
+        key = (file, function["name"] if function else MODULE_LEVEL)
+        entry = debt.setdefault(key, {"minutes": 0, "reasons": {}})
+        entry["minutes"] += minutes
+        entry["reasons"][reason] = entry["reasons"].get(reason, 0) + 1
+
+    used = set()
+    for file, file_results in results_by_file.items():
+        smells = file_results.get("Code Smells", {})
+        if "issues" in smells:
+            used.add("pylint")
+        for issue in smells.get("issues", []):
+            add(file, issue.get("line"), PYLINT_MINUTES.get(issue.get("code", "C")[:1], 2), f"pylint {issue.get('code')}")
+
+        complexity_result = file_results.get("Cyclomatic Complexity", {})
+        if "blocks" in complexity_result:
+            used.add("radon")
+        for block in complexity_result.get("blocks", []):
+            complexity = block.get("complexity", 0)
+            if complexity > COMPLEXITY_THRESHOLD:
+                add(file, block.get("line"), COMPLEXITY_BASE_MINUTES + complexity - COMPLEXITY_THRESHOLD,
+                    f"complexity {complexity}")
+
+    duplication = results.get("Project-Level Results", {}).get("Code Duplication", {})
+    if "clones" in duplication:
+        used.add("jscpd")
+    for clone in duplication.get("clones", []):
+        if clone.get("file"):
+            add(os.path.abspath(clone["file"]), clone.get("start"), CLONE_MINUTES, "duplicated block")
+
+    for file, facts in facts_by_file.items():
+        for function in facts["functions"]:
+            length = function["end_line"] - function["line"] + 1
+            if length > LONG_FUNCTION_LINES:
+                add(file, function["line"], length - LONG_FUNCTION_LINES, f"{length} lines long")
+
+    # Rank by debt x centrality: debt in code that many other functions depend on costs more
+    centrality = call_centrality(build_call_graph(facts_by_file))
+    functions = []
+    for (file, name), entry in debt.items():
+        weight = centrality.get((file, name), 1.0)
+        functions.append({
+            "file": file,
+            "function": name,
+            "minutes": entry["minutes"],
+            "centrality": weight,
+            "priority": entry["minutes"] * weight,
+            "reasons": entry["reasons"],
+        })
+    functions.sort(key=lambda function: -function["priority"])
+
+    total_minutes = sum(function["minutes"] for function in functions)
+    total_lines = sum(facts.get("lines", 0) for facts in facts_by_file.values())
+    ratio = total_minutes / (total_lines * DEVELOPMENT_MINUTES_PER_LINE) if total_lines else 0.0
+    rating = _debt_rating(ratio)
+
+    root = path if os.path.isdir(path) else os.path.dirname(os.path.abspath(path))
+
+    def describe(function):
+        reasons = ", ".join(html.escape(reason) + (f" ×{count}" if count > 1 else "") for reason, count in
+                            sorted(function["reasons"].items(), key=lambda item: -item[1])[:3])
+        # Names such as "<module>" would otherwise be read as HTML tags and disappear
+        return (
+            f"• <code>{html.escape(os.path.relpath(function['file'], root))}</code> "
+            f"<code>{html.escape(function['function'])}</code>: "
+            f"{_format_minutes(function['minutes'])}, centrality {function['centrality']:.1f} ({reasons})<br>"
+        )
+
+    missing = [tool for tool in ("pylint", "radon", "jscpd") if tool not in used]
+    styled_header = (
+        f"<div style='margin-left: 20px;'>Estimated remediation time: <b>{_format_minutes(total_minutes)}</b>, "
+        f"debt ratio {ratio * 100:.1f}% (rating <b>{rating}</b>)</div>"
+    )
+    styled_top = (
+        "<div style='margin-left: 20px;'>Fix first (debt weighted by how central the function is in the call graph):<br>"
+        + ("".join(describe(function) for function in functions[:10]) or "none")
+        + "</div>"
+    )
+    styled_note = (
+        "<div style='margin-left: 20px; color: gray; font-size: 90%;'>"
+        "<i>Note: Estimated from pylint messages, cyclomatic complexity, duplicated blocks and function length, "
+        f"against {DEVELOPMENT_MINUTES_PER_LINE} minutes of development per line. Ratings: A ≤5%, B ≤10%, C ≤20%, D ≤50%, E above."
+        + (f" Not included (no results from this scan): {', '.join(missing)}." if missing else "")
+        + "</i></div>"
+    )
+    styled_tip = (
+        "<div style='margin-left: 20px; color: gray; font-size: 90%;'>"
+        "<b>Tip:</b> Refactor the functions at the top of the list first: they carry the most debt "
+        "in the code the rest of the project relies on.</div>"
+    )
+
+    return {
+        "status": "pass" if rating in ("A", "B") else "fail",
+        "minutes": total_minutes,
+        "ratio": ratio,
+        "rating": rating,
+        "functions": functions,
+        "message": styled_header + styled_top + styled_note + styled_tip
+    }
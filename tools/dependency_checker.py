@@ -1,6 +1,35 @@
 import os
+import re
+import sys
 import ast
-import importlib.util
+from functools import lru_cache
+
+# Standard library modules shipped with the interpreter (no lookup or import needed)
+STDLIB_MODULES = frozenset(sys.stdlib_module_names) | frozenset(sys.builtin_module_names)
+
+# Well-known import names whose distribution name differs, used when the package
+# is not installed in the scanning environment
+KNOWN_DISTRIBUTIONS = {
+    "sklearn": "scikit-learn",
+    "skimage": "scikit-image",
+    "cv2": "opencv-python",
+    "PIL": "Pillow",
+    "yaml": "PyYAML",
+    "bs4": "beautifulsoup4",
+    "dateutil": "python-dateutil",
+    "dotenv": "python-dotenv",
+    "Bio": "biopython",
+    "osgeo": "GDAL",
+    "mpl_toolkits": "matplotlib",
+    "attr": "attrs",
+    "jwt": "PyJWT",
+    "serial": "pyserial",
+    "Crypto": "pycryptodome",
+    "OpenSSL": "pyOpenSSL",
+    "pkg_resources": "setuptools",
+    "IPython": "ipython",
+    "google": "protobuf",
+}
 
 # Extract imports from a single python file
 def extract_imports_from_file(filepath):
@@ -19,8 +48,8 @@ def extract_imports_from_file(filepath):
             for n in node.names:
                 imports.add(n.name.split('.')[0]) # Take only the top-level module
         elif isinstance(node, ast.ImportFrom):
-            # Handle "from xxx import yyy" statements
-            if node.module:
+            # Handle "from xxx import yyy" statements (relative imports are project-local)
+            if node.module and not node.level:
                 imports.add(node.module.split('.')[0]) # Only top-level module
     return imports
 
@@ -45,60 +74,91 @@ def extract_imports_from_project(path):
                     continue  # Skip files that can't be read or parsed
     return all_imports
 
-# Parse requirements.txt and extract declared packages
+# Parse requirements.txt and extract declared packages (nested "-r" includes are followed)
 def parse_requirements(requirements_path="requirements.txt"):
     if not os.path.exists(requirements_path):
         return None # requirements.txt is missing
-    
-    declared = set()
-    with open(requirements_path, 'r', encoding='utf-8') as f:
-        for line in f:
-            line = line.strip()
-            if line and not line.startswith("#"):
-                # Remove version contraints (e.g., 'package==1.2.3' -> 'package')
-                declared.add(line.split('==')[0].split('>=')[0].strip())
-    return declared
+
+    from tools.dependency_manifests import parse_requirements_file
+    return parse_requirements_file(requirements_path)
+
+# Normalize a distribution name for comparison (PEP 503: "Scikit_Learn" -> "scikit-learn")
+def normalize_name(name):
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+# Map of top-level import name -> distribution names, built once per process from
+# installed package metadata (RECORD/top_level.txt). No package code is imported.
+@lru_cache(maxsize=1)
+def get_installed_distributions():
+    from importlib.metadata import packages_distributions
+    return packages_distributions()
+
+# Collect the names of the project's own top-level modules and packages
+def find_local_modules(path):
+    local_modules = set()
+    for root, dirs, files in os.walk(path):
+        dirs[:] = [d for d in dirs if not d.startswith(".") and "venv" not in d and "env" not in d]
+        if any(fname.endswith(".py") for fname in files):
+            local_modules.add(os.path.basename(root))
+        local_modules.update(fname[:-3] for fname in files if fname.endswith(".py"))
+    return local_modules
+
+# Resolve a top-level import name to the distributions that may provide it.
+# Returns an empty list for standard library, private and project-local modules.
+def resolve_distributions(module_name, local_modules=frozenset()):
+    if module_name.startswith("_") or module_name in STDLIB_MODULES or module_name in local_modules:
+        return []
+
+    installed = get_installed_distributions().get(module_name)
+    if installed:
+        return sorted(set(installed))
+
+    # Not installed here: fall back to known aliases, else assume the import name is the distribution name
+    return [KNOWN_DISTRIBUTIONS.get(module_name, module_name)]
 
 # Check if an import is a third-party (installable) module
-# Third-party Python module: a module installed via tools like pip, located in site-packages
-def is_importable_third_party(module_name):
-    if module_name.startswith("_"):
-        return False # Skip built-in/internal modules
-    try:
-        spec = importlib.util.find_spec(module_name)
-
-        if not spec or not spec.origin:
-            return False
-        
-        # Consider only modules installed in site-packages (e.g., third-party)
-        return "site-packages" in spec.origin
-    except Exception:
-        return False
+# Third-party Python module: a module distributed on package indexes such as PyPI
+def is_importable_third_party(module_name, local_modules=frozenset()):
+    return bool(resolve_distributions(module_name, local_modules))
 
 # Run the dependency check on a project folder
 def run_dependency_check(project_path="."):
-    requirements_path = os.path.join(project_path, "requirements.txt")
+    from tools.dependency_manifests import load_project_manifests
 
     # Collect all imports used in the project source file 
     project_imports = extract_imports_from_project(project_path)
 
-    # Keep only the imports taht are third-party (i.e., installed via pip)
-    used_imports = {name for name in project_imports if is_importable_third_party(name)}
-    # used_imports = {name.lower() for name in project_imports if is_importable_third_party(name)}
+    # Keep only the imports that are third-party, mapped to the distributions that provide them
+    local_modules = find_local_modules(project_path)
+    candidates = {name: resolve_distributions(name, local_modules) for name in project_imports}
+    candidates = {name: dists for name, dists in candidates.items() if dists}
 
-    # Read declared dependencies from requirements.txt
-    declared_deps = parse_requirements(requirements_path)
+    # Read declared dependencies from requirements*.txt, pyproject.toml, setup.cfg and environment.yml
+    manifests = load_project_manifests(project_path)
+    declared_deps = manifests["declared"]
 
-    if declared_deps is None:
+    if not manifests["manifests"]:
         return {
             "status": "fail",
-            "message": "requirements.txt not found. Cannot validate dependencies."
+            "message": "No dependency manifest found (requirements.txt, pyproject.toml, setup.cfg or environment.yml). Cannot validate dependencies."
         }
 
-    # Compute missing, unused, and correctly declared dependencies 
-    missing = used_imports - declared_deps
-    declared_not_imported = declared_deps - used_imports
-    declared_and_used = used_imports & declared_deps
+    # An import is declared if any distribution providing it is listed (names compared PEP 503-normalized)
+    declared_by_key = {normalize_name(dep): dep for dep in declared_deps}
+    used_imports = set()
+    missing = set()
+    declared_and_used = set()
+    for name, dists in candidates.items():
+        matched = [declared_by_key[normalize_name(d)] for d in dists if normalize_name(d) in declared_by_key]
+        if matched:
+            used_imports.update(matched)
+            declared_and_used.update(matched)
+        else:
+            used_imports.add(dists[0])
+            missing.add(dists[0])
+
+    # Compute unused dependencies
+    declared_not_imported = declared_deps - declared_and_used
 
     # Pass only if no missing packages
     status = "pass" if not missing else "fail"
@@ -116,7 +176,8 @@ def run_dependency_check(project_path="."):
 
     # Show summary statistics
     msg_lines.append(gray_block("Imported third-party packages found in your code:", str(len(used_imports))))
-    msg_lines.append(gray_block("Packages listed in requirements.txt:", str(len(declared_deps))))
+    msg_lines.append(gray_block("Packages declared in dependency manifests:", str(len(declared_deps))))
+    msg_lines.append(gray_list("Manifests read:", [os.path.relpath(m, project_path) for m in manifests["manifests"]]))
     
     # List all used and declared packages 
     msg_lines.append(gray_list("Imported packages:", used_imports))
@@ -134,7 +195,7 @@ def run_dependency_check(project_path="."):
 
     # Status explanation for users
     explanation = (
-        "<div style='margin-left: 20px; color: gray; font-size: 90%;'><i>A checkmark <b>✓</b> is shown when all imported third-party packages are declared in <code>requirements.txt</code>. If any are missing, the project receives an <b>x</b> instead.</i></div>"
+        "<div style='margin-left: 20px; color: gray; font-size: 90%;'><i>A checkmark <b>✓</b> is shown when all imported third-party packages are declared in a dependency manifest (<code>requirements.txt</code>, <code>pyproject.toml</code>, <code>setup.cfg</code> or <code>environment.yml</code>). If any are missing, the project receives an <b>x</b> instead.</i></div>"
     )
     msg_lines.append(explanation)
 
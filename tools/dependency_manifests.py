@@ -0,0 +1,207 @@
+import os
+import re
+import configparser
+
+# Files that declare Python dependencies
+REQUIREMENTS_PATTERN = re.compile(r"^requirements.*\.(txt|in)$")
+MANIFEST_NAMES = {"pyproject.toml", "setup.cfg", "environment.yml", "environment.yaml"}
+
+# Folders that never hold the project's own manifests
+EXCLUDED_DIRS = {"node_modules", "build", "dist", "site-packages", "__pycache__", "__pypackages__"}
+
+# Conda packages that are not Python dependencies
+CONDA_NON_PYTHON = {"python", "pip", "conda"}
+
+# Parsed manifests per project: {project path: (file signature, result)}
+_manifest_cache = {}
+
+# Extract the distribution name from one requirement specifier
+# e.g. "pandas[excel]>=2.0 ; python_version>'3.8'" -> "pandas", "pkg @ https://..." -> "pkg"
+def parse_requirement_name(spec):
+    spec = re.sub(r"(^|\s)#.*$", "", spec).strip()  # Comments need a space before "#", "#egg=" does not
+    if not spec:
+        return None
+
+    # Editable or direct URL installs only carry a name in "#egg=name"
+    if spec.startswith(("-e ", "--editable")) or "://" in spec.split("@")[0]:
+        match = re.search(r"#egg=([A-Za-z0-9._-]+)", spec)
+        return match.group(1) if match else None
+
+    if spec.startswith("-"):
+        return None  # Other pip options (--index-url, -c constraints, ...)
+
+    match = re.match(r"^([A-Za-z0-9][A-Za-z0-9._-]*)", spec)
+    return match.group(1) if match else None
+
+# Parse a requirements file, following nested "-r other.txt" includes
+def parse_requirements_file(path, _seen=None):
+    seen = _seen if _seen is not None else set()
+    path = os.path.abspath(path)
+    if path in seen or not os.path.isfile(path):
+        return set()
+    seen.add(path)
+
+    declared = set()
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+
+            include = re.match(r"^(-r|--requirement)[=\s]+(\S+)", line)
+            if include:
+                nested = os.path.join(os.path.dirname(path), include.group(2))
+                declared |= parse_requirements_file(nested, seen)
+                continue
+
+            name = parse_requirement_name(line)
+            if name:
+                declared.add(name)
+    return declared
+
+# Parse PEP 621, Poetry and PEP 735 dependency tables of a pyproject.toml
+def parse_pyproject(path):
+    try:
+        import tomllib
+    except ImportError:
+        return set()  # Python < 3.11
+
+    with open(path, "rb") as f:
+        try:
+            data = tomllib.load(f)
+        except tomllib.TOMLDecodeError:
+            return set()
+
+    specs = []
+    project = data.get("project", {})
+    specs += project.get("dependencies", [])
+    for group in project.get("optional-dependencies", {}).values():
+        specs += group
+    for group in data.get("dependency-groups", {}).values():
+        specs += [item for item in group if isinstance(item, str)]
+
+    declared = {name for name in map(parse_requirement_name, specs) if name}
+
+    poetry = data.get("tool", {}).get("poetry", {})
+    poetry_tables = [poetry.get("dependencies", {}), poetry.get("dev-dependencies", {})]
+    poetry_tables += [group.get("dependencies", {}) for group in poetry.get("group", {}).values()]
+    for table in poetry_tables:
+        declared.update(name for name in table if name.lower() != "python")
+
+    return declared
+
+# Parse install_requires and extras_require of a setup.cfg
+def parse_setup_cfg(path):
+    config = configparser.ConfigParser(interpolation=None)
+    try:
+        config.read(path, encoding="utf-8")
+    except configparser.Error:
+        return set()
+
+    specs = []
+    if config.has_option("options", "install_requires"):
+        specs += config.get("options", "install_requires").splitlines()
+    if config.has_section("options.extras_require"):
+        for _, value in config.items("options.extras_require"):
+            specs += value.splitlines()
+
+    return {name for name in map(parse_requirement_name, specs) if name}
+
+# Parse the conda and pip dependencies of an environment.yml
+# (a small indentation-based reader, so PyYAML is not required)
+def parse_environment_yml(path):
+    declared = set()
+    in_dependencies = False
+    pip_indent = None
+
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        for raw_line in f:
+            line = raw_line.split("#", 1)[0].rstrip()
+            if not line.strip():
+                continue
+            indent = len(line) - len(line.lstrip())
+            content = line.strip()
+
+            if indent == 0:
+                in_dependencies = content.startswith("dependencies:")
+                pip_indent = None
+                continue
+            if not in_dependencies or not content.startswith("-"):
+                continue
+
+            item = content[1:].strip().strip("'\"")
+            if pip_indent is not None and indent <= pip_indent:
+                pip_indent = None
+
+            if item.startswith("pip:"):
+                pip_indent = indent
+            elif pip_indent is not None:
+                name = parse_requirement_name(item)
+                if name:
+                    declared.add(name)
+            else:
+                # Conda spec: "channel::name=version=build"
+                name = re.split(r"[=<>!~\s\[]", item.split("::")[-1], 1)[0]
+                if name and name.lower() not in CONDA_NON_PYTHON:
+                    declared.add(name)
+    return declared
+
+# Find every dependency manifest in the project (monorepos may have several)
+def find_manifests(project_path):
+    manifests = []
+    for root, dirs, files in os.walk(project_path):
+        dirs[:] = [d for d in dirs if not d.startswith(".") and "venv" not in d and d not in EXCLUDED_DIRS]
+        for fname in sorted(files):
+            if fname in MANIFEST_NAMES or REQUIREMENTS_PATTERN.match(fname):
+                manifests.append(os.path.join(root, fname))
+    return manifests
+
+def parse_manifest(path):
+    fname = os.path.basename(path)
+    if fname == "pyproject.toml":
+        return parse_pyproject(path)
+    if fname == "setup.cfg":
+        return parse_setup_cfg(path)
+    if fname.startswith("environment."):
+        return parse_environment_yml(path)
+    return parse_requirements_file(path)
+
+def load_project_manifests(project_path="."):
+    """
+    Collects declared dependencies from all manifests in a project:
+    requirements*.txt (with nested -r includes), pyproject.toml, setup.cfg and environment.yml.
+
+    Parsed results are cached per project and reused until a manifest is added,
+    removed or modified.
+
+    Returns:
+        dict: {
+            "manifests": list of manifest paths that were read,
+            "declared": set of declared distribution names
+        }
+    """
+    manifests = find_manifests(project_path)
+    signature = []
+    for manifest in manifests:
+        try:
+            stat = os.stat(manifest)
+            signature.append((manifest, stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            continue
+    signature = tuple(signature)
+
+    cache_key = os.path.abspath(project_path)
+    cached = _manifest_cache.get(cache_key)
+    if cached and cached[0] == signature:
+        return {"manifests": list(cached[1]["manifests"]), "declared": set(cached[1]["declared"])}
+
+    declared = set()
+    for manifest, _, _ in signature:
+        try:
+            declared |= parse_manifest(manifest)
+        except (OSError, UnicodeDecodeError):
+            continue  # Unreadable manifest, keep going with the others
+
+    result = {"manifests": [manifest for manifest, _, _ in signature], "declared": declared}
+    _manifest_cache[cache_key] = (signature, result)
+    return {"manifests": list(result["manifests"]), "declared": set(declared)}
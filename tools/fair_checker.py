@@ -0,0 +1,255 @@
+import os
+import re
+import json
+import subprocess
+from urllib import request, error
+from tools.remote_cache import GITHUB_API_URL, PYPI_URL, get_or_fetch
+
+LICENSE_PATTERN = re.compile(r"^(licen[sc]e|copying)([.-].*)?$", re.IGNORECASE)
+CITATION_FILES = {"citation.cff", "codemeta.json", ".zenodo.json", "citation", "citation.bib", "citation.md"}
+README_PATTERN = re.compile(r"^readme(\..*)?$", re.IGNORECASE)
+
+# README badges that point to a software registry
+REGISTRY_BADGES = (
+    "badge.fury.io/py", "img.shields.io/pypi", "pypi.org/project",
+    "anaconda.org", "img.shields.io/conda", "ascl.net",
+    "research-software.nl", "research-software-directory", "bio.tools",
+)
+
+# README badges for a FAIR / best practices checklist
+CHECKLIST_BADGES = ("fair-software.eu", "bestpractices.coreinfrastructure.org", "bestpractices.dev")
+
+
+def _read_text(filepath):
+    try:
+        with open(filepath, "r", encoding="utf-8", errors="ignore") as f:
+            return f.read()
+    except OSError:
+        return ""
+
+
+def _package_metadata(root, filenames):
+    """Returns (package name, declared license) from pyproject.toml / setup.cfg / setup.py, if any."""
+    name = None
+    license_declared = False
+
+    if "pyproject.toml" in filenames:
+        try:
+            import tomllib
+            with open(os.path.join(root, "pyproject.toml"), "rb") as f:
+                data = tomllib.load(f)
+            project = data.get("project", {}) or data.get("tool", {}).get("poetry", {})
+            name = project.get("name")
+            license_declared = bool(project.get("license"))
+        except Exception:
+            pass
+
+    if "setup.cfg" in filenames and not name:
+        text = _read_text(os.path.join(root, "setup.cfg"))
+        match = re.search(r"^name\s*=\s*(\S+)", text, re.MULTILINE)
+        name = match.group(1) if match else None
+        license_declared = license_declared or bool(re.search(r"^license\s*=\s*\S", text, re.MULTILINE))
+
+    if "setup.py" in filenames and not name:
+        text = _read_text(os.path.join(root, "setup.py"))
+        match = re.search(r"name\s*=\s*['\"]([^'\"]+)['\"]", text)
+        name = match.group(1) if match else None
+        license_declared = license_declared or "license=" in text.replace(" ", "")
+
+    return name, license_declared
+
+
+def _fetch_json(url, timeout=10):
+    """
+    GETs a JSON document through the remote metadata cache.
+
+    Returns:
+        tuple: (HTTP status code or None if unreachable, parsed JSON body or None)
+    """
+    def fetch():
+        req = request.Request(url, headers={"Accept": "application/json", "User-Agent": "jupyter-quality-extension"})
+        try:
+            with request.urlopen(req, timeout=timeout) as response:
+                return [response.status, json.loads(response.read() or b"null")]
+        except error.HTTPError as e:
+            return [e.code, None]
+
+    try:
+        # Only 2xx responses are cached; errors and rate limits are asked again next time
+        status, data = get_or_fetch(url, fetch, is_success=lambda response: 200 <= response[0] < 300)
+    except (error.URLError, OSError, ValueError):
+        return None, None  # Offline: nothing is cached, try again next time
+    return status, data
+
+
+def check_local_fair(path):
+    """
+    Evaluates the fair-software.eu recommendations from the checked-out project tree only.
+
+    Returns:
+        dict: one entry per recommendation ("repository", "license", "registry",
+        "citation", "checklist"), each {"passed": bool, "detail": str}, plus "package_name".
+    """
+    root = path if os.path.isdir(path) else os.path.dirname(path) or "."
+    try:
+        filenames = set(os.listdir(root))
+    except OSError:
+        filenames = set()
+    lower_names = {name.lower(): name for name in filenames}
+
+    readme_text = "".join(_read_text(os.path.join(root, name)) for name in filenames if README_PATTERN.match(name))
+    package_name, license_in_metadata = _package_metadata(root, filenames)
+
+    # 1. Repository: a version-controlled project with a remote
+    # git itself finds the repository, so sub-folders, worktrees and submodules count too
+    remote = ""
+    try:
+        inside = subprocess.run(
+            ["git", "-C", root, "rev-parse", "--is-inside-work-tree"],
+            capture_output=True, text=True, check=False
+        )
+        if inside.returncode == 0 and inside.stdout.strip() == "true":
+            remote = subprocess.run(
+                ["git", "-C", root, "remote", "get-url", "origin"],
+                capture_output=True, text=True, check=False
+            ).stdout.strip()
+    except OSError:
+        pass
+    repository = {
+        "passed": bool(remote),
+        "detail": f"git remote: {remote}" if remote else "No git repository with an 'origin' remote found."
+    }
+
+    # 2. License file or license in package metadata
+    license_files = sorted(name for name in filenames if LICENSE_PATTERN.match(name))
+    license_check = {
+        "passed": bool(license_files) or license_in_metadata,
+        "detail": ", ".join(license_files) if license_files else
+                  ("License declared in package metadata." if license_in_metadata else "No license file found.")
+    }
+
+    # 3. Registry: installable package metadata or a registry badge
+    registry_badges = [badge for badge in REGISTRY_BADGES if badge in readme_text]
+    registry = {
+        "passed": bool(registry_badges),
+        "detail": f"Registry badge found ({registry_badges[0]})." if registry_badges else
+                  (f"Package metadata for '{package_name}' found, but no registry badge." if package_name
+                   else "No registry badge or package metadata found.")
+    }
+
+    # 4. Citation metadata
+    citation_files = sorted(lower_names[name] for name in CITATION_FILES if name in lower_names)
+    citation = {
+        "passed": bool(citation_files),
+        "detail": ", ".join(citation_files) if citation_files else "No CITATION.cff, codemeta.json or .zenodo.json found."
+    }
+
+    # 5. Checklist badge in the README
+    checklist_badges = [badge for badge in CHECKLIST_BADGES if badge in readme_text]
+    checklist = {
+        "passed": bool(checklist_badges),
+        "detail": f"Checklist badge found ({checklist_badges[0]})." if checklist_badges else "No FAIR / best practices checklist badge in the README."
+    }
+
+    return {
+        "repository": repository,
+        "license": license_check,
+        "registry": registry,
+        "citation": citation,
+        "checklist": checklist,
+        "package_name": package_name,
+    }
+
+
+def check_remote_fair(github_url, package_name=None):
+    """
+    Optional remote checks: is the GitHub repository public, and is the package on PyPI?
+    Answers come from a local cache when they are less than a day old.
+
+    Returns:
+        dict: {"repository": {...}, "registry": {...}}; a check is omitted when it could not be answered.
+    """
+    results = {}
+
+    match = re.search(r"github\.com[/:]([^/\s]+)/([^/\s#?]+?)(?:\.git)?/?$", github_url or "")
+    if match:
+        status, data = _fetch_json(f"{GITHUB_API_URL}/repos/{match.group(1)}/{match.group(2)}")
+        if status == 200 and isinstance(data, dict):
+            public = not data.get("private", False)
+            results["repository"] = {
+                "passed": public,
+                "detail": "Public GitHub repository." if public else "GitHub repository is private."
+            }
+        elif status == 404:
+            results["repository"] = {"passed": False, "detail": "GitHub repository not found or not public."}
+
+    if package_name:
+        status, _ = _fetch_json(f"{PYPI_URL}/pypi/{package_name}/json")
+        if status == 200:
+            results["registry"] = {"passed": True, "detail": f"'{package_name}' is published on PyPI."}
+
+    return results
+
+
+def run_fair_assessment(path, github_url=None):
+    """
+    Checks the project against the 5 fair-software.eu recommendations
+    (open repository, license, registry, citation, checklist badge).
+
+    All checks run locally on the checked-out tree. If a GitHub URL is given, repository
+    visibility and PyPI presence are also checked remotely (cached for a day); without
+    network access the local answers are kept.
+
+    Returns:
+        dict: {
+            "status": "pass" if at least 3 of 5 recommendations are met, else "fail",
+            "score": number of recommendations met,
+            "checks": per-recommendation results,
+            "message": styled HTML report
+        }
+    """
+    try:
+        checks = check_local_fair(path)
+        package_name = checks.pop("package_name")
+        if github_url:
+            checks.update(check_remote_fair(github_url, package_name))
+    except Exception as e:
+        return {
+            "status": "fail",
+            "message": f"Exception during FAIR assessment: {str(e)}"
+        }
+
+    score = sum(1 for check in checks.values() if check["passed"])
+    dots = " ".join("●" if check["passed"] else "○" for check in checks.values())
+
+    formatted_checks = "<div style='margin-left: 20px; font-size: 90%; color: gray;'>"
+    for position, (name, check) in enumerate(checks.items(), start=1):
+        icon = "✓" if check["passed"] else "×"
+        formatted_checks += (
+            f"<div style='font-family: monospace; white-space: pre;'>({position}/5) {name}: {icon} "
+            f"{check['detail'].replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')}</div>"
+        )
+    formatted_checks += f"<div style='font-family: monospace;'>Calculated compliance: {dots} ({score}/5)</div></div>"
+
+    styled_summary = (
+        "<div style='margin-left: 20px; color: gray; font-size: 90%;'>"
+        "<br><i>This FAIR assessment checks your repository against 5 best practices from "
+        "<a href='https://fair-software.eu/recommendations/checklist' target='_blank'>fair-software.eu</a>: "
+        "open repository, license file, registry presence (e.g., PyPI), citation metadata, and a FAIR checklist badge in the README.</i>"
+        "</div>"
+    )
+
+    styled_tip = (
+        "<div style='margin-left: 20px; color: gray; font-size: 90%;'>"
+        "<b>Tip:</b> To improve FAIR compliance, make sure your repository is public, includes a license, and optionally "
+        "adds a <code>CITATION.cff</code> file or publishes the software to a registry like PyPI. "
+        "Adding the FAIR checklist badge to your <code>README.md</code> shows commitment to good research software practices."
+        "</div>"
+    )
+
+    return {
+        "status": "pass" if score >= 3 else "fail",
+        "score": score,
+        "checks": checks,
+        "message": formatted_checks + styled_summary + styled_tip
+    }
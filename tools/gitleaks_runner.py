@@ -1,10 +1,57 @@
 import subprocess
 import os
 import json
+from tools.process_limits import ToolLimitExceeded, limit_exceeded_result, run_limited
 
-def run_gitleaks_secret_scan(path):
+def _git(root_path, *args):
+    """Runs a git command in root_path and returns the CompletedProcess (None if git is unavailable)."""
+    try:
+        return subprocess.run(["git", "-C", root_path, *args], capture_output=True, text=True, check=False)
+    except OSError:
+        return None
+
+def _load_scan_state(state_path):
+    try:
+        with open(state_path, "r") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+def _ref_tips(root_path):
+    """Returns the sorted commits (or tag objects) all refs and HEAD point to, or None outside a git repository."""
+    result = _git(root_path, "rev-parse", "--all", "HEAD")
+    if result is None or result.returncode != 0:
+        return None
+    return sorted(set(result.stdout.split()))
+
+def _existing_objects(root_path, objects):
+    """Returns the objects that are still in the repository (history may have been rewritten and pruned)."""
+    try:
+        result = subprocess.run(["git", "-C", root_path, "cat-file", "--batch-check"], input="\n".join(objects) + "\n",
+                                capture_output=True, text=True, check=False)
+    except OSError:
+        return []
+    return [line.split()[0] for line in result.stdout.splitlines() if line and not line.endswith(" missing")]
+
+def _merge_findings(previous, new):
+    """Combines stored and new findings, dropping duplicates by gitleaks fingerprint."""
+    merged = {}
+    for item in previous + new:
+        key = item.get("Fingerprint") or json.dumps(item, sort_keys=True)
+        merged[key] = item
+    return list(merged.values())
+
+def run_gitleaks_secret_scan(path, git_head=None, full=False):
     """
-    Runs Gitleaks on the current project directory (cwd).
+    Runs Gitleaks on the project directory.
+
+    In a git repository the tips of all refs at the last scan and its findings are stored in
+    gitleaks-report/scan_state.json. Later scans only pass the commits reachable from any ref
+    but not from those tips (`--all ^tip ...`) to gitleaks, so new commits on every branch are
+    covered, and merge their findings with the stored ones; if no ref moved, the stored
+    findings are reused without running gitleaks. `full=True` forces a scan of the complete
+    history, as does a stored tip that is no longer in the repository.
+
     Returns a dictionary formatted for display under "Project-Level Results".
     """
     try: 
@@ -15,74 +62,103 @@ def run_gitleaks_secret_scan(path):
         os.makedirs(report_dir, exist_ok=True)
 
         report_path = os.path.join(report_dir, "gitleaks_report.json")
+        state_path = os.path.join(report_dir, "scan_state.json")
 
-        # Run Gitleaks
-        result = subprocess.run(
-            ["gitleaks", "detect", "--source", root_path,
-             "--report-format", "json", "--report-path", report_path],
-            capture_output=True,
-            text=True,
-            check=False
-        )
-
-        # If gitleaks fails (not 0 or 1), return the error
-        if result.returncode not in [0, 1]:
-            return {
-                "status": "fail",
-                "message": f"Gitleaks execution error: {result.stderr.strip()}"
-            }
+        if git_head is None:
+            head_result = _git(root_path, "rev-parse", "HEAD")
+            git_head = head_result.stdout.strip() if head_result and head_result.returncode == 0 else None
 
-        # Load the report
-        if os.path.exists(report_path):
-            with open(report_path, "r") as f:
-                findings = json.load(f)
-
-            if findings:
-                
-                styled_summary = "<div style='margin-left: 20px; color: red;'>! Potential credentials found in the code:</div>"
-
-                styled_findings = ""
-                for item in findings:
-                    file = item.get("File", "")
-                    secret = item.get("RuleID", "Secret")
-                    line = item.get("Line", "?")
-                    styled_findings += f"<div style='margin-left: 20px; font-size: 90%; font-family: monospace;'>• {secret} in {file} (line {line})</div>"
-
-                styled_tip = (
-                    "<div style='margin-left: 20px; color: gray; font-size: 90%;'>" 
-                    "<b>Tip:</b> If any secrets were exposed, revoke and regenerate them immediately through your service provider. To prevent future leaks, avoid hardcoding credentials and store them in environment variables or separate config files excluded from version control."
-                    "</div>"
-                )
-                
-                legend = (
-                    "<div style='margin-left: 20px; color: gray; font-size: 90%;'>"
-                    "<i>Note: This scan checks for accidentally committed secrets such as API keys, tokens, and passwords. Keeping them out of code reduces risk and improves security practices.</i>"
-                    "</div>"
-                )
+        tips = _ref_tips(root_path) if git_head else None
+        state = _load_scan_state(state_path) if tips and not full else None
+        scanned_tips = state.get("ref_tips") if state else None
+
+        if scanned_tips and set(tips) <= set(scanned_tips):
+            # No ref points to a commit that was not covered by the last scan
+            findings = state.get("findings", [])
+
+        else:
+            command = ["gitleaks", "detect", "--source", root_path,
+                       "--report-format", "json", "--report-path", report_path]
+
+            # Only scan new commits if every earlier tip is still in the repository
+            incremental = bool(scanned_tips) and len(_existing_objects(root_path, scanned_tips)) == len(scanned_tips)
+            if incremental:
+                command.append("--log-opts=--all " + " ".join(f"^{tip}" for tip in scanned_tips))
+
+            # Run Gitleaks (stopped at its time limit)
+            try:
+                result = run_limited("gitleaks", command, text=True)
+            except ToolLimitExceeded as e:
+                return limit_exceeded_result(e)
 
+            # If gitleaks fails (not 0 or 1), return the error
+            if result.returncode not in [0, 1]:
                 return {
                     "status": "fail",
-                    # "message": "\n".join(messages) + styled_tip + legend
-                    "message": styled_summary + styled_findings + styled_tip + legend
+                    "message": f"Gitleaks execution error: {result.stderr.strip()}"
                 }
-            
-            else:
-
-                styled_note = "<div style='margin-left: 20px; color: gray; font-size: 90%;'><i>No secrets detected – your code is clean and safe.</i></div>"
-                styled_tip = "<div style='margin-left: 20px; color: gray; font-size: 90%;'><b>Tip:</b> Keep sensitive keys, tokens, and credentials out of your codebase. Use environment variables or secret managers for secure handling.</div>"
-                legend = "<div style='margin-left: 20px; color: gray; font-size: 90%;'><i>Note: Gitleaks scans for hardcoded secrets like API keys, credentials, and tokens across your repository history.</i></div>"
-                styled_summary = "<div style='margin-left: 20px;'>✓ No leaked credentials found.</div>"
 
+            if not os.path.exists(report_path):
                 return {
-                    "status": "pass",
-                    # "message": "✓ No leaked credentials found." + styled_note + styled_tip + legend
-                    "message": styled_summary + styled_note + styled_tip + legend
+                    "status": "fail",
+                    "message": "No Gitleaks report was generated."
                 }
 
-        return {
-            "status": "fail",
-            "message": "No Gitleaks report was generated."
-        }
+            # Load the report
+            with open(report_path, "r") as f:
+                findings = json.load(f) or []
+
+            if tips:
+                if incremental:
+                    findings = _merge_findings(state.get("findings", []), findings)
+                    # Keep the report file complete, not just the new range
+                    with open(report_path, "w") as f:
+                        json.dump(findings, f, indent=1)
+
+                with open(state_path, "w") as f:
+                    json.dump({"last_commit": git_head, "ref_tips": tips, "findings": findings}, f)
+
+        if findings:
+            
+            styled_summary = "<div style='margin-left: 20px; color: red;'>! Potential credentials found in the code:</div>"
+
+            styled_findings = ""
+            for item in findings:
+                file = item.get("File", "")
+                secret = item.get("RuleID", "Secret")
+                line = item.get("StartLine", item.get("Line", "?"))
+                styled_findings += f"<div style='margin-left: 20px; font-size: 90%; font-family: monospace;'>• {secret} in {file} (line {line})</div>"
+
+            styled_tip = (
+                "<div style='margin-left: 20px; color: gray; font-size: 90%;'>" 
+                "<b>Tip:</b> If any secrets were exposed, revoke and regenerate them immediately through your service provider. To prevent future leaks, avoid hardcoding credentials and store them in environment variables or separate config files excluded from version control."
+                "</div>"
+            )
+            
+            legend = (
+                "<div style='margin-left: 20px; color: gray; font-size: 90%;'>"
+                "<i>Note: This scan checks for accidentally committed secrets such as API keys, tokens, and passwords. Keeping them out of code reduces risk and improves security practices.</i>"
+                "</div>"
+            )
+
+            return {
+                "status": "fail",
+                # "message": "\n".join(messages) + styled_tip + legend
+                "message": styled_summary + styled_findings + styled_tip + legend
+            }
+        
+        else:
+
+            styled_note = "<div style='margin-left: 20px; color: gray; font-size: 90%;'><i>No secrets detected – your code is clean and safe.</i></div>"
+            styled_tip = "<div style='margin-left: 20px; color: gray; font-size: 90%;'><b>Tip:</b> Keep sensitive keys, tokens, and credentials out of your codebase. Use environment variables or secret managers for secure handling.</div>"
+            legend = "<div style='margin-left: 20px; color: gray; font-size: 90%;'><i>Note: Gitleaks scans for hardcoded secrets like API keys, credentials, and tokens across your repository history.</i></div>"
+            styled_summary = "<div style='margin-left: 20px;'>✓ No leaked credentials found.</div>"
+
+            return {
+                "status": "pass",
+                # "message": "✓ No leaked credentials found." + styled_note + styled_tip + legend
+                "message": styled_summary + styled_note + styled_tip + legend
+            }
 
     except Exception as e:
         return {
@@ -1,6 +1,10 @@
 import os
 import subprocess
 import json
+from tools.process_limits import ToolLimitExceeded, limit_exceeded_result, run_limited
+
+# Shortest duplicated block reported, unless the scan profile chooses another (lifecycle/scan_profiles.py)
+DEFAULT_MIN_LINES = 5
 
 def get_filtered_python_files(root_path):
     """
@@ -22,18 +26,21 @@ def get_filtered_python_files(root_path):
                 py_files.append(os.path.join(dirpath, file))
     return py_files
 
-def run_jscpd_code_duplication(path):
+def run_jscpd_code_duplication(path, min_lines=None, excluded_files=None):
     """
     Runs jscpd on the given path (file or folder) to detect code duplication.
     Parses the JSON report and returns duplication percentage. 
 
     Args:
         path (str): Path to a Python file or folder. 
+        min_lines (int): shortest block reported as a duplicate (defaults to DEFAULT_MIN_LINES).
+        excluded_files (list): large, generated or minified files that are not compared.
 
     Returns:
         dict: {
             'status': 'pass' or 'fail',
             'percentage': float,
+            'clones': duplicated spans [{'file', 'start', 'end'}],
             'message': str
         }
     """
@@ -54,7 +61,10 @@ def run_jscpd_code_duplication(path):
 
     try:
 
+        excluded = {os.path.abspath(f) for f in excluded_files or []}
         files_to_scan = get_filtered_python_files(path)
+        skipped = [f for f in files_to_scan if os.path.abspath(f) in excluded]
+        files_to_scan = [f for f in files_to_scan if os.path.abspath(f) not in excluded]
         if not files_to_scan:
             return {
                 "status": "pass",
@@ -62,17 +72,16 @@ def run_jscpd_code_duplication(path):
             }
 
         # Step 3: Run jscpd using subprocess
-        subprocess.run(
+        run_limited(
+            "jscpd",
             [
                 "jscpd",
-                "--min-lines", "5",              # Minimum lines to consider duplication
+                "--min-lines", str(min_lines or DEFAULT_MIN_LINES),  # Minimum lines to consider duplication
                 "--reporters", "json",           # Output format
                 "--output", output_dir,          # Output directory
                 *files_to_scan                   # File or folder to scan
             ],
             check=True,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
             text=True
         )
 
@@ -93,6 +102,13 @@ def run_jscpd_code_duplication(path):
         duplicated = stats.get("duplicatedLines", 0)
         total = stats.get("lines", 0)
 
+        # Both sides of every clone, so duplicated code can be attributed to functions (e.g. for technical debt)
+        clones = [
+            {"file": side.get("name"), "start": side.get("start"), "end": side.get("end")}
+            for duplicate in data.get("duplicates", [])
+            for side in (duplicate.get("firstFile", {}), duplicate.get("secondFile", {}))
+        ]
+
         # Step 7: Calculate percentage duplicated
         percentage = (duplicated / total * 100) if total > 0 else 0
 
@@ -117,6 +133,11 @@ def run_jscpd_code_duplication(path):
             "<i>Note: A duplication rate under 5% is considered good. Over 15% is typically problematic in maintainability.</i>"
             "</div>"
         )
+        if skipped:
+            legend += (
+                "<div style='margin-left: 20px; color: gray; font-size: 90%;'>"
+                f"<i>{len(skipped)} large, generated or minified file(s) were not compared (see their File Classification).</i></div>"
+            )
 
         styled_topline = (
             f"<div style='margin-left: 20px; font-size: 100%;'>"
@@ -131,9 +152,13 @@ def run_jscpd_code_duplication(path):
             "percentage": percentage,
             "duplicated_lines": duplicated,
             "total_lines": total,
+            "clones": clones,
             "message": message
         }
     
+    except ToolLimitExceeded as e:
+        return limit_exceeded_result(e)
+
     except subprocess.CalledProcessError as e:
         return {
             "status": "fail",
@@ -1,34 +1,125 @@
 import os
-import nbformat
+import re
+import json
+import mmap
+
+# A line of code: optional leading whitespace, then anything except a comment.
+# Scanning raw bytes avoids decoding files and looping over lines in Python.
+CODE_LINE_BYTES = re.compile(rb"^[ \t\r\x0b\x0c]*[^\s#]", re.MULTILINE)
+CODE_LINE_TEXT = re.compile(r"^[^\S\n]*[^\s#]", re.MULTILINE)
 
 def count_python_loc(filepath):
     """Count non-blank, non-comment lines in a .py file"""
-    count = 0
-    with open(filepath, "r", encoding="utf-8", errors="ignore") as f:
-        for line in f:
-            stripped = line.strip()
-            if stripped and not stripped.startswith("#"):
-                count += 1
-    return count
+    with open(filepath, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return 0  # mmap cannot map empty files
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return sum(1 for _ in CODE_LINE_BYTES.finditer(data))
+
+def iter_notebook_parts(filepath, chunk_size=1024 * 1024):
+    """
+    Yields the parts of a .ipynb notebook: ("cell", cell) for each cell, in order,
+    and (key, value) for the other top-level entries (metadata, nbformat, ...).
+
+    The file is read in chunks of `chunk_size` characters and only the top-level JSON
+    object is walked by hand: each cell is decoded on its own and dropped after use, so
+    memory holds one cell plus a read chunk, never the whole notebook text or the parsed
+    outputs of all cells. nbformat validation is skipped.
+    """
+    decoder = json.JSONDecoder()
+    whitespace = re.compile(r"\s*")
+
+    with open(filepath, "r", encoding="utf-8") as f:
+        buffer = ""
+        pos = 0
+        at_end = False
+
+        def read_more(size):
+            # Drops the consumed text, so the buffer only ever holds the value being decoded
+            nonlocal buffer, pos, at_end
+            data = f.read(max(size, chunk_size))
+            at_end = not data
+            buffer = buffer[pos:] + data
+            pos = 0
+
+        def peek():
+            nonlocal pos
+            pos = whitespace.match(buffer, pos).end()
+            while pos == len(buffer) and not at_end:
+                read_more(0)
+                pos = whitespace.match(buffer, pos).end()
+            if pos == len(buffer):
+                raise ValueError("Unexpected end of notebook JSON")
+            return buffer[pos]
+
+        def expect(char):
+            nonlocal pos
+            if peek() != char:
+                raise ValueError(f"Malformed notebook JSON, expected {char!r}")
+            pos += 1
+
+        def decode():
+            nonlocal pos
+            peek()
+            while True:
+                try:
+                    value, end = decoder.raw_decode(buffer, pos)
+                    # A value is always followed by "," or "}" / "]"; a number at the end
+                    # of the buffer may continue in the next chunk
+                    if end < len(buffer) or at_end:
+                        pos = end
+                        return value
+                except json.JSONDecodeError:
+                    if at_end:
+                        raise
+                # Doubles the buffered text, so a large cell is re-decoded only a few times
+                read_more(len(buffer) - pos)
+
+        expect("{")
+        while peek() != "}":
+            key = decode()
+            expect(":")
+
+            if key != "cells":
+                yield key, decode()
+            else:
+                expect("[")
+                while peek() != "]":
+                    yield "cell", decode()
+                    if peek() == ",":
+                        expect(",")
+                expect("]")
+
+            if peek() == ",":
+                expect(",")
+
+def iter_notebook_code_cells(filepath):
+    """Yields the source of each code cell in a .ipynb notebook, one cell at a time."""
+    for key, cell in iter_notebook_parts(filepath):
+        if key == "cell" and cell.get("cell_type") == "code":
+            source = cell.get("source", "")
+            yield "".join(source) if isinstance(source, list) else source
 
 def count_notebook_loc(filepath):
     """Count non-blank, non-comment lines in code cells of a .ipynb notebook"""
-    count = 0
-    with open(filepath, "r", encoding="utf-8") as f:
-        nb = nbformat.read(f, as_version=4)
-        for cell in nb.cells:
-            if cell.cell_type == "code":
-                lines = cell.source.splitlines()
-                for line in lines:
-                    stripped = line.strip()
-                    if stripped and not stripped.startswith("#"):
-                        count += 1
-    return count
-
-def run_project_loc(path):
+    return sum(len(CODE_LINE_TEXT.findall(source)) for source in iter_notebook_code_cells(filepath))
+
+def run_project_loc(path, excluded_files=None):
+    """
+    Counts lines of code in all .py files and notebook code cells under `path`.
+
+    Besides the total, the result lists the LoC of every counted file ("files")
+    and the cumulative LoC of every directory ("directories"), collected during
+    the same walk. `excluded_files` (large, generated or minified files) are not counted.
+    """
     #root_dir = os.getcwd()
-    root_dir = path 
+    # Normalized, so the rollup below stops at the root (e.g. for "project/")
+    root_dir = os.path.normpath(path)
+    excluded = {os.path.abspath(f) for f in excluded_files or []}
+    skipped = 0
     total_loc = 0
+    file_loc = {}
+    directory_loc = {}
     excluded_dirs = {
         "venv", "__pycache__", ".ipynb_checkpoints", ".git",
         "bandit-report", "gitleaks-report", "jscpd-report"
@@ -36,15 +127,33 @@ def run_project_loc(path):
 
     for dirpath, dirnames, filenames in os.walk(root_dir):
         dirnames[:] = [d for d in dirnames if d not in excluded_dirs]
+        directory_total = 0
         for filename in filenames:
             file_path = os.path.join(dirpath, filename)
+            if os.path.abspath(file_path) in excluded:
+                skipped += 1
+                continue
             try:
                 if filename.endswith(".py"):
-                    total_loc += count_python_loc(file_path)
+                    loc = count_python_loc(file_path)
                 elif filename.endswith(".ipynb"):
-                    total_loc += count_notebook_loc(file_path)
+                    loc = count_notebook_loc(file_path)
+                else:
+                    continue
             except Exception:
                 continue
+            file_loc[file_path] = loc
+            directory_total += loc
+
+        total_loc += directory_total
+
+        # Add this directory's own lines to it and all of its parents up to the root
+        directory = dirpath
+        while True:
+            directory_loc[directory] = directory_loc.get(directory, 0) + directory_total
+            if directory == root_dir or not directory:
+                break
+            directory = os.path.dirname(directory)
 
     if total_loc < 1000:
         summary = "Small project size."
@@ -71,7 +180,8 @@ def run_project_loc(path):
         "<div style='margin-left: 20px; color: gray; font-size: 90%;'><i>"
         "Note: Only non-empty, non-comment lines in .py and .ipynb code cells are counted. "
         "Folders like <code>venv</code> or <code>__pycache__</code> are excluded."
-        "</i></div>"
+        + (f" {skipped} large, generated or minified file(s) were not counted (see their File Classification)." if skipped else "")
+        + "</i></div>"
     )
     styled_loc = f"<div style='margin-left: 20px; color: black; font-size: 100%;'>{total_loc} lines of code in the project</div>"
     message = f"{styled_loc}{styled_summary}{styled_tip}{styled_note}"
@@ -79,5 +189,7 @@ def run_project_loc(path):
     return {
         "status": "pass",
         "loc": total_loc,
+        "files": file_loc,
+        "directories": directory_loc,
         "message": message
     }
\ No newline at end of file
@@ -0,0 +1,181 @@
+import os
+import sys
+import errno
+import shutil
+import signal
+import subprocess
+
+# Wall-time (seconds) and memory (MB) limits for each external tool.
+# One pathological file must not keep a shared scan node busy for an hour or use up its RAM.
+#
+# Memory is capped with RLIMIT_AS (address space) in the child process; Linux does not
+# enforce RLIMIT_RSS. Node (jscpd) and Go (gitleaks) reserve large virtual ranges at
+# start-up, so they only get a wall-time limit by default.
+#
+# Override per tool with environment variables, e.g. QUALITY_LIMIT_PYLINT_TIMEOUT=600
+# or QUALITY_LIMIT_RADON_MEMORY_MB=512 (0 disables a limit), or with `set_tool_limits`.
+DEFAULT_LIMITS = {
+    "pylint": {"timeout": 300, "memory_mb": 2048},
+    "radon": {"timeout": 120, "memory_mb": 1024},
+    "bandit": {"timeout": 900, "memory_mb": 2048},
+    "jscpd": {"timeout": 900, "memory_mb": None},
+    "gitleaks": {"timeout": 1800, "memory_mb": None},
+    "pytest": {"timeout": 1800, "memory_mb": 4096},
+    "reproducibility": {"timeout": 300, "memory_mb": None},  # timeout per notebook cell
+    "notebook": {"timeout": 1800, "memory_mb": None},  # timeout per re-executed notebook, all cells together
+}
+
+_overrides = {}
+
+# Last stderr line of a child that died of running out of memory (Python, Node, Go, C)
+OOM_MARKERS = ("MemoryError", "out of memory", "Cannot allocate memory", "std::bad_alloc")
+
+# Exit codes a tool uses when it crashes (e.g. an uncaught exception), as opposed to
+# reporting findings or failed tests. Only these, with an out-of-memory error as the last
+# stderr line, count as running out of memory; so does any death by a signal.
+CRASH_EXIT_CODES = {
+    "pylint": {1},      # 1 is also pylint's "fatal message" bit, which a crash sets
+    "radon": {1},
+    "bandit": {1, 2},   # 1 also means "issues found"; the last stderr line tells a crash apart
+    "pytest": {3},      # internal error; 1 only means that tests failed
+}
+
+# Launcher that caps the address space and then replaces itself with the tool. The limit is set
+# in a fresh single-threaded interpreter instead of a preexec_fn, which may deadlock when
+# run_limited is called from several threads (e.g. the pytest shards).
+_MEMORY_LIMIT_LAUNCHER = (
+    "import os, resource, sys; limit = int(sys.argv[1]); "
+    "resource.setrlimit(resource.RLIMIT_AS, (limit, limit)); os.execv(sys.argv[2], sys.argv[2:])"
+)
+
+
+class ToolLimitExceeded(Exception):
+    """Raised when a tool runs longer or uses more memory than its limit."""
+
+    def __init__(self, tool, kind, limit):
+        self.tool = tool
+        self.kind = kind  # "timeout" or "oom"
+        self.limit = limit
+        unit = "s" if kind == "timeout" else " MB"
+        super().__init__(f"{tool} exceeded its {'time' if kind == 'timeout' else 'memory'} limit ({limit}{unit})")
+
+
+def get_tool_limits(tool):
+    """Returns {"timeout": seconds or None, "memory_mb": MB or None} for a tool."""
+    limits = dict(DEFAULT_LIMITS.get(tool, {"timeout": None, "memory_mb": None}))
+    limits.update(_overrides.get(tool, {}))
+
+    for name in ("timeout", "memory_mb"):
+        value = os.environ.get(f"QUALITY_LIMIT_{tool.upper()}_{name.upper()}")
+        if value:
+            try:
+                limits[name] = int(value)
+            except ValueError:
+                pass
+        if not limits.get(name):
+            limits[name] = None
+    return limits
+
+
+def set_tool_limits(tool, timeout=None, memory_mb=None):
+    """Overrides a tool's limits for the rest of the process (None keeps the current value, 0 disables)."""
+    override = _overrides.setdefault(tool, {})
+    if timeout is not None:
+        override["timeout"] = timeout
+    if memory_mb is not None:
+        override["memory_mb"] = memory_mb
+
+
+def _with_memory_limit(command, memory_mb, cwd=None):
+    """Prefixes `command` with the launcher that caps the child's address space at `memory_mb`."""
+    executable = command[0]
+    if os.sep not in executable:
+        executable = shutil.which(executable)
+        if executable is None:
+            # Same error as Popen, so callers can still report a missing tool
+            raise FileNotFoundError(errno.ENOENT, os.strerror(errno.ENOENT), command[0])
+    elif cwd and not os.path.isabs(executable):
+        executable = os.path.join(cwd, executable)
+    return [sys.executable, "-c", _MEMORY_LIMIT_LAUNCHER, str(memory_mb * 1024 * 1024), executable, *command[1:]]
+
+
+def _died_of_oom(tool, returncode, stderr):
+    """True if the child was killed by a signal, or crashed with an out-of-memory error as its last words."""
+    if returncode < 0:
+        return True
+    if returncode not in CRASH_EXIT_CODES.get(tool, ()):
+        return False
+    if isinstance(stderr, bytes):
+        stderr = stderr.decode(errors="ignore")
+    lines = [line.strip() for line in (stderr or "").splitlines() if line.strip()]
+    return bool(lines) and any(marker in lines[-1] for marker in OOM_MARKERS)
+
+
+def run_limited(tool, command, check=False, **kwargs):
+    """
+    Runs an external tool like `subprocess.run(..., capture_output=True)`, within the tool's limits.
+
+    The child runs in its own process group, so on timeout the tool and anything it
+    started are killed together. A memory limit is set by a small launcher process,
+    so run_limited may be called from several threads at once.
+
+    Args:
+        tool (str): tool name, used to look up limits (see DEFAULT_LIMITS).
+        command (list): command line.
+        check (bool): raise CalledProcessError on a non-zero exit code, like `subprocess.run`.
+        **kwargs: passed to `subprocess.Popen` (e.g. text=True, stderr=subprocess.STDOUT).
+
+    Returns:
+        subprocess.CompletedProcess
+
+    Raises:
+        ToolLimitExceeded: if the tool timed out or ran out of memory.
+    """
+    limits = get_tool_limits(tool)
+    kwargs.setdefault("stdout", subprocess.PIPE)
+    kwargs.setdefault("stderr", subprocess.PIPE)
+
+    launched = command
+    if limits["memory_mb"] and os.name == "posix":
+        launched = _with_memory_limit(command, limits["memory_mb"], kwargs.get("cwd"))
+
+    with subprocess.Popen(launched, start_new_session=(os.name == "posix"), **kwargs) as process:
+        try:
+            stdout, stderr = process.communicate(timeout=limits["timeout"])
+        except subprocess.TimeoutExpired:
+            if os.name == "posix":
+                try:
+                    os.killpg(process.pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+            else:
+                process.kill()
+            process.communicate()
+            raise ToolLimitExceeded(tool, "timeout", limits["timeout"])
+
+    if limits["memory_mb"] and process.returncode != 0 and _died_of_oom(tool, process.returncode, stderr):
+        raise ToolLimitExceeded(tool, "oom", limits["memory_mb"])
+
+    if check and process.returncode != 0:
+        raise subprocess.CalledProcessError(process.returncode, command, output=stdout, stderr=stderr)
+
+    return subprocess.CompletedProcess(command, process.returncode, stdout, stderr)
+
+
+def limit_exceeded_result(error):
+    """Builds the result of a tool that was stopped by its limits ("timeout" or "oom" status)."""
+    if error.kind == "timeout":
+        explanation = f"{error.tool} did not finish within {error.limit} seconds and was stopped."
+    else:
+        explanation = f"{error.tool} ran out of memory (limit {error.limit} MB) and was stopped."
+
+    return {
+        "status": error.kind,
+        "limit": error.limit,
+        "message": (
+            f"<div style='margin-left: 20px; color: red;'>✗ {explanation}</div>"
+            "<div style='margin-left: 20px; color: gray; font-size: 90%;'>"
+            f"<i>Note: Limits can be raised with QUALITY_LIMIT_{error.tool.upper()}_TIMEOUT or "
+            f"QUALITY_LIMIT_{error.tool.upper()}_MEMORY_MB. Very large or generated files are the usual cause.</i></div>"
+        )
+    }
@@ -1,69 +1,217 @@
-import subprocess  
-import os  
+import os
+import sys
+import json
+import tempfile
+from tools.process_limits import ToolLimitExceeded, limit_exceeded_result, run_limited
 
-def run_pylint_code_smell(filepath):
+# When True, pylint runs inside the current interpreter instead of a subprocess.
+# The scan service turns this on so astroid's inference cache stays warm between scans.
+IN_PROCESS = False
+
+# When True, every result gets "checker_times": seconds spent in each pylint checker.
+# Use it to find the few checkers that dominate the runtime, then disable them below.
+PROFILE_CHECKERS = os.environ.get("QUALITY_PYLINT_PROFILE") == "1"
+
+# Checkers or messages to switch off, e.g. QUALITY_PYLINT_DISABLE="similarities,design"
+DISABLED_CHECKERS = [name.strip() for name in os.environ.get("QUALITY_PYLINT_DISABLE", "").split(",") if name.strip()]
+
+TIMING_PLUGIN = "tools.pylint_timing_plugin"
+
+# Checkers used unless the scan profile chooses others (lifecycle/scan_profiles.py)
+DEFAULT_OPTIONS = ['--disable=all', '--enable=C,R,W']
+
+# Root of this package, so the pylint subprocess can import the timing plugin
+PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def enable_in_process_pylint():
+    """Run pylint in-process for all following scans (used by the long-running scan service)."""
+    global IN_PROCESS
+    IN_PROCESS = True
+
+def enable_checker_profile():
+    """Record per-checker timings in all following pylint results."""
+    global PROFILE_CHECKERS
+    PROFILE_CHECKERS = True
+
+def _run_pylint(filepath, options):
+    """
+    Runs pylint on one file with the JSON reporter ("json2").
+
+    In-process runs keep astroid's module cache between calls, but drop entries for
+    project files afterwards so edited files are re-read on the next scan. Only
+    standard library and installed packages stay cached.
+
+    Subprocess runs are stopped at the "pylint" time and memory limits (tools/process_limits.py);
+    in-process runs are not limited.
+
+    Returns:
+        tuple: (JSON report text, exit code, {checker: seconds} or None)
+    """
+    if PROFILE_CHECKERS:
+        options = [*options, f"--load-plugins={TIMING_PLUGIN}"]
+
+    if not IN_PROCESS:
+        env = dict(os.environ)
+        timings_path = None
+        if PROFILE_CHECKERS:
+            env["PYTHONPATH"] = os.pathsep.join(filter(None, [PACKAGE_ROOT, env.get("PYTHONPATH")]))
+            fd, timings_path = tempfile.mkstemp(prefix="pylint-timings-", suffix=".json")
+            os.close(fd)
+            env["QUALITY_PYLINT_TIMINGS_FILE"] = timings_path
+
+        try:
+            result = run_limited(
+                "pylint",
+                ['pylint', filepath, '--output-format=json2', *options],
+                text=True,
+                env=env
+            )
+            timings = None
+            if timings_path:
+                try:
+                    with open(timings_path, "r", encoding="utf-8") as f:
+                        timings = json.load(f)
+                except (OSError, json.JSONDecodeError):
+                    timings = None
+            return result.stdout or result.stderr, result.returncode, timings
+        finally:
+            if timings_path and os.path.exists(timings_path):
+                os.remove(timings_path)
+
+    from io import StringIO
+    from astroid import MANAGER
+    from pylint.lint import Run
+    from pylint.reporters.json_reporter import JSON2Reporter
+
+    timings = None
+    if PROFILE_CHECKERS:
+        if PACKAGE_ROOT not in sys.path:
+            sys.path.insert(0, PACKAGE_ROOT)
+        from tools import pylint_timing_plugin
+        pylint_timing_plugin.TIMINGS.clear()
+
+    buffer = StringIO()
+    run = Run([filepath, *options], reporter=JSON2Reporter(buffer), exit=False)
+
+    if PROFILE_CHECKERS:
+        timings = dict(pylint_timing_plugin.TIMINGS)
+
+    installed_prefixes = tuple({sys.prefix, sys.base_prefix, sys.exec_prefix})
+    for name, module in list(MANAGER.astroid_cache.items()):
+        module_file = getattr(module, "file", None)
+        if module_file and os.path.isabs(module_file) and not module_file.startswith(installed_prefixes):
+            del MANAGER.astroid_cache[name]
+
+    return buffer.getvalue(), run.linter.msg_status, timings
+
+def parse_pylint_report(output):
+    """
+    Parses a "json2" pylint report.
+
+    Returns:
+        tuple: (issues, statistics), where every issue is a dict with "line", "column",
+        "end_line", "end_column", "code" (message id, e.g. C0301), "symbol" (e.g. line-too-long),
+        "category" (convention, refactor, warning, error, fatal), "object" and "text";
+        statistics holds "score" and "messageTypeCount".
+
+    Raises:
+        ValueError: if the output is not a pylint JSON report.
+    """
+    report = json.loads(output)
+    issues = [
+        {
+            "line": message.get("line"),
+            "column": message.get("column"),
+            "end_line": message.get("endLine"),
+            "end_column": message.get("endColumn"),
+            "code": message.get("messageId"),
+            "symbol": message.get("symbol"),
+            "category": message.get("type"),
+            "object": message.get("obj"),
+            "text": message.get("message"),
+        }
+        for message in report.get("messages", [])
+    ]
+    return issues, report.get("statistics", {})
+
+def run_pylint_code_smell(filepath, options=None):
     """
     Runs pylint on the specified Python file to detect code smells,
     and formats each issue line-by-line for better display.
 
     Args:
         filepath (str): The path to the Python file to analyze.
+        options (list): pylint options selecting the checkers (defaults to DEFAULT_OPTIONS).
 
     Returns:
         dict: {
             'status': 'pass' or 'fail',
-            'message': list of individual warnings or single summary
+            'score': pylint score out of 10,
+            'message': styled list of warnings or single summary,
+            'issues': structured messages (see `parse_pylint_report`),
+            'checker_times': seconds per checker (only when checker profiling is on)
         }
     """
     if not os.path.isfile(filepath):
         return {
             "status": "fail",
-            "message": [f"File not found: {filepath}"]
+            "message": f"File not found: {filepath}"
         }
 
-    try:
-        output = subprocess.check_output(
-            ['pylint', filepath, '-f', 'text', '--disable=all', '--enable=C,R,W'],
-            stderr=subprocess.STDOUT,
-            text=True
-        )
+    options = list(options or DEFAULT_OPTIONS)
+    if DISABLED_CHECKERS:
+        options.append(f"--disable={','.join(DISABLED_CHECKERS)}")
 
-        lines = [line.strip() for line in output.strip().split('\n') if line.strip()]
-        messages = [line for line in lines if ':' in line]
+    try:
+        output, returncode, timings = _run_pylint(filepath, options)
+    except ToolLimitExceeded as e:
+        return limit_exceeded_result(e)
 
+    try:
+        issues, statistics = parse_pylint_report(output)
+    except ValueError:
+        # No JSON report: pylint itself failed (bad option, crash)
         return {
-            "status": "fail" if messages else "pass",
-            "message": messages if messages else ["No major code smells found."]
+            "status": "fail",
+            "message": f"Pylint error (exit code {returncode}): {output.strip()[:500]}"
         }
 
-    except subprocess.CalledProcessError as e:
-        lines = [line.strip() for line in e.output.strip().split('\n') if line.strip()]
-        messages = [line for line in lines if ':' in line]
+    score = statistics.get("score")
+    styled_score = (
+        f"<div style='margin-left: 20px;'>Your code has been rated at {score:.2f}/10</div>"
+        if score is not None else ""
+    )
 
-        if messages:
-            formatted_lines = "".join(
-                f"<div style='margin-left: 20px; color: gray; font-size: 90%;'>{msg}</div>" for msg in messages
-            )
+    result = {
+        "status": "fail" if issues else "pass",
+        "score": score,
+        "issues": issues
+    }
+    if timings is not None:
+        result["checker_times"] = dict(sorted(timings.items(), key=lambda item: -item[1]))
 
-            styled_tip = (
-                "<div style='margin-left: 20px; color: gray; font-size: 90%;'>"
-                "<b>Tip:</b> Address warnings such as long lines, missing docstrings, or unused imports to improve clarity and maintainability."
-                "</div>"
-            )
+    if issues:
+        formatted_lines = "".join(
+            "<div style='margin-left: 20px; color: gray; font-size: 90%;'>"
+            f"{filepath}:{issue['line']}:{issue['column']}: {issue['code']}: {issue['text']} ({issue['symbol']})</div>"
+            for issue in issues
+        )
 
-            styled_reference = (
-                "<div style='margin-left: 20px; color: gray; font-size: 90%;'>"
-                "See <a href='https://pylint.pycqa.org/en/latest/user_guide/messages/messages_overview.html' target='_blank'>"
-                "Pylint Message Reference</a> for help understanding and fixing issues."
-                "</div>"
-            )
+        styled_tip = (
+            "<div style='margin-left: 20px; color: gray; font-size: 90%;'>"
+            "<b>Tip:</b> Address warnings such as long lines, missing docstrings, or unused imports to improve clarity and maintainability."
+            "</div>"
+        )
+
+        styled_reference = (
+            "<div style='margin-left: 20px; color: gray; font-size: 90%;'>"
+            "See <a href='https://pylint.pycqa.org/en/latest/user_guide/messages/messages_overview.html' target='_blank'>"
+            "Pylint Message Reference</a> for help understanding and fixing issues."
+            "</div>"
+        )
+
+        result["message"] = styled_score + formatted_lines + styled_tip + styled_reference
+    else:
+        result["message"] = styled_score + "<div style='margin-left: 20px; color: gray; font-size: 90%;'>No major code smells found.</div>"
 
-            return {
-                "status": "fail",
-                "message": formatted_lines + styled_tip + styled_reference
-            }
-        else:
-            return {
-                "status": "pass",
-                "message": "<div style='margin-left: 20px; color: gray; font-size: 90%;'>No major code smells found.</div>"
-            }
+    return result
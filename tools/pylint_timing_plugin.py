@@ -0,0 +1,56 @@
+import os
+import json
+import time
+import atexit
+import functools
+
+# Pylint plugin that measures how long each checker takes.
+#
+# Loaded with --load-plugins=tools.pylint_timing_plugin. Once pylint has loaded its
+# configuration, every checker's visit_*/leave_* callbacks and raw/token hooks are
+# wrapped with a timer. Times are summed per checker in TIMINGS (in-process runs read
+# it directly) and, if QUALITY_PYLINT_TIMINGS_FILE is set, written there as JSON when
+# pylint exits (subprocess runs).
+
+TIMINGS_FILE_ENV = "QUALITY_PYLINT_TIMINGS_FILE"
+
+TIMED_PREFIXES = ("visit_", "leave_")
+TIMED_METHODS = ("open", "close", "process_module", "process_tokens")
+
+TIMINGS = {}
+
+
+def _timed(checker_name, method):
+    @functools.wraps(method)  # keeps the checks_msgs marker pylint uses to skip disabled callbacks
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            TIMINGS[checker_name] = TIMINGS.get(checker_name, 0.0) + time.perf_counter() - start
+    return wrapper
+
+
+def _write_timings(path):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(TIMINGS, f)
+
+
+def register(linter):
+    """Required plugin entry point; checkers are wrapped in `load_configuration`, after all plugins are registered."""
+
+
+def load_configuration(linter):
+    for checker in linter.get_checkers():
+        if checker is linter or getattr(checker, "_quality_timed", False):
+            continue
+        for attribute in dir(checker):
+            if attribute.startswith(TIMED_PREFIXES) or attribute in TIMED_METHODS:
+                method = getattr(checker, attribute, None)
+                if callable(method):
+                    setattr(checker, attribute, _timed(checker.name, method))
+        checker._quality_timed = True
+
+    timings_file = os.environ.get(TIMINGS_FILE_ENV)
+    if timings_file:
+        atexit.register(_write_timings, timings_file)
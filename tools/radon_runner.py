@@ -1,6 +1,10 @@
 import subprocess  # Used to run external system commands (like calling radon)
 import json        # Used to parse the JSON output returned by radon
 import os          # Used to check if the target file exists
+from tools.process_limits import ToolLimitExceeded, limit_exceeded_result, run_limited
+
+# "radon cc" options used unless the scan profile chooses others (lifecycle/scan_profiles.py)
+DEFAULT_CC_OPTIONS = ['--no-assert']
 
 def run_radon_maintainability_index(filepath):
     """
@@ -32,11 +36,13 @@ def run_radon_maintainability_index(filepath):
     try:
         # Step 2: Run radon to compute Maintainability Index
         # '--json' makes sure we get structured output that we can parse
-        output = subprocess.check_output(
+        output = run_limited(
+            "radon",                              # Stopped at the radon time/memory limits
             ['radon', 'mi', '--json', filepath],  # CLI command: radon mi --json target.py
-            stderr=subprocess.DEVNULL,             # Capture any errors in output too
+            check=True,
+            stderr=subprocess.PIPE,                # Kept apart from the JSON; run_limited reads it to detect out-of-memory
             text=True                             # Return output as a string, not bytes
-        )
+        ).stdout
 
         output = output.strip()
 
@@ -175,6 +181,9 @@ def run_radon_maintainability_index(filepath):
                 "message": "Unable to parse MI score from radon output."
             }
 
+    except ToolLimitExceeded as e:
+        return limit_exceeded_result(e)
+
     except subprocess.CalledProcessError as e:
         # If radon crashes or returns a non-zero exit code, capture the error
         return {
@@ -182,9 +191,10 @@ def run_radon_maintainability_index(filepath):
             "message": f"Radon error: {e.output.strip()}"
         }
     
-def run_radon_cyclomatic_complexity(filepath):
+def run_radon_cyclomatic_complexity(filepath, options=None):
     """
     Analyzes cyclomatic complexity using Radon and adds interpretation with ranks A–F.
+    `options` are extra "radon cc" options (defaults to DEFAULT_CC_OPTIONS).
     Returns:
         dict: status, average score, most severe rank, and styled user guidance.
     """
@@ -197,11 +207,13 @@ def run_radon_cyclomatic_complexity(filepath):
 
     try:
         # Run Radon as a subprocess to get cyclomatic complexity in JSON format
-        output = subprocess.check_output(
-            ['radon', 'cc', '--json', '--no-assert', filepath],
-            stderr=subprocess.DEVNULL,
+        output = run_limited(
+            "radon",
+            ['radon', 'cc', '--json', *(options or DEFAULT_CC_OPTIONS), filepath],
+            check=True,
+            stderr=subprocess.PIPE,
             text=True
-        )
+        ).stdout
 
         # Remove leading warnings (e.g., SyntaxWarning)
         # lines = output.strip().splitlines()
@@ -291,13 +303,29 @@ def run_radon_cyclomatic_complexity(filepath):
             f"{styled_note}{styled_tip}{rank_legend}"
         )
 
+        # Per-block results, so hotspots can be located (e.g. mapped back to notebook cells)
+        blocks = [
+            {
+                "name": item.get("name"),
+                "type": item.get("type"),
+                "line": item.get("lineno"),
+                "complexity": item.get("complexity", 0),
+                "rank": item.get("rank", ""),
+            }
+            for item in file_results
+        ]
+
         return {
             "status": "fail" if worst_rank in ("E", "F") else "pass",
             "score": average,
             "rank": worst_rank,
+            "blocks": blocks,
             "message": message
         }
 
+    except ToolLimitExceeded as e:
+        return limit_exceeded_result(e)
+
     except subprocess.CalledProcessError as e:
         return {
             "status": "fail",
@@ -330,11 +358,13 @@ def run_radon_comment_density(filepath):
     
     try:
         # Step 2: Run radon raw analysis with --json output
-        output = subprocess.check_output(
+        output = run_limited(
+            "radon",
             ['radon', 'raw', '--json', filepath],
-            stderr=subprocess.DEVNULL,
+            check=True,
+            stderr=subprocess.PIPE,
             text=True
-        )
+        ).stdout
 
 
         # Clean any leading warnings (e.g., SyntaxWarning)
@@ -410,6 +440,9 @@ def run_radon_comment_density(filepath):
             "message": message
         }
     
+    except ToolLimitExceeded as e:
+        return limit_exceeded_result(e)
+
     except subprocess.CalledProcessError as e:
         # If radon fails due to a code issue or bad syntax
         return {
@@ -0,0 +1,69 @@
+import os
+import time
+from tools.result_cache import CACHE_DIR, load_cache, save_cache
+
+# Successful responses of remote services (GitHub API, PyPI), keyed by URL.
+# Entries expire after a TTL and the file keeps at most MAX_ENTRIES responses,
+# so batch runs over many repositories neither refetch nor grow it without bound.
+# Failed responses (rate limits, server errors, missing repositories) are never cached.
+CACHE_PATH = os.path.join(CACHE_DIR, "remote_metadata.json")
+DEFAULT_TTL = 24 * 60 * 60
+MAX_ENTRIES = 2000
+
+# Base URLs of the remote services. Override them to point the checks at a local stand-in server.
+GITHUB_API_URL = os.environ.get("QUALITY_GITHUB_API_URL", "https://api.github.com").rstrip("/")
+PYPI_URL = os.environ.get("QUALITY_PYPI_URL", "https://pypi.org").rstrip("/")
+
+# Parsed cache files, reused while the file on disk is unchanged: {cache_path: ((mtime_ns, size), cache)}
+_loaded = {}
+
+
+def _load(cache_path):
+    """Loads a cache file, parsing it again only if it changed since the last call."""
+    try:
+        stat = os.stat(cache_path)
+    except OSError:
+        return {}
+    version = (stat.st_mtime_ns, stat.st_size)
+    loaded = _loaded.get(cache_path)
+    if loaded is None or loaded[0] != version:
+        loaded = _loaded[cache_path] = (version, load_cache(cache_path))
+    return loaded[1]
+
+
+def get_or_fetch(key, fetch, ttl=DEFAULT_TTL, cache_path=None, is_success=None):
+    """
+    Returns the cached response for `key`, or calls `fetch()` and caches its result if it succeeded.
+
+    If `fetch` raises, nothing is cached. Concurrent calls for the same key are not
+    coalesced: each may fetch, and the last response stored wins.
+
+    Args:
+        key (str): cache key, usually the requested URL.
+        fetch (callable): returns a JSON-serializable response.
+        ttl (int): seconds a cached response stays valid.
+        cache_path (str): cache file, defaults to the user-level remote metadata cache.
+        is_success (callable): tells whether a response may be cached; failed responses
+            are returned to the caller but fetched again next time.
+    """
+    cache_path = cache_path or CACHE_PATH
+
+    entry = _load(cache_path).get(key)
+    if entry and time.time() < entry.get("expires_at", 0):
+        return entry["value"]
+
+    value = fetch()
+    if is_success is None or is_success(value):
+        _store(cache_path, key, value, ttl)
+    return value
+
+
+def _store(cache_path, key, value, ttl):
+    """Adds one response to the cache file, dropping expired entries and the oldest ones beyond MAX_ENTRIES."""
+    now = time.time()
+    cache = {
+        cached_key: entry for cached_key, entry in _load(cache_path).items()
+        if cached_key != key and now < entry.get("expires_at", 0)
+    }
+    cache[key] = {"expires_at": now + ttl, "value": value}
+    save_cache(cache_path, cache, max_entries=MAX_ENTRIES)
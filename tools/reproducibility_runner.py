@@ -0,0 +1,309 @@
+import os
+import re
+import json
+import time
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from tools.loc_counter import iter_notebook_parts
+from tools.process_limits import get_tool_limits
+
+# nbformat and nbclient are only imported in the worker processes that re-execute notebooks
+
+IGNORED_DIRS = {
+    "venv", "env", ".venv", ".git", "__pycache__", ".ipynb_checkpoints", "site-packages", "node_modules",
+    "build", "dist", ".tox", ".nox", "bandit-report", "jscpd-report", "gitleaks-report", "pytest-report"
+}
+
+# Output fields that change on every run and are not compared
+VOLATILE_FIELDS = {"execution_count", "metadata", "transient"}
+
+# Text patterns that change on every run (object addresses, timestamps, temp paths, progress timings)
+VOLATILE_PATTERNS = [
+    (re.compile(r"0x[0-9a-fA-F]{6,16}"), "0x<address>"),
+    (re.compile(r"\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2}(\.\d+)?"), "<timestamp>"),
+    (re.compile(r"/tmp/[\w./-]+"), "<tmp path>"),
+    (re.compile(r"\b\d+(\.\d+)?\s?(ms|µs|us|ns|s|sec|it/s|s/it)\b"), "<duration>"),
+]
+
+# Rendered images and HTML widgets rarely come out byte-identical, so only their presence is compared
+BINARY_MIME_TYPES = ("image/", "application/pdf", "application/vnd.jupyter.widget-view+json")
+
+# Kernel used when the notebook's own kernel is not installed
+FALLBACK_KERNEL = "python3"
+
+
+def discover_notebooks(path):
+    """Finds the notebooks to re-execute under `path` (or `path` itself if it is a notebook)."""
+    if os.path.isfile(path):
+        return [path] if path.endswith(".ipynb") else []
+
+    notebooks = []
+    for root, dirs, files in os.walk(path):
+        dirs[:] = [d for d in dirs if d not in IGNORED_DIRS]
+        notebooks.extend(os.path.join(root, f) for f in sorted(files) if f.endswith(".ipynb") and not f.startswith("."))
+    return notebooks
+
+
+def _normalize_text(text):
+    if isinstance(text, list):
+        text = "".join(text)
+    for pattern, replacement in VOLATILE_PATTERNS:
+        text = pattern.sub(replacement, text)
+    return text.rstrip()
+
+
+def _normalize_output(output):
+    """Reduces one cell output to the fields that should be the same on every run."""
+    normalized = {key: value for key, value in output.items() if key not in VOLATILE_FIELDS}
+    output_type = output.get("output_type")
+
+    if output_type == "stream":
+        normalized["text"] = _normalize_text(output.get("text", ""))
+    elif output_type in ("execute_result", "display_data"):
+        data = {}
+        for mime, value in output.get("data", {}).items():
+            if mime.startswith(BINARY_MIME_TYPES):
+                data[mime] = "<present>"
+            elif isinstance(value, (str, list)):
+                data[mime] = _normalize_text(value)
+            else:
+                data[mime] = value
+        normalized["data"] = data
+        normalized["output_type"] = "result"  # execute_result and display_data render the same
+    elif output_type == "error":
+        # The traceback contains kernel-specific paths and colors; the error itself is what matters
+        normalized = {"output_type": "error", "ename": output.get("ename"), "evalue": _normalize_text(output.get("evalue", ""))}
+    return normalized
+
+
+def output_digest(outputs):
+    """Digest of a cell's normalized outputs. Consecutive stream outputs are merged first, as kernels split them arbitrarily."""
+    merged = []
+    for output in outputs:
+        normalized = _normalize_output(output)
+        if merged and normalized.get("output_type") == "stream" and merged[-1].get("output_type") == "stream" \
+                and merged[-1].get("name") == normalized.get("name"):
+            merged[-1]["text"] = (merged[-1]["text"] + "\n" + normalized["text"]).strip()
+        else:
+            merged.append(normalized)
+    encoded = json.dumps(merged, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def _take_outputs(index, cell, stored, execution_counts):
+    """Replaces a code cell's stored outputs by their digest in `stored` (only for cells that were run)."""
+    if cell.get("cell_type") != "code":
+        return
+    if cell.get("execution_count") is not None or cell.get("outputs"):
+        stored[index] = output_digest(cell.get("outputs", []))
+        if cell.get("execution_count") is not None:
+            execution_counts.append(cell["execution_count"])
+    cell["outputs"] = []
+
+
+def _read_without_outputs(notebook_path, stored, execution_counts):
+    """
+    Reads a notebook cell by cell, reducing each code cell's stored outputs to a digest in
+    `stored` (by cell index) before the next cell is decoded. Returns the notebook without outputs.
+    """
+    import nbformat
+
+    top_level = {}
+    cells = []
+    for key, value in iter_notebook_parts(notebook_path):
+        if key == "cell":
+            _take_outputs(len(cells), value, stored, execution_counts)
+            if isinstance(value.get("source"), list):
+                value["source"] = "".join(value["source"])  # as nbformat.read does
+            cells.append(value)
+        else:
+            top_level[key] = value
+
+    if top_level.get("nbformat", 4) >= 4:
+        return nbformat.from_dict({**top_level, "cells": cells})
+
+    # Notebooks older than version 4 keep their cells in worksheets; nbformat converts them
+    nb = nbformat.convert(nbformat.from_dict(top_level), 4)
+    for index, cell in enumerate(nb.cells):
+        _take_outputs(index, cell, stored, execution_counts)
+    return nb
+
+
+def _installed_kernel(kernel_name):
+    """Returns `kernel_name` if that kernel is installed, otherwise FALLBACK_KERNEL."""
+    from jupyter_client.kernelspec import KernelSpecManager
+
+    try:
+        return kernel_name if kernel_name in KernelSpecManager().find_kernel_specs() else FALLBACK_KERNEL
+    except Exception:
+        return FALLBACK_KERNEL
+
+
+def reproduce_notebook(notebook_path, cell_timeout=None, notebook_timeout=None):
+    """
+    Re-executes one notebook in a fresh kernel and compares every code cell's outputs with the stored ones.
+
+    Cells are read one at a time and their stored outputs reduced to digests before the next
+    one is decoded; fresh outputs are hashed and dropped as soon as their cell finishes, so a
+    notebook's outputs are never all held in memory (except in notebooks older than format 4,
+    whose worksheets are decoded as a whole). Each cell may run `cell_timeout` seconds
+    and the whole notebook `notebook_timeout` seconds. Notebooks whose kernel is not installed
+    run with the python3 kernel.
+
+    Returns:
+        dict: {"notebook", "cells", "reproduced", "score" (0-100), "mismatches": [cell numbers],
+               "out_of_order": bool, "kernel": kernel used, "kernel_fallback": bool, "error": str or None}
+    """
+    from nbclient import NotebookClient
+    from nbclient.exceptions import CellTimeoutError, DeadKernelError
+
+    result = {"notebook": notebook_path, "cells": 0, "reproduced": 0, "score": 0.0,
+              "mismatches": [], "out_of_order": False, "kernel": None, "kernel_fallback": False, "error": None}
+
+    stored = {}
+    execution_counts = []
+    try:
+        nb = _read_without_outputs(notebook_path, stored, execution_counts)
+    except Exception as e:
+        result["error"] = f"Could not read notebook: {e}"
+        return result
+
+    result["cells"] = len(stored)
+    result["out_of_order"] = execution_counts != sorted(execution_counts)
+
+    if not stored:
+        result["score"] = 100.0
+        return result
+
+    matches = {}
+
+    def on_cell_executed(cell, cell_index, **kwargs):
+        if cell_index in stored:
+            matches[cell_index] = output_digest(cell.get("outputs", [])) == stored[cell_index]
+        cell["outputs"] = []
+
+    deadline = time.monotonic() + notebook_timeout if notebook_timeout else None
+
+    def on_cell_start(cell, cell_index, **kwargs):
+        if deadline is not None and time.monotonic() >= deadline:
+            raise TimeoutError
+
+    def timeout_for(cell):
+        # A cell gets its own limit, but never more than the notebook's remaining time
+        if deadline is None:
+            return cell_timeout
+        remaining = max(1, int(deadline - time.monotonic()))
+        return min(cell_timeout, remaining) if cell_timeout else remaining
+
+    wanted_kernel = nb.metadata.get("kernelspec", {}).get("name", FALLBACK_KERNEL)
+    result["kernel"] = _installed_kernel(wanted_kernel)
+    result["kernel_fallback"] = result["kernel"] != wanted_kernel
+    if result["kernel_fallback"]:
+        nb.metadata.pop("kernelspec", None)
+
+    client = NotebookClient(
+        nb,
+        timeout_func=timeout_for,
+        kernel_name=result["kernel"],
+        allow_errors=True,  # later cells are still compared after a failing cell
+        resources={"metadata": {"path": os.path.dirname(os.path.abspath(notebook_path))}},
+        on_cell_start=on_cell_start,
+        on_cell_executed=on_cell_executed,
+    )
+    try:
+        client.execute()
+    except (CellTimeoutError, TimeoutError):
+        if deadline is not None and time.monotonic() >= deadline - 1:
+            result["error"] = f"The notebook ran longer than {notebook_timeout}s."
+        else:
+            result["error"] = f"A cell ran longer than {cell_timeout}s."
+    except DeadKernelError:
+        result["error"] = "The kernel died (e.g. out of memory)."
+    except Exception as e:
+        result["error"] = f"Could not run notebook: {e}"
+
+    # Cells that were not reached count as not reproduced
+    result["mismatches"] = [
+        sum(1 for c in nb.cells[:index + 1] if c.cell_type == "code")
+        for index in stored if not matches.get(index)
+    ]
+    result["reproduced"] = len(stored) - len(result["mismatches"])
+    result["score"] = result["reproduced"] / len(stored) * 100
+    return result
+
+
+def run_reproducibility_check(path, workers=None):
+    """
+    Re-executes the notebooks under `path` and measures how many cells reproduce their saved outputs.
+
+    Notebooks run in parallel, one kernel per worker process, with at most one worker per CPU core.
+    Every cell gets the "reproducibility" timeout of tools/process_limits.py, and every notebook
+    the "notebook" timeout. Execution counts,
+    metadata, object addresses, timestamps and durations are ignored, and images are only
+    checked for presence.
+
+    Returns:
+        dict: {
+            'status': 'pass' if every cell of every notebook reproduced, otherwise 'fail',
+            'score': mean reproducibility score over the notebooks (0-100),
+            'notebooks': per-notebook results,
+            'message': styled summary
+        }
+    """
+    notebooks = discover_notebooks(path)
+    if not notebooks:
+        return {"status": "fail", "message": "No notebooks found to re-execute."}
+
+    try:
+        import nbclient  # noqa: F401
+    except ImportError:
+        return {"status": "fail", "message": "nbclient is not installed, so notebooks could not be re-executed."}
+
+    cell_timeout = get_tool_limits("reproducibility")["timeout"]
+    notebook_timeout = get_tool_limits("notebook")["timeout"]
+    workers = workers or min(os.cpu_count() or 1, len(notebooks))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(reproduce_notebook, notebooks, [cell_timeout] * len(notebooks),
+                                    [notebook_timeout] * len(notebooks)))
+
+    score = sum(r["score"] for r in results) / len(results)
+    status = "pass" if all(r["score"] == 100 and not r["error"] for r in results) else "fail"
+
+    root = path if os.path.isdir(path) else os.path.dirname(path)
+    rows = []
+    for r in results:
+        name = os.path.relpath(r["notebook"], root) if root else r["notebook"]
+        row = f"• <code>{name}</code>: <b>{r['score']:.0f}%</b> ({r['reproduced']}/{r['cells']} cells)"
+        if r["mismatches"]:
+            shown = ", ".join(str(cell) for cell in r["mismatches"][:10])
+            row += f", differs in cell{'s' if len(r['mismatches']) > 1 else ''} {shown}{' …' if len(r['mismatches']) > 10 else ''}"
+        if r["out_of_order"]:
+            row += ", <i>saved cells were run out of order</i>"
+        if r.get("kernel_fallback"):
+            row += f", <i>its kernel is not installed, ran with {r['kernel']}</i>"
+        if r["error"]:
+            row += f", <i>{r['error']}</i>"
+        rows.append(row + "<br>")
+
+    styled_header = (
+        f"<div style='margin-left: 20px;'>Average reproducibility: <b>{score:.1f}%</b> "
+        f"over {len(results)} notebook(s)</div>"
+    )
+    styled_rows = "<div style='margin-left: 20px;'>" + "".join(rows) + "</div>"
+    styled_note = (
+        "<div style='margin-left: 20px; color: gray; font-size: 90%;'>"
+        "<i>Note: Each notebook was re-run top to bottom in a fresh kernel. Execution counts, object addresses, "
+        "timestamps and timings were ignored, and images were only checked for presence.</i></div>"
+    )
+    styled_tip = (
+        "<div style='margin-left: 20px; color: gray; font-size: 90%;'>"
+        "<b>Tip:</b> Restart the kernel and run all cells before saving, fix random seeds, "
+        "and declare the data files a notebook needs.</div>"
+    )
+
+    return {
+        "status": status,
+        "score": score,
+        "notebooks": results,
+        "message": styled_header + styled_rows + styled_note + styled_tip
+    }
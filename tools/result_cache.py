@@ -0,0 +1,44 @@
+import os
+import json
+import hashlib
+
+# Small helpers for tools that cache their results per file content.
+# A cache is a JSON file mapping keys (usually content hashes) to results.
+
+# User-level cache folder for results that are not tied to one project (e.g. remote metadata)
+CACHE_DIR = os.environ.get(
+    "QUALITY_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "jupyter-quality-extension")
+)
+
+def file_digest(filepath):
+    """SHA-256 of a file's content, read in chunks."""
+    digest = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def load_cache(cache_path):
+    """Loads a JSON cache file, returning an empty cache if it is missing or unreadable."""
+    try:
+        with open(cache_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+def save_cache(cache_path, data, max_entries=None):
+    """
+    Writes a JSON cache file atomically (a concurrent reader never sees a half-written file).
+
+    If `max_entries` is given, only the most recently inserted entries are kept.
+    """
+    if max_entries is not None and len(data) > max_entries:
+        data = dict(list(data.items())[-max_entries:])
+
+    os.makedirs(os.path.dirname(cache_path) or ".", exist_ok=True)
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, cache_path)
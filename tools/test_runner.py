@@ -0,0 +1,263 @@
+import os
+import sys
+import hashlib
+import tempfile
+import statistics
+import importlib.util
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from tools.result_cache import file_digest, load_cache, save_cache
+from tools.process_limits import ToolLimitExceeded, limit_exceeded_result, run_limited
+
+# Per-test-file results, keyed by the test file's hash and a digest of the code under test
+CACHE_PATH = os.path.join("pytest-report", "test_cache.json")
+CACHE_MAX_ENTRIES = 20000
+
+# Last known run time of each test file (by path, so it survives edits), used to shard the slowest first
+DURATIONS_PATH = os.path.join("pytest-report", "test_durations.json")
+
+# Per-test timeout, used when the pytest-timeout plugin is installed
+TEST_TIMEOUT_SECONDS = 60
+
+IGNORED_DIRS = {
+    "venv", "env", ".venv", ".git", "__pycache__", ".ipynb_checkpoints", ".mypy_cache", ".pytest_cache",
+    ".tox", ".nox", "build", "dist", "site-packages", "node_modules",
+    "bandit-report", "jscpd-report", "gitleaks-report", "pytest-report"
+}
+
+def is_test_file(filename):
+    return filename.endswith(".py") and (filename.startswith("test_") or filename.endswith("_test.py"))
+
+def discover_test_files(path):
+    """Finds pytest-style test files (test_*.py, *_test.py) under `path`."""
+    if os.path.isfile(path):
+        return [path] if is_test_file(os.path.basename(path)) else []
+
+    test_files = []
+    for root, dirs, files in os.walk(path):
+        dirs[:] = [d for d in dirs if d not in IGNORED_DIRS]
+        test_files.extend(os.path.join(root, f) for f in sorted(files) if is_test_file(f))
+    return test_files
+
+def _project_digest(root):
+    """Digest of all non-test Python files, so cached test results expire when the code under test changes."""
+    digest = hashlib.sha256()
+    for current, dirs, files in os.walk(root):
+        dirs[:] = sorted(d for d in dirs if d not in IGNORED_DIRS)
+        for f in sorted(files):
+            if f.endswith(".py") and not is_test_file(f):
+                filepath = os.path.join(current, f)
+                try:
+                    digest.update(f"{os.path.relpath(filepath, root)}:{file_digest(filepath)}\n".encode())
+                except OSError:
+                    continue
+    return digest.hexdigest()
+
+def _shard(test_files, workers, last_durations):
+    """Splits test files over workers, longest first (by last known duration, else by file size)."""
+    def weight(test_file):
+        previous = last_durations.get(test_file)
+        return previous if previous is not None else os.path.getsize(test_file) / 1000
+
+    shards = [[] for _ in range(workers)]
+    loads = [0.0] * workers
+    for test_file in sorted(test_files, key=weight, reverse=True):
+        lightest = loads.index(min(loads))
+        shards[lightest].append(test_file)
+        loads[lightest] += weight(test_file)
+    return [shard for shard in shards if shard]
+
+def _parse_junit(report_path, root):
+    """Reads a JUnit XML report into {test file: [{"name", "outcome", "duration"}]}."""
+    results = {}
+    tree = ET.parse(report_path)
+    for case in tree.iter("testcase"):
+        outcome = "passed"
+        for child in case:
+            if child.tag in ("failure", "error", "skipped"):
+                outcome = {"failure": "failed", "error": "error", "skipped": "skipped"}[child.tag]
+                break
+
+        # "file" is only set by some pytest versions; classname is the dotted module path
+        test_file = case.get("file")
+        if test_file:
+            test_file = os.path.normpath(os.path.join(root, test_file))
+        else:
+            # Collection errors have no classname and the module path as their name
+            module = (case.get("classname") or case.get("name") or "").split(".")
+            test_file = None
+            for end in range(len(module), 0, -1):
+                candidate = os.path.join(root, *module[:end]) + ".py"
+                if os.path.isfile(candidate):
+                    test_file = os.path.normpath(candidate)
+                    break
+
+        results.setdefault(test_file, []).append({
+            "name": "::".join(part for part in (case.get("classname"), case.get("name")) if part),
+            "outcome": outcome,
+            "duration": float(case.get("time") or 0),
+        })
+    return results
+
+def _run_shard(shard, root, report_path, per_test_timeout):
+    command = [
+        sys.executable, "-m", "pytest", *shard,
+        "-q", "-p", "no:cacheprovider", "--continue-on-collection-errors", f"--junitxml={report_path}", "-o", "junit_family=xunit1",
+        f"--rootdir={root}",
+    ]
+    if per_test_timeout:
+        command.append(f"--timeout={TEST_TIMEOUT_SECONDS}")
+    run_limited("pytest", command, cwd=root, text=True)
+    return _parse_junit(report_path, root) if os.path.exists(report_path) else {}
+
+def run_test_suite(path, workers=None):
+    """
+    Discovers the project's tests and runs them with pytest in parallel worker processes.
+
+    Test files are sharded over the CPU cores (slowest files first, based on earlier runs),
+    and each shard runs in its own pytest process with a JUnit XML report. If pytest-timeout
+    is installed, every test gets a time limit; each worker process is also stopped at the
+    "pytest" limits of tools/process_limits.py.
+
+    Results are cached per test file, keyed by its content hash and a digest of the
+    project's other Python files, so unchanged tests are not re-run for unchanged code.
+
+    Returns:
+        dict: {
+            'status': 'pass' if tests were found and none failed, otherwise 'fail',
+            'tests', 'passed', 'failed', 'errors', 'skipped': counts,
+            'success_rate': percentage of passed tests among those that ran,
+            'durations': {'total', 'p50', 'p90', 'max'} in seconds,
+            'per_test_timeout': whether tests were run with a per-test time limit (needs pytest-timeout),
+            'message': styled summary
+        }
+    """
+    root = os.path.abspath(path if os.path.isdir(path) else os.path.dirname(path) or ".")
+    test_files = [os.path.abspath(f) for f in discover_test_files(path)]
+
+    if not test_files:
+        return {
+            "status": "fail",
+            "tests": 0,
+            "message": "No test files found (expected files named <code>test_*.py</code> or <code>*_test.py</code>)."
+        }
+
+    if importlib.util.find_spec("pytest") is None:
+        return {
+            "status": "fail",
+            "message": "pytest is not installed, so the tests could not be run."
+        }
+
+    # STEP 1: Reuse cached results for unchanged tests of unchanged code
+    cache = load_cache(CACHE_PATH)
+    project_digest = _project_digest(root)
+    cache_keys = {f: f"{file_digest(f)}:{project_digest}" for f in test_files}
+    to_run = [f for f in test_files if cache_keys[f] not in cache]
+    cached_count = len(test_files) - len(to_run)
+
+    # STEP 2: Run the remaining test files, sharded over worker processes
+    per_test_timeout = importlib.util.find_spec("pytest_timeout") is not None
+    if to_run:
+        last_durations = load_cache(DURATIONS_PATH)
+        workers = workers or min(os.cpu_count() or 1, len(to_run))
+        shards = _shard(to_run, workers, last_durations)
+
+        with tempfile.TemporaryDirectory() as report_dir:
+            try:
+                with ThreadPoolExecutor(max_workers=len(shards)) as executor:
+                    shard_results = list(executor.map(
+                        lambda item: _run_shard(item[1], root, os.path.join(report_dir, f"shard-{item[0]}.xml"), per_test_timeout),
+                        enumerate(shards)
+                    ))
+            except ToolLimitExceeded as e:
+                return limit_exceeded_result(e)
+
+        ran = {}
+        for result in shard_results:
+            for test_file, cases in result.items():
+                ran.setdefault(test_file, []).extend(cases)
+
+        for test_file in to_run:
+            # Files that produced no test cases (e.g. collection errors) are not cached
+            if ran.get(test_file):
+                cache[cache_keys[test_file]] = ran[test_file]
+                last_durations[test_file] = sum(case["duration"] for case in ran[test_file])
+        save_cache(DURATIONS_PATH, last_durations, max_entries=CACHE_MAX_ENTRIES)
+        unmapped = ran.get(None, [])
+    else:
+        unmapped = []
+
+    cases = unmapped[:]
+    for test_file in test_files:
+        key = cache_keys[test_file]
+        if key in cache:
+            cached_cases = cache.pop(key)
+            cache[key] = cached_cases  # re-insert to mark as recently used
+            cases.extend(cached_cases)
+
+    save_cache(CACHE_PATH, cache, max_entries=CACHE_MAX_ENTRIES)
+
+    # STEP 3: Summarize outcomes and durations
+    counts = {outcome: sum(1 for case in cases if case["outcome"] == outcome) for outcome in ("passed", "failed", "error", "skipped")}
+    executed = counts["passed"] + counts["failed"] + counts["error"]
+    success_rate = (counts["passed"] / executed * 100) if executed else 0.0
+
+    times = sorted(case["duration"] for case in cases if case["outcome"] != "skipped")
+    if len(times) >= 2:
+        deciles = statistics.quantiles(times, n=10, method="inclusive")
+        p50, p90 = statistics.median(times), deciles[8]
+    else:
+        p50 = p90 = times[0] if times else 0.0
+    durations = {"total": sum(times), "p50": p50, "p90": p90, "max": times[-1] if times else 0.0}
+
+    status = "pass" if executed and not counts["failed"] and not counts["error"] else "fail"
+
+    failing = [case["name"] for case in cases if case["outcome"] in ("failed", "error")]
+    slowest = sorted(cases, key=lambda case: case["duration"], reverse=True)[:5]
+    slowest_names = ", ".join(f"<code>{case['name']}</code> ({case['duration']:.2f}s)" for case in slowest)
+
+    styled_header = (
+        f"<div style='margin-left: 20px;'>Tests: <b>{counts['passed']}</b> passed, <b>{counts['failed']}</b> failed, "
+        f"<b>{counts['error']}</b> errors, {counts['skipped']} skipped "
+        f"(success rate {success_rate:.1f}%)</div>"
+    )
+    styled_durations = (
+        "<div style='margin-left: 20px; color: gray; font-size: 90%;'>"
+        f"Durations: total {durations['total']:.2f}s, median {durations['p50']:.3f}s, "
+        f"p90 {durations['p90']:.3f}s, max {durations['max']:.3f}s. "
+        f"Slowest: {slowest_names or '-'}</div>"
+    )
+    styled_failing = ""
+    if failing:
+        styled_failing = (
+            "<div style='margin-left: 20px; color: gray; font-size: 90%;'>Failing tests:<br>"
+            + "".join(f"• <code>{name}</code><br>" for name in failing[:20])
+            + (f"… and {len(failing) - 20} more" if len(failing) > 20 else "")
+            + "</div>"
+        )
+    styled_note = (
+        "<div style='margin-left: 20px; color: gray; font-size: 90%;'>"
+        f"<i>Note: {len(test_files)} test file(s) found; {cached_count} reused from an earlier run because neither the tests "
+        "nor the code under test changed."
+        + ("" if per_test_timeout else
+           f" No per-test time limit was applied: install pytest-timeout to stop tests running longer than {TEST_TIMEOUT_SECONDS}s.")
+        + "</i></div>"
+    )
+    styled_tip = (
+        "<div style='margin-left: 20px; color: gray; font-size: 90%;'>"
+        "<b>Tip:</b> Keep tests fast and independent. Fix failing tests first, and split or mock slow ones "
+        "(e.g. tests that download data or train models).</div>"
+    )
+
+    return {
+        "status": status,
+        "tests": len(cases),
+        "passed": counts["passed"],
+        "failed": counts["failed"],
+        "errors": counts["error"],
+        "skipped": counts["skipped"],
+        "success_rate": success_rate,
+        "durations": durations,
+        "per_test_timeout": per_test_timeout,
+        "message": styled_header + styled_durations + styled_failing + styled_note + styled_tip
+    }